@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""Single-port asyncio HTTP/1.1 front end for the status and control routes.
+
+Enabled with ``BOT_HTTP_SERVER=async``. One event-loop thread owns every
+connection (keep-alive by default on HTTP/1.1), so idle dashboard pollers cost
+a coroutine rather than an OS thread. Route handlers may take the bot lock or
+reach the database, so they run on a small fixed pool instead of the loop.
+Paths and responses are the ones served by ``http_endpoints.dispatch``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from typing import Any, Optional, Set, Tuple
+from urllib.parse import urlparse
+
+from http_endpoints import dispatch, encode_response
+
+
+MAX_HEADER_LINES = 100
+MAX_BODY_BYTES = 1 << 20
+
+
+class _Headers(dict):
+    """Case-insensitive header lookup (keys are stored lower-case)."""
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return super().get(key.lower(), default)
+
+
+class _BadRequest(Exception):
+    def __init__(self, status: HTTPStatus, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+class AsyncBotServer:
+    """Serve ``/health``, ``/settings``, ``/performance``, ``/logs``, ``/commands`` and ``/bulk`` on one port."""
+
+    serves_control = True  # the bot skips its separate control server
+
+    def __init__(
+        self,
+        bot,
+        *,
+        host: str = "0.0.0.0",
+        port: int = 8080,
+        bot_secret: Optional[str] = None,
+        workers: int = 4,
+        idle_timeout: float = 30.0,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        self.bot = bot
+        self.host = host
+        self.port = port
+        self.bot_secret = bot_secret
+        self.idle_timeout = idle_timeout
+        self.logger = logger or logging.getLogger(__name__)
+        # Bind now so a busy port fails at construction, like ThreadingHTTPServer.
+        self._sock = socket.create_server((host, port))
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="http-route")
+        self._loop = asyncio.new_event_loop()
+        self._connections: Set[asyncio.Task] = set()
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._busy = 0  # requests between read and response written (loop thread only)
+        self._closing = False
+        self._in_route = threading.local()
+        self._thread = threading.Thread(target=self._run, name="async-http", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop accepting requests; those in flight still get their response.
+
+        Safe to call from a route handler (e.g. a /settings change that moves
+        the server): the loop then stops right after that response is written.
+        """
+        if self._thread.is_alive():
+            self._loop.call_soon_threadsafe(self._begin_shutdown)
+            if not getattr(self._in_route, "active", False):
+                self._thread.join(timeout=2)
+        else:
+            self._sock.close()
+            self._loop.close()
+        self._executor.shutdown(wait=False)
+
+    def _run(self) -> None:
+        loop = self._loop
+        asyncio.set_event_loop(loop)
+        server = self._server = loop.run_until_complete(asyncio.start_server(self._serve_connection, sock=self._sock))
+        try:
+            loop.run_forever()
+        finally:
+            server.close()
+            for task in list(self._connections):
+                task.cancel()
+            loop.run_until_complete(asyncio.gather(*self._connections, return_exceptions=True))
+            loop.run_until_complete(server.wait_closed())
+            loop.close()
+
+    def _begin_shutdown(self) -> None:
+        self._closing = True
+        if self._server is not None:
+            self._server.close()
+        if not self._busy:
+            self._loop.stop()
+
+    # --- connections -----------------------------------------------------
+
+    async def _serve_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        task = asyncio.current_task()
+        self._connections.add(task)
+        try:
+            keep_alive = True
+            while keep_alive:
+                try:
+                    request = await asyncio.wait_for(self._read_request(reader, writer), self.idle_timeout)
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+                    break
+                except _BadRequest as exc:
+                    body, _ = encode_response({"error": str(exc)})
+                    await self._write(writer, exc.status, body, None, keep_alive=False)
+                    break
+                if request is None or self._closing:
+                    break
+                method, target, headers, body, keep_alive = request
+                self._busy += 1
+                try:
+                    status, response, encoding = await self._loop.run_in_executor(
+                        self._executor, self._route, method, target, headers, body
+                    )
+                    await self._write(writer, status, response, encoding, keep_alive=keep_alive and not self._closing)
+                finally:
+                    self._busy -= 1
+                    if self._closing and not self._busy:
+                        self._loop.stop()
+                if self._closing:
+                    break
+        except (ConnectionError, asyncio.CancelledError):
+            pass  # client went away, or the server is shutting down
+        finally:
+            self._connections.discard(task)
+            writer.close()
+
+    async def _read_request(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> Optional[Tuple[str, str, _Headers, bytes, bool]]:
+        line = await reader.readline()
+        if not line:
+            return None
+        try:
+            method, target, version = line.decode("latin-1").split()
+        except ValueError:
+            raise _BadRequest(HTTPStatus.BAD_REQUEST, "Malformed request line") from None
+
+        headers = _Headers()
+        for _ in range(MAX_HEADER_LINES):
+            raw = await reader.readline()
+            if raw in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = raw.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        else:
+            raise _BadRequest(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, "Too many headers")
+
+        connection = headers.get("Connection", "").lower()
+        if version == "HTTP/1.1":
+            keep_alive = connection != "close"
+        else:
+            keep_alive = connection == "keep-alive"
+
+        if headers.get("Transfer-Encoding"):
+            raise _BadRequest(HTTPStatus.LENGTH_REQUIRED, "Chunked bodies are not supported")
+        try:
+            length = int(headers.get("Content-Length", 0))
+        except ValueError:
+            raise _BadRequest(HTTPStatus.BAD_REQUEST, "Invalid Content-Length") from None
+        if length > MAX_BODY_BYTES:
+            raise _BadRequest(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Request body too large")
+        body = b""
+        if length > 0:
+            if headers.get("Expect", "").lower() == "100-continue":
+                writer.write(b"HTTP/1.1 100 Continue\r\n\r\n")
+            body = await reader.readexactly(length)
+        return method.upper(), target, headers, body, keep_alive
+
+    def _route(
+        self, method: str, target: str, headers: _Headers, body: bytes
+    ) -> Tuple[HTTPStatus, bytes, Optional[str]]:
+        """Run one request off the event loop, including JSON encoding and compression."""
+        url = urlparse(target)
+        self._in_route.active = True
+        try:
+            status, payload = dispatch(self.bot, self.bot_secret, method, url.path, headers, body, url.query)
+        except Exception as exc:  # noqa: BLE001 - never drop the connection on a handler bug
+            self.logger.error(f"HTTP {method} {url.path} failed: {exc}")
+            status, payload = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": str(exc)}
+        finally:
+            self._in_route.active = False
+        response, encoding = encode_response(payload, headers.get("Accept-Encoding"))
+        return status, response, encoding
+
+    async def _write(
+        self,
+        writer: asyncio.StreamWriter,
+        status: HTTPStatus,
+        body: bytes,
+        encoding: Optional[str],
+        *,
+        keep_alive: bool,
+    ) -> None:
+        head = (
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            "Content-Type: application/json\r\n"
+            "Vary: Accept-Encoding\r\n"
+            + (f"Content-Encoding: {encoding}\r\n" if encoding else "")
+            + f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
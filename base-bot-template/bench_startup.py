@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""Startup-time budget for the bot runner.
+
+Imports ``universal_bot`` in a fresh interpreter under ``-X importtime`` and
+fails (exit status 1) when the cumulative import time exceeds the budget or
+when a module that must stay lazy is imported at startup. Exchange adapters,
+HTTP/DB clients and the asyncio server load on first use; pulling one back
+into the import graph is the usual way startup regresses.
+
+    python bench_startup.py                  # best of 5 runs against 150 ms
+    python bench_startup.py --budget-ms 60 --runs 10
+    STARTUP_BUDGET_MS=120 python bench_startup.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+
+ENTRY_MODULE = "universal_bot"
+DEFAULT_BUDGET_MS = 150.0
+DEFAULT_RUNS = 5
+# Must not be imported by ``import universal_bot``.
+LAZY_MODULES = (
+    "requests",
+    "psycopg2",
+    "asyncio",
+    "async_http",
+    "coinbase_exchange",
+    "market_feed",
+    "market_tape",
+)
+
+Sample = Tuple[float, Dict[str, Tuple[int, int]]]  # (entry cumulative ms, module -> (self us, cumulative us))
+
+
+def measure(module: str = ENTRY_MODULE) -> Sample:
+    """Import ``module`` once in a child interpreter and parse its ``-X importtime`` report."""
+    here = os.path.dirname(os.path.abspath(__file__))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=here,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr.strip()}")
+
+    modules: Dict[str, Tuple[int, int]] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # header line
+        modules[fields[2].strip()] = (int(fields[0]), int(fields[1]))
+    if module not in modules:
+        raise RuntimeError(f"{module} missing from the -X importtime report")
+    return modules[module][1] / 1000.0, modules
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=float(os.getenv("STARTUP_BUDGET_MS", DEFAULT_BUDGET_MS)),
+        help="maximum cumulative import time of universal_bot (best run)",
+    )
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS, help="interpreters to start; the fastest counts")
+    parser.add_argument("--top", type=int, default=10, help="slowest modules to list")
+    args = parser.parse_args(argv)
+
+    try:
+        samples = [measure() for _ in range(max(1, args.runs))]
+    except RuntimeError as exc:
+        print(exc, file=sys.stderr)
+        return 1
+    best_ms, modules = min(samples, key=lambda sample: sample[0])
+
+    print(f"import {ENTRY_MODULE}: {best_ms:.1f} ms (best of {len(samples)}, budget {args.budget_ms:.1f} ms)")
+    print("slowest modules by self time:")
+    for name, (self_us, cumulative_us) in sorted(modules.items(), key=lambda item: -item[1][0])[: args.top]:
+        print(f"  {self_us / 1000:7.2f} ms self {cumulative_us / 1000:8.2f} ms cumulative  {name}")
+
+    failures = []
+    eager = [name for name in LAZY_MODULES if name in modules]
+    if eager:
+        failures.append(f"imported at startup but should be lazy: {', '.join(eager)}")
+    if best_ms > args.budget_ms:
+        failures.append(f"startup import time {best_ms:.1f} ms exceeds budget {args.budget_ms:.1f} ms")
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
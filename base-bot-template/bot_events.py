@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""Wakeup primitives so the bot loop reacts to events instead of fixed polling."""
+
+from __future__ import annotations
+
+import os
+import select
+import struct
+import threading
+from typing import Callable, Iterable, Optional, Set
+
+
+# Reasons passed to BotWakeup.notify(); kept as plain strings for easy logging.
+WAKE_PRICE = "price"
+WAKE_COMMAND = "command"
+WAKE_SETTINGS = "settings"
+WAKE_CONFIG = "config"
+
+# inotify(7) constants (see <sys/inotify.h>).
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_NONBLOCK = os.O_NONBLOCK
+_IN_CLOEXEC = 0o2000000
+_INOTIFY_EVENT = struct.Struct("iIII")
+
+
+class BotWakeup:
+    """Condition-backed wakeup channel shared by the loop and its event sources.
+
+    Producers (HTTP control handlers, market feeds, file watchers) call
+    ``notify`` with a reason; the loop blocks in ``wait`` until either a reason
+    is pending or the timeout expires, so an idle bot uses no CPU.
+    """
+
+    def __init__(self) -> None:
+        self._cond = threading.Condition()
+        self._pending: Set[str] = set()
+
+    def notify(self, reason: str) -> None:
+        with self._cond:
+            self._pending.add(reason)
+            self._cond.notify_all()
+
+    def wait(self, timeout: Optional[float] = None) -> Set[str]:
+        """Block until an event arrives or ``timeout`` elapses; return and clear the reasons."""
+        with self._cond:
+            if not self._pending:
+                self._cond.wait(timeout)
+            reasons = self._pending
+            self._pending = set()
+        return reasons
+
+    def clear(self) -> None:
+        with self._cond:
+            self._pending.clear()
+
+
+def _load_inotify():
+    """Return libc with inotify symbols, or None when unavailable (non-Linux, musl quirks)."""
+    if not hasattr(os, "O_NONBLOCK"):
+        return None
+    import ctypes.util  # only needed while waiting for configuration; find_library pulls in subprocess
+
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1  # noqa: B018 - attribute lookup raises if missing
+        libc.inotify_add_watch
+    except (OSError, AttributeError):
+        return None
+    return libc
+
+
+class FileWatcher:
+    """Invoke a callback when one of the watched files appears in a directory.
+
+    Uses inotify when the platform supports it and falls back to polling the
+    directory every ``poll_interval`` seconds otherwise.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        filenames: Iterable[str],
+        callback: Callable[[str], None],
+        *,
+        poll_interval: float = 1.0,
+    ) -> None:
+        self.directory = directory
+        self.filenames = frozenset(filenames)
+        self.callback = callback
+        self.poll_interval = poll_interval
+        self.mode: Optional[str] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._inotify_fd: Optional[int] = None
+        self._stop_pipe: Optional[tuple] = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        if self._init_inotify():
+            self.mode = "inotify"
+            target = self._run_inotify
+        else:
+            self.mode = "polling"
+            target = self._run_polling
+        self._thread = threading.Thread(target=target, name="file-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._stop_pipe is not None:
+            try:
+                os.write(self._stop_pipe[1], b"x")
+            except OSError:
+                pass
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+        for fd in (self._inotify_fd, *(self._stop_pipe or ())):
+            if fd is not None:
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+        self._inotify_fd = None
+        self._stop_pipe = None
+
+    def _existing(self) -> Optional[str]:
+        for name in self.filenames:
+            if os.path.exists(os.path.join(self.directory, name)):
+                return name
+        return None
+
+    def _init_inotify(self) -> bool:
+        libc = _load_inotify()
+        if libc is None:
+            return False
+        fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if fd < 0:
+            return False
+        mask = _IN_CREATE | _IN_MOVED_TO | _IN_CLOSE_WRITE
+        if libc.inotify_add_watch(fd, self.directory.encode("utf-8"), mask) < 0:
+            os.close(fd)
+            return False
+        self._inotify_fd = fd
+        self._stop_pipe = os.pipe()
+        return True
+
+    def _run_inotify(self) -> None:
+        fd = self._inotify_fd
+        stop_fd = self._stop_pipe[0]
+        # A file created before the watch was registered would otherwise be missed.
+        existing = self._existing()
+        if existing:
+            self.callback(existing)
+        while not self._stop.is_set():
+            try:
+                readable, _, _ = select.select([fd, stop_fd], [], [])
+            except (OSError, ValueError):
+                return
+            if stop_fd in readable or fd not in readable:
+                return
+            try:
+                data = os.read(fd, 4096)
+            except BlockingIOError:
+                continue
+            except OSError:
+                return
+            offset = 0
+            while offset + _INOTIFY_EVENT.size <= len(data):
+                _, _, _, name_len = _INOTIFY_EVENT.unpack_from(data, offset)
+                start = offset + _INOTIFY_EVENT.size
+                name = data[start:start + name_len].rstrip(b"\0").decode("utf-8", "replace")
+                offset = start + name_len
+                if name in self.filenames:
+                    self.callback(name)
+
+    def _run_polling(self) -> None:
+        while not self._stop.is_set():
+            existing = self._existing()
+            if existing:
+                self.callback(existing)
+            self._stop.wait(self.poll_interval)
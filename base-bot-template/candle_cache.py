@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""On-disk cache of historical candles, one compact binary file per symbol/granularity.
+
+File layout (little endian)::
+
+    header    <5sBII  magic b"CANDL", version, row count, interval count
+    interval  <dd     [start, end) epoch seconds known to be fully downloaded
+    row       <6d     time, open, high, low, close, volume (sorted by time)
+
+Coverage intervals are stored separately from rows because exchanges omit
+candles for periods without trades; a sparse range is still "downloaded".
+Newer candles that only extend the last coverage interval are appended in
+place (rows first, header last, so a crash leaves the old header describing
+valid data); anything else rewrites the file through a unique temporary file
+and ``os.replace``, so a crash never leaves a half-written cache.
+"""
+
+from __future__ import annotations
+
+import os
+import struct
+import tempfile
+import threading
+from array import array
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from exchange_interface import CANDLE_COLUMNS, CandleSeries
+
+
+CACHE_MAGIC = b"CANDL"
+CACHE_VERSION = 1
+DEFAULT_CACHE_DIR = "/app/state/candles"
+
+_HEADER = struct.Struct("<5sBII")
+_INTERVAL = struct.Struct("<dd")
+
+Interval = Tuple[float, float]
+
+# One lock per cache file, shared by every CandleCache (and exchange) in the process.
+_file_locks: Dict[str, threading.Lock] = {}
+_file_locks_guard = threading.Lock()
+
+
+def _file_lock(path: str) -> threading.Lock:
+    path = os.path.abspath(path)
+    with _file_locks_guard:
+        lock = _file_locks.get(path)
+        if lock is None:
+            lock = _file_locks[path] = threading.Lock()
+        return lock
+
+
+def merge_intervals(intervals: Iterable[Interval]) -> List[Interval]:
+    """Union of half-open intervals, sorted and coalesced."""
+    merged: List[List[float]] = []
+    for start, end in sorted(intervals):
+        if end <= start:
+            continue
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return [(start, end) for start, end in merged]
+
+
+def missing_intervals(start: float, end: float, covered: Sequence[Interval]) -> List[Interval]:
+    """Parts of ``[start, end)`` not inside any covered interval."""
+    gaps: List[Interval] = []
+    cursor = start
+    for cov_start, cov_end in covered:
+        if cov_end <= cursor:
+            continue
+        if cov_start >= end:
+            break
+        if cov_start > cursor:
+            gaps.append((cursor, min(cov_start, end)))
+        cursor = max(cursor, cov_end)
+        if cursor >= end:
+            break
+    if cursor < end:
+        gaps.append((cursor, end))
+    return gaps
+
+
+class CandleCache:
+    """Thread-safe store of downloaded candles keyed by ``(symbol, granularity)``."""
+
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR) -> None:
+        self.directory = directory
+
+    def _path(self, symbol: str, granularity: int) -> str:
+        safe = "".join(ch if ch.isalnum() or ch in "-_" else "_" for ch in symbol)
+        return os.path.join(self.directory, f"{safe}_{int(granularity)}.candles")
+
+    def load(self, symbol: str, granularity: int) -> Tuple[List[Interval], array]:
+        """Return ``(coverage, rows)`` where rows is a flat row-major ``array('d')``."""
+        path = self._path(symbol, granularity)
+        with _file_lock(path):
+            return self._read(path)
+
+    def _read(self, path: str) -> Tuple[List[Interval], array]:
+        rows = array("d")
+        try:
+            with open(path, "rb") as handle:
+                magic, version, row_count, interval_count = _HEADER.unpack(handle.read(_HEADER.size))
+                if magic != CACHE_MAGIC or version != CACHE_VERSION:
+                    return [], rows
+                raw = handle.read(interval_count * _INTERVAL.size)
+                coverage = [_INTERVAL.unpack_from(raw, i * _INTERVAL.size) for i in range(interval_count)]
+                rows.fromfile(handle, row_count * len(CANDLE_COLUMNS))
+        except (OSError, EOFError, struct.error):
+            return [], array("d")
+        return coverage, rows
+
+    def _read_meta(self, path: str) -> Optional[Tuple[List[Interval], int, Optional[float]]]:
+        """``(coverage, row_count, last_row_time)`` without reading the rows; None if unusable."""
+        width = len(CANDLE_COLUMNS)
+        try:
+            with open(path, "rb") as handle:
+                magic, version, row_count, interval_count = _HEADER.unpack(handle.read(_HEADER.size))
+                if magic != CACHE_MAGIC or version != CACHE_VERSION:
+                    return None
+                raw = handle.read(interval_count * _INTERVAL.size)
+                coverage = [_INTERVAL.unpack_from(raw, i * _INTERVAL.size) for i in range(interval_count)]
+                last_time = None
+                if row_count:
+                    handle.seek((row_count - 1) * width * 8, os.SEEK_CUR)
+                    last_time = struct.unpack("<d", handle.read(8))[0]
+        except (OSError, struct.error):
+            return None
+        return coverage, row_count, last_time
+
+    def store(self, symbol: str, granularity: int, rows: Iterable[Sequence[float]], covered: Iterable[Interval]) -> None:
+        """Merge ``rows`` (deduplicated by time, newest wins) and coverage into the cache file."""
+        path = self._path(symbol, granularity)
+        width = len(CANDLE_COLUMNS)
+        new_rows: Dict[float, Sequence[float]] = {float(row[0]): row for row in rows}
+        covered = list(covered)
+        with _file_lock(path):
+            meta = self._read_meta(path)
+            if meta is not None and new_rows:
+                coverage, row_count, last_time = meta
+                merged = merge_intervals([*coverage, *covered])
+                if last_time is not None and min(new_rows) > last_time and len(merged) == len(coverage):
+                    self._append(path, row_count, merged, [new_rows[key] for key in sorted(new_rows)])
+                    return
+
+            coverage, existing = self._read(path)
+            by_time: Dict[float, Sequence[float]] = {
+                existing[i]: existing[i:i + width] for i in range(0, len(existing), width)
+            }
+            by_time.update(new_rows)
+            coverage = merge_intervals([*coverage, *covered])
+
+            flat = array("d")
+            for key in sorted(by_time):
+                flat.extend(float(value) for value in by_time[key])
+
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=os.path.basename(path) + ".", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as handle:
+                    handle.write(_HEADER.pack(CACHE_MAGIC, CACHE_VERSION, len(by_time), len(coverage)))
+                    for interval in coverage:
+                        handle.write(_INTERVAL.pack(*interval))
+                    flat.tofile(handle)
+                os.replace(tmp_path, path)
+            except BaseException:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+                raise
+
+    def _append(self, path: str, row_count: int, coverage: List[Interval], rows: List[Sequence[float]]) -> None:
+        """Append rows newer than every stored row; coverage has as many intervals as before."""
+        width = len(CANDLE_COLUMNS)
+        flat = array("d")
+        for row in rows:
+            flat.extend(float(value) for value in row)
+        rows_offset = _HEADER.size + len(coverage) * _INTERVAL.size
+        with open(path, "r+b") as handle:
+            handle.seek(rows_offset + row_count * width * 8)
+            flat.tofile(handle)
+            handle.truncate()
+            handle.flush()
+            handle.seek(0)
+            handle.write(_HEADER.pack(CACHE_MAGIC, CACHE_VERSION, row_count + len(rows), len(coverage)))
+            for interval in coverage:
+                handle.write(_INTERVAL.pack(*interval))
+
+    def series(self, symbol: str, granularity: int, start: float, end: float) -> CandleSeries:
+        """Cached candles with ``start <= time < end`` as a columnar series."""
+        _, flat = self.load(symbol, granularity)
+        width = len(CANDLE_COLUMNS)
+        return CandleSeries.from_rows(
+            flat[i:i + width] for i in range(0, len(flat), width) if start <= flat[i] < end
+        )
+
+
+def cache_from_env(directory: Optional[str] = None) -> CandleCache:
+    return CandleCache(directory or os.getenv("BOT_CANDLE_CACHE_DIR", DEFAULT_CACHE_DIR))
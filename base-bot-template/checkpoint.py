@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""Versioned, atomically written checkpoints of bot and strategy state.
+
+File layout (little endian)::
+
+    header   <6sBBdII  magic b"BOTCKP", format version, codec, saved_at (epoch),
+                       payload length, CRC32 of the payload
+    payload  zlib-compressed msgpack (when installed) or compact JSON
+
+Checkpoints are written to ``<path>.tmp`` and renamed over the previous file,
+so a crash mid-write leaves the last good checkpoint in place. Restoring one
+is a single file read, which lets a restarted bot skip its database queries.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import struct
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+try:  # pragma: no cover - optional dependency
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+
+CHECKPOINT_MAGIC = b"BOTCKP"
+CHECKPOINT_VERSION = 1
+CODEC_JSON = 0
+CODEC_MSGPACK = 1
+
+_HEADER = struct.Struct("<6sBBdII")
+
+
+class CheckpointError(RuntimeError):
+    """Raised when a checkpoint file is missing, corrupt or from another format version."""
+
+
+@dataclass
+class Checkpoint:
+    state: Dict[str, Any]
+    saved_at: float
+    codec: int
+
+
+def _encode(state: Dict[str, Any]) -> tuple:
+    if msgpack is not None:
+        return CODEC_MSGPACK, msgpack.packb(state, use_bin_type=True, default=str)
+    return CODEC_JSON, json.dumps(state, separators=(",", ":"), default=str).encode("utf-8")
+
+
+def _decode(codec: int, raw: bytes) -> Dict[str, Any]:
+    if codec == CODEC_MSGPACK:
+        if msgpack is None:
+            raise CheckpointError("Checkpoint was written with msgpack, which is not installed")
+        return msgpack.unpackb(raw, raw=False)
+    if codec == CODEC_JSON:
+        return json.loads(raw.decode("utf-8"))
+    raise CheckpointError(f"Unknown checkpoint codec {codec}")
+
+
+def save_checkpoint(path: str, state: Dict[str, Any]) -> int:
+    """Atomically write ``state`` to ``path``; returns the number of bytes written."""
+    codec, encoded = _encode(state)
+    payload = zlib.compress(encoded, 6)
+    header = _HEADER.pack(
+        CHECKPOINT_MAGIC, CHECKPOINT_VERSION, codec, time.time(), len(payload), zlib.crc32(payload)
+    )
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as handle:
+        handle.write(header)
+        handle.write(payload)
+        handle.flush()
+        os.fsync(handle.fileno())
+    os.replace(tmp_path, path)
+    return len(header) + len(payload)
+
+
+def load_checkpoint(path: str) -> Checkpoint:
+    """Read and validate a checkpoint written by ``save_checkpoint``."""
+    try:
+        with open(path, "rb") as handle:
+            data = handle.read()
+    except FileNotFoundError as exc:
+        raise CheckpointError(f"No checkpoint at {path}") from exc
+    if len(data) < _HEADER.size:
+        raise CheckpointError("Checkpoint is truncated")
+    magic, version, codec, saved_at, length, crc = _HEADER.unpack_from(data)
+    if magic != CHECKPOINT_MAGIC:
+        raise CheckpointError("Not a bot checkpoint")
+    if version != CHECKPOINT_VERSION:
+        raise CheckpointError(f"Unsupported checkpoint version {version}")
+    payload = data[_HEADER.size:_HEADER.size + length]
+    if len(payload) != length or zlib.crc32(payload) != crc:
+        raise CheckpointError("Checkpoint payload is corrupt")
+    return Checkpoint(state=_decode(codec, zlib.decompress(payload)), saved_at=saved_at, codec=codec)
+
+
+def default_checkpoint_path(bot_instance_id: Optional[str]) -> str:
+    return f"/app/state/checkpoint-{bot_instance_id or 'default'}.bin"
@@ -9,14 +9,35 @@ import hmac
 import json
 import os
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from datetime import datetime
-from typing import Any, Dict, Optional
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
 
-import requests
 from requests import RequestException
 
-from exchange_interface import ExchangeRegistry, MarketSnapshot, TradeExecution
+from candle_cache import cache_from_env, missing_intervals
+from exchange_interface import CandleSeries, ExchangeRegistry, MarketSnapshot, TradeExecution
+from price_cache import get_price_cache
+from rate_limit import COINBASE_PRIVATE, COINBASE_PUBLIC, PRIORITY_ORDER, limited_request
+
+MAX_CANDLES_PER_REQUEST = 300
+RECENT_CANDLES = 2  # forming candle (plus the one before it) for long snapshots
+
+Timestamp = Union[datetime, float, int]
+
+
+def _epoch(value: Timestamp) -> float:
+    """Epoch seconds from a datetime (naive values are UTC) or a number."""
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.timestamp()
+    return float(value)
+
+
+def _iso(epoch: float) -> str:
+    return datetime.fromtimestamp(epoch, tz=timezone.utc).isoformat()
 
 
 @dataclass
@@ -27,6 +48,9 @@ class CoinbaseExchange:
     api_secret: Optional[str] = None
     api_passphrase: Optional[str] = None
     granularity: int = 900  # seconds (15 minutes)
+    cache_seconds: float = 10.0  # candles shared by every bot in the process for this long
+    history_workers: int = 4  # concurrent page downloads in fetch_history
+    candle_cache_dir: Optional[str] = None  # defaults to BOT_CANDLE_CACHE_DIR or /app/state/candles
 
     name: str = "coinbase"
 
@@ -36,15 +60,141 @@ class CoinbaseExchange:
         self.api_secret = self.api_secret or os.getenv("COINBASE_API_SECRET") or os.getenv("COINBASE_SECRET")
         self.api_passphrase = self.api_passphrase or os.getenv("COINBASE_API_PASSPHRASE") or os.getenv("COINBASE_PASSPHRASE")
         self.base_url = "https://api.exchange.coinbase.com"
+        self.candle_cache = cache_from_env(self.candle_cache_dir)
+
+    @property
+    def history_interval(self) -> int:
+        """Seconds per candle in the history ``fetch_market_snapshot`` serves."""
+        return self.granularity
 
     def fetch_market_snapshot(self, symbol: str, *, limit: int) -> MarketSnapshot:
+        if limit > MAX_CANDLES_PER_REQUEST:
+            # Closed candles come from the disk cache, so a cycle downloads at most
+            # the buckets closed since the last one (appended to the file); the
+            # still-forming candle comes from the shared, single-flight recent fetch.
+            now = time.time()
+            closed_end = now - now % self.granularity
+            history = self.fetch_history(symbol, start=closed_end - (limit - 1) * self.granularity, end=closed_end)
+            recent = self._recent_candles(symbol, RECENT_CANDLES)
+            rows = [history.row(i) for i in range(len(history))]
+            rows.extend(recent.row(i) for i in range(len(recent)) if recent.times[i] >= closed_end)
+            return MarketSnapshot.from_candles(symbol, CandleSeries.from_rows(rows).window(limit))
+
+        return MarketSnapshot.from_candles(symbol, self._recent_candles(symbol, limit))
+
+    def fetch_market_snapshots(self, symbols: Sequence[str], *, limit: int) -> Dict[str, MarketSnapshot]:
+        """Fetch several products concurrently.
+
+        Coinbase Exchange has no multi-product candles endpoint, so each product
+        is still one request, but the requests overlap, share the rate-limit
+        budget and land in the shared cache for every other bot on that product.
+        """
+        unique = list(dict.fromkeys(symbols))
+        if len(unique) <= 1:
+            return {symbol: self.fetch_market_snapshot(symbol, limit=limit) for symbol in unique}
+        with ThreadPoolExecutor(max_workers=min(8, len(unique)), thread_name_prefix="coinbase-batch") as pool:
+            futures = {symbol: pool.submit(self.fetch_market_snapshot, symbol, limit=limit) for symbol in unique}
+            return {symbol: future.result() for symbol, future in futures.items()}
+
+    def fetch_history(
+        self,
+        symbol: str,
+        *,
+        start: Timestamp,
+        end: Optional[Timestamp] = None,
+        granularity: Optional[int] = None,
+    ) -> CandleSeries:
+        """Candles for ``[start, end)`` (``end`` defaults to now), oldest first.
+
+        Ranges already in the local candle cache are not downloaded again; the
+        rest is split into 300-candle pages fetched concurrently under the shared
+        rate limit, then merged and deduplicated by candle time. Only closed
+        candles are cached, so the still-forming one is always fresh.
+        """
+        granularity = int(granularity or self.granularity)
+        start_ts = _epoch(start)
+        start_ts -= start_ts % granularity
+        end_ts = _epoch(end) if end is not None else time.time()
+        closed_end = end_ts - end_ts % granularity
+        if end_ts <= start_ts:
+            return CandleSeries.from_rows(())
+
+        coverage, _ = self.candle_cache.load(symbol, granularity)
+        span = MAX_CANDLES_PER_REQUEST * granularity
+        pages: List[Tuple[float, float]] = []
+        for gap_start, gap_end in missing_intervals(start_ts, end_ts, coverage):
+            gap_start -= gap_start % granularity
+            while gap_start < gap_end:
+                pages.append((gap_start, min(gap_start + span, gap_end)))
+                gap_start += span
+
+        downloaded: List[Tuple[float, ...]] = []
+        if pages:
+            workers = max(1, min(self.history_workers, len(pages)))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="coinbase-history") as pool:
+                for rows in pool.map(lambda page: self._fetch_candle_page(symbol, granularity, *page), pages):
+                    downloaded.extend(rows)
+            closed_pages = [(page_start, min(page_end, closed_end)) for page_start, page_end in pages if page_start < closed_end]
+            try:
+                if closed_pages:
+                    self.candle_cache.store(
+                        symbol,
+                        granularity,
+                        (row for row in downloaded if row[0] < closed_end),
+                        closed_pages,
+                    )
+            except OSError as exc:
+                print(f"⚠️  Could not write candle cache for {symbol}: {exc}")
+
+        by_time = {row[0]: row for row in self._cached_rows(symbol, granularity, start_ts, end_ts)}
+        by_time.update((row[0], row) for row in downloaded if start_ts <= row[0] < end_ts)
+        return CandleSeries.from_rows(by_time[key] for key in sorted(by_time))
+
+    def _recent_candles(self, symbol: str, limit: int) -> CandleSeries:
+        """The latest ``limit`` candles (forming one included), through the shared price cache."""
+        limit = max(1, limit)
+        key = f"coinbase.candles:{symbol}:{self.granularity}:{limit}"
+        raw_candles = get_price_cache().get_or_fetch(
+            key, self.cache_seconds, lambda: self._fetch_candle_rows(symbol, limit)
+        )
+
+        # Coinbase returns [time, low, high, open, close, volume] rows newest-first;
+        # reorder into chronological OHLCV columns in a single pass.
+        return CandleSeries.from_rows(
+            (row[0], row[3], row[2], row[1], row[4], row[5]) for row in reversed(raw_candles)
+        )
+
+    def _cached_rows(self, symbol: str, granularity: int, start: float, end: float) -> Iterable[Tuple[float, ...]]:
+        series = self.candle_cache.series(symbol, granularity, start, end)
+        return (series.row(i) for i in range(len(series)))
+
+    def _fetch_candle_page(self, symbol: str, granularity: int, start: float, end: float) -> List[Tuple[float, ...]]:
+        """One page of at most 300 candles as chronological OHLCV tuples."""
+        params = {
+            "granularity": granularity,
+            "start": _iso(start),
+            "end": _iso(end - granularity),
+        }
+        url = f"{self.base_url}/products/{symbol}/candles"
+        try:
+            response = limited_request(COINBASE_PUBLIC, "GET", url, params=params, timeout=10)
+            response.raise_for_status()
+        except RequestException as exc:
+            raise RuntimeError(f"Failed to fetch Coinbase candles: {exc}") from exc
+        return [
+            (float(row[0]), row[3], row[2], row[1], row[4], row[5])
+            for row in reversed(response.json())
+            if start <= row[0] < end
+        ]
+
+    def _fetch_candle_rows(self, symbol: str, limit: int) -> List[List[float]]:
         params = {
             "granularity": self.granularity,
-            "limit": max(1, min(limit, 300)),
+            "limit": limit,
         }
         url = f"{self.base_url}/products/{symbol}/candles"
         try:
-            response = requests.get(url, params=params, timeout=10)
+            response = limited_request(COINBASE_PUBLIC, "GET", url, params=params, timeout=10)
             response.raise_for_status()
         except RequestException as exc:
             raise RuntimeError(f"Failed to fetch Coinbase candles: {exc}") from exc
@@ -52,19 +202,7 @@ class CoinbaseExchange:
         raw_candles = response.json()
         if not raw_candles:
             raise RuntimeError(f"No candle data returned for {symbol}")
-
-        # Coinbase returns candles newest-first; reverse to chronological order.
-        candles = list(reversed(raw_candles))
-        closes = [float(candle[4]) for candle in candles]
-        latest_close = closes[-1]
-        latest_timestamp = datetime.utcfromtimestamp(candles[-1][0])
-
-        return MarketSnapshot(
-            symbol=symbol,
-            prices=closes,
-            current_price=latest_close,
-            timestamp=latest_timestamp,
-        )
+        return raw_candles
 
     def execute_trade(self, symbol: str, side: str, size: float, price: float) -> TradeExecution:
         if not (self.api_key and self.api_secret and self.api_passphrase):
@@ -93,7 +231,9 @@ class CoinbaseExchange:
 
         url = f"{self.base_url}{path}"
         try:
-            response = requests.post(url, headers=headers, json=body, timeout=10)
+            response = limited_request(
+                COINBASE_PRIVATE, "POST", url, priority=PRIORITY_ORDER, headers=headers, json=body, timeout=10
+            )
             response.raise_for_status()
         except RequestException as exc:
             raise RuntimeError(f"Failed to place Coinbase order: {exc}") from exc
@@ -16,6 +16,46 @@ SCHEMA_VERSION = "1.0.0"
 # Strategy names
 STRATEGY_NAMES = ["scalping", "dca", "momentum", "grid", "swing"]
 
+# Dashboard field -> ENV var
+DASHBOARD_ENV_FIELDS = {
+    'botSymbol': 'BOT_SYMBOL',
+    'botExchange': 'BOT_EXCHANGE',
+    'botSleep': 'BOT_SLEEP',
+    'botStartingCash': 'BOT_STARTING_CASH',
+    'tradeAmount': 'TRADE_AMOUNT',
+    'scalpTarget': 'SCALP_TARGET',
+    'baseAmount': 'BASE_AMOUNT',
+    'intervalMinutes': 'INTERVAL_MINUTES',
+    'gridSize': 'GRID_SIZE',
+    'gridCount': 'GRID_COUNT',
+    'maxOrders': 'MAX_ORDERS',
+    'amount': 'AMOUNT',
+    'momentumThreshold': 'MOMENTUM_THRESHOLD',
+    'momentumPeriod': 'MOMENTUM_PERIOD',
+    'volumeThreshold': 'VOLUME_THRESHOLD',
+    'tradingIntervalMinutes': 'TRADING_INTERVAL_MINUTES',
+    # Scalping filter parameters
+    'buyThreshold': 'BUY_THRESHOLD',
+    'shortMaPeriod': 'SHORT_MA_PERIOD',
+    'longMaPeriod': 'LONG_MA_PERIOD',
+    'rsiThreshold': 'RSI_THRESHOLD',
+    'rsiMin': 'RSI_MIN',
+    'rsiMax': 'RSI_MAX',
+    'enableVolumeConfirmation': 'ENABLE_VOLUME_CONFIRMATION'
+}
+
+# Dashboard fields that must be present (and non-null) per strategy
+STRATEGY_REQUIRED_FIELDS = {
+    "scalping": ["botSymbol", "tradeAmount", "scalpTarget"],
+    "dca": ["botSymbol", "botStartingCash", "baseAmount", "intervalMinutes"],
+    "momentum": ["botSymbol", "botStartingCash", "baseAmount"],
+    "grid": ["botSymbol", "amount", "gridSize", "gridCount", "maxOrders"],
+    "swing": ["botSymbol", "botStartingCash", "baseAmount"]
+}
+
+# Dashboard fields with these suffixes must be non-negative numbers
+NON_NEGATIVE_SUFFIXES = ("Amount", "Target", "Threshold")
+
 class ValidationError(Exception):
     """Custom validation error"""
     def __init__(self, field: str, message: str, code: str = "VALIDATION_ERROR"):
@@ -41,7 +81,7 @@ def validate_dashboard_settings(strategy: str, dashboard_settings: Dict[str, Any
 
     # Basic type validation
     for field, value in dashboard_settings.items():
-        if field.endswith('Amount') or field.endswith('Target') or field.endswith('Threshold'):
+        if field.endswith(NON_NEGATIVE_SUFFIXES):
             if not isinstance(value, (int, float)) or value < 0:
                 raise ValidationError(field, f"{field} must be a positive number", "INVALID_TYPE")
 
@@ -55,36 +95,8 @@ def map_dashboard_to_env_vars(strategy: str, dashboard_settings: Dict[str, Any])
 
     env_vars: Dict[str, str] = {}
 
-    # Common field mappings
-    field_mappings = {
-        'botSymbol': 'BOT_SYMBOL',
-        'botExchange': 'BOT_EXCHANGE',
-        'botSleep': 'BOT_SLEEP',
-        'botStartingCash': 'BOT_STARTING_CASH',
-        'tradeAmount': 'TRADE_AMOUNT',
-        'scalpTarget': 'SCALP_TARGET',
-        'baseAmount': 'BASE_AMOUNT',
-        'intervalMinutes': 'INTERVAL_MINUTES',
-        'gridSize': 'GRID_SIZE',
-        'gridCount': 'GRID_COUNT',
-        'maxOrders': 'MAX_ORDERS',
-        'amount': 'AMOUNT',
-        'momentumThreshold': 'MOMENTUM_THRESHOLD',
-        'momentumPeriod': 'MOMENTUM_PERIOD',
-        'volumeThreshold': 'VOLUME_THRESHOLD',
-        'tradingIntervalMinutes': 'TRADING_INTERVAL_MINUTES',
-        # Scalping filter parameters
-        'buyThreshold': 'BUY_THRESHOLD',
-        'shortMaPeriod': 'SHORT_MA_PERIOD',
-        'longMaPeriod': 'LONG_MA_PERIOD',
-        'rsiThreshold': 'RSI_THRESHOLD',
-        'rsiMin': 'RSI_MIN',
-        'rsiMax': 'RSI_MAX',
-        'enableVolumeConfirmation': 'ENABLE_VOLUME_CONFIRMATION'
-    }
-
     # Map dashboard fields to ENV vars
-    for dashboard_key, env_key in field_mappings.items():
+    for dashboard_key, env_key in DASHBOARD_ENV_FIELDS.items():
         value = dashboard_settings.get(dashboard_key)
         if value is not None:
             env_vars[env_key] = str(value)
@@ -125,15 +137,7 @@ def apply_settings_with_scope_check(settings: Dict[str, Any]) -> Dict[str, Any]:
 def get_strategy_required_fields(strategy: str) -> List[str]:
     """Get required fields for a strategy."""
 
-    strategy_requirements = {
-        "scalping": ["botSymbol", "tradeAmount", "scalpTarget"],
-        "dca": ["botSymbol", "botStartingCash", "baseAmount", "intervalMinutes"],
-        "momentum": ["botSymbol", "botStartingCash", "baseAmount"],
-        "grid": ["botSymbol", "amount", "gridSize", "gridCount", "maxOrders"],
-        "swing": ["botSymbol", "botStartingCash", "baseAmount"]
-    }
-
-    return strategy_requirements.get(strategy, [])
+    return STRATEGY_REQUIRED_FIELDS.get(strategy, [])
 
 # Legacy compatibility - replaces settings_mapping.py
 STRATEGY_MAPPINGS = {
@@ -3,26 +3,252 @@
 
 from __future__ import annotations
 
+import importlib
 import random
+import threading
+import time
+from array import array
+from concurrent.futures import FIRST_COMPLETED, Future, wait
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Callable, Dict, List, Protocol
+from typing import Any, Callable, Dict, Iterable, List, Optional, Protocol, Sequence, Tuple
+
+
+CANDLE_COLUMNS = ("time", "open", "high", "low", "close", "volume")
+
+PRICE_MODES = ("sequential", "hedged", "parallel")
+
+# CoinGecko coin ids per symbol (BTC-USD -> bitcoin vs usd).
+COINGECKO_IDS: Dict[str, Tuple[str, str]] = {
+    'BTC-USD': ('bitcoin', 'usd'),
+    'ETH-USD': ('ethereum', 'usd'),
+    'DOT-USD': ('polkadot', 'usd'),
+    'SOL-USD': ('solana', 'usd'),
+    'ADA-USD': ('cardano', 'usd'),
+}
+
+# Symbols any PaperExchange in the process has served recently (symbol -> last request,
+# monotonic); a miss refreshes all stale ones in one batch. Unrequested symbols age out.
+_watched_symbols: Dict[str, float] = {}
+WATCH_TTL_SECONDS = 600.0
+
+
+def _watch(symbol: str) -> None:
+    _watched_symbols[symbol] = time.monotonic()
+
+
+def _watched_peers(symbol: str) -> List[str]:
+    cutoff = time.monotonic() - WATCH_TTL_SECONDS
+    peers = []
+    for peer, seen in list(_watched_symbols.items()):
+        if seen < cutoff:
+            _watched_symbols.pop(peer, None)
+        elif peer != symbol:
+            peers.append(peer)
+    return peers
+
+
+def _start_source(fetch: Callable[..., Any], *args: Any) -> Future:
+    """Run ``fetch`` on its own daemon thread.
+
+    A shared pool would let abandoned lookups (hung until the HTTP timeout) occupy
+    every worker, leaving the hedge queued behind them; a dedicated thread always
+    starts immediately and dies with its request.
+    """
+    future: Future = Future()
+    future.set_running_or_notify_cancel()
+
+    def run() -> None:
+        try:
+            future.set_result(fetch(*args))
+        except BaseException as exc:  # noqa: BLE001 - handed to the waiting caller
+            future.set_exception(exc)
+
+    threading.Thread(target=run, name="price-source", daemon=True).start()
+    return future
+
+
+class CandleSeries:
+    """Chronological OHLCV candles stored as contiguous ``array('d')`` columns.
+
+    A series is immutable once built: column accessors hand out read-only
+    ``memoryview`` objects, so windows (``closes[-30:]``) are zero-copy and
+    strategies cannot mutate data shared with other consumers.
+    """
+
+    __slots__ = ("_columns", "_views")
+
+    def __init__(
+        self,
+        time: Sequence[float],
+        open: Sequence[float],
+        high: Sequence[float],
+        low: Sequence[float],
+        close: Sequence[float],
+        volume: Sequence[float],
+    ) -> None:
+        columns = (time, open, high, low, close, volume)
+        length = len(close)
+        if any(len(column) != length for column in columns):
+            raise ValueError("CandleSeries columns must have equal length")
+        self._columns = columns
+        self._views = tuple(memoryview(column).toreadonly() for column in columns)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Sequence[float]]) -> "CandleSeries":
+        """Build from ``(time, open, high, low, close, volume)`` rows in chronological order."""
+        columns = tuple(array("d") for _ in CANDLE_COLUMNS)
+        appenders = tuple(column.append for column in columns)
+        for row in rows:
+            for append, value in zip(appenders, row):
+                append(float(value))
+        return cls(*columns)
+
+    @classmethod
+    def from_closes(cls, closes: Iterable[float], *, end_time: float = 0.0, spacing: float = 60.0) -> "CandleSeries":
+        """Wrap a close-only history (open/high/low = close, volume = 0)."""
+        close = array("d", closes)
+        count = len(close)
+        start = end_time - spacing * (count - 1)
+        time = array("d", (start + spacing * index for index in range(count)))
+        return cls(time, array("d", close), array("d", close), array("d", close), close, array("d", bytes(8 * count)))
+
+    def __len__(self) -> int:
+        return len(self._columns[4])
+
+    def column(self, name: str) -> memoryview:
+        return self._views[CANDLE_COLUMNS.index(name)]
+
+    def window(self, limit: int) -> "CandleSeries":
+        """Return the most recent ``limit`` candles as zero-copy views over this series."""
+        if limit <= 0 or limit >= len(self):
+            return self
+        return CandleSeries(*(view[-limit:] for view in self._views))
+
+    def row(self, index: int) -> Tuple[float, ...]:
+        return tuple(column[index] for column in self._columns)
+
+    @property
+    def times(self) -> memoryview:
+        return self._views[0]
+
+    @property
+    def opens(self) -> memoryview:
+        return self._views[1]
+
+    @property
+    def highs(self) -> memoryview:
+        return self._views[2]
+
+    @property
+    def lows(self) -> memoryview:
+        return self._views[3]
+
+    @property
+    def closes(self) -> memoryview:
+        return self._views[4]
+
+    @property
+    def volumes(self) -> memoryview:
+        return self._views[5]
 
 
-@dataclass
 class MarketSnapshot:
-    """Minimal market view shared with strategies."""
+    """Minimal market view shared with strategies.
+
+    ``prices`` is a plain list of closes. Snapshots built with ``from_candles``
+    materialise it from the ``candles`` close column on first access; code
+    that wants the zero-copy view (or OHLCV columns) reads ``candles`` directly.
+    """
+
+    __slots__ = ("symbol", "current_price", "timestamp", "candles", "_prices")
+
+    def __init__(
+        self,
+        symbol: str,
+        prices: Optional[Sequence[float]],
+        current_price: float,
+        timestamp: datetime,
+        candles: Optional[CandleSeries] = None,
+    ) -> None:
+        if prices is None and candles is None:
+            raise ValueError("MarketSnapshot needs prices or candles")
+        self.symbol = symbol
+        self._prices = prices
+        self.current_price = current_price
+        self.timestamp = timestamp
+        self.candles = candles
 
-    symbol: str
-    prices: List[float]
-    current_price: float
-    timestamp: datetime
+    @classmethod
+    def from_candles(
+        cls,
+        symbol: str,
+        candles: CandleSeries,
+        *,
+        timestamp: Optional[datetime] = None,
+        current_price: Optional[float] = None,
+    ) -> "MarketSnapshot":
+        if not len(candles):
+            raise ValueError(f"No candles for {symbol}")
+        return cls(
+            symbol=symbol,
+            prices=None,
+            current_price=candles.closes[-1] if current_price is None else current_price,
+            timestamp=timestamp or datetime.utcfromtimestamp(candles.times[-1]),
+            candles=candles,
+        )
+
+    @property
+    def prices(self) -> List[float]:
+        prices = self._prices
+        if not isinstance(prices, list):
+            prices = self._prices = self.candles.closes.tolist() if prices is None else list(prices)
+        return prices
+
+    @prices.setter
+    def prices(self, value: Sequence[float]) -> None:
+        self._prices = value
+
+    def __len__(self) -> int:
+        """Number of closes, without materialising ``prices``."""
+        return len(self._prices) if self._prices is not None else len(self.candles)
+
+    def __repr__(self) -> str:
+        return (
+            f"MarketSnapshot(symbol={self.symbol!r}, closes={len(self)}, "
+            f"current_price={self.current_price!r}, timestamp={self.timestamp!r})"
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, MarketSnapshot):
+            return NotImplemented
+        return (self.symbol, self.current_price, self.timestamp, self.prices) == (
+            other.symbol, other.current_price, other.timestamp, other.prices
+        )
+
+    __hash__ = None  # mutable, like the dataclass it replaces
 
     @property
     def history(self) -> List[float]:
         """Convenience alias used by strategies."""
         return self.prices
 
+    def window(self, limit: int) -> List[float]:
+        """Most recent ``limit`` closes as a list."""
+        return self.prices[-limit:] if limit > 0 else self.prices
+
+    @property
+    def volumes(self) -> Optional[memoryview]:
+        return self.candles.volumes if self.candles is not None else None
+
+    @property
+    def highs(self) -> Optional[memoryview]:
+        return self.candles.highs if self.candles is not None else None
+
+    @property
+    def lows(self) -> Optional[memoryview]:
+        return self.candles.lows if self.candles is not None else None
+
 
 @dataclass
 class TradeExecution:
@@ -46,25 +272,48 @@ class Exchange(Protocol):
         """Execute a trade at the provided price."""
 
 
+class BatchExchange(Exchange, Protocol):
+    """Optional extension for exchanges that can serve many symbols per upstream call."""
+
+    def fetch_market_snapshots(self, symbols: Sequence[str], *, limit: int) -> Dict[str, MarketSnapshot]:
+        """Return snapshots keyed by symbol using as few upstream calls as possible."""
+
+
+def fetch_market_snapshots(exchange: Exchange, symbols: Sequence[str], *, limit: int) -> Dict[str, MarketSnapshot]:
+    """Fetch several symbols, batching when the exchange supports it."""
+    batch = getattr(exchange, "fetch_market_snapshots", None)
+    if callable(batch):
+        return batch(symbols, limit=limit)
+    return {symbol: exchange.fetch_market_snapshot(symbol, limit=limit) for symbol in dict.fromkeys(symbols)}
+
+
 class ExchangeRegistry:
     """Simple registry so the bot can instantiate exchanges by name."""
 
     _exchanges: Dict[str, Callable[..., Exchange]] = {}
+    _modules: Dict[str, str] = {}
 
     @classmethod
     def register(cls, name: str, factory: Callable[..., Exchange]) -> None:
         cls._exchanges[name] = factory
 
+    @classmethod
+    def register_module(cls, name: str, module: str) -> None:
+        """Declare that importing ``module`` registers ``name``; it is imported on first ``create``."""
+        cls._modules[name] = module
+
     @classmethod
     def create(cls, name: str, **kwargs) -> Exchange:
+        if name not in cls._exchanges and name in cls._modules:
+            importlib.import_module(cls._modules[name])
         if name not in cls._exchanges:
-            available = ", ".join(sorted(cls._exchanges)) or "<none>"
+            available = ", ".join(cls.available()) or "<none>"
             raise ValueError(f"Unknown exchange '{name}'. Available: {available}")
         return cls._exchanges[name](**kwargs)
 
     @classmethod
     def available(cls) -> List[str]:
-        return sorted(cls._exchanges)
+        return sorted(set(cls._exchanges) | set(cls._modules))
 
 
 @dataclass
@@ -74,107 +323,279 @@ class PaperExchange:
     name: str = "paper"
     coinbase_url: str = "https://api.exchange.coinbase.com"
     coingecko_url: str = "https://api.coingecko.com/api/v3/simple/price"
-    _price_cache: Dict[str, float] = field(default_factory=dict)
-    _cache_timestamp: Dict[str, datetime] = field(default_factory=dict)
+    coinbase_products_url: str = "https://api.coinbase.com/api/v3/brokerage/market/products"
     cache_duration_seconds: int = 30
+    price_mode: str = "hedged"  # sequential | hedged | parallel
+    hedge_delay_seconds: float = 0.5
+    request_timeout_seconds: float = 10.0
+    _source_latency: Dict[str, float] = field(default_factory=dict)
+    _latency_lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.price_mode not in PRICE_MODES:
+            raise ValueError(f"price_mode must be one of {', '.join(PRICE_MODES)}")
 
     def fetch_market_snapshot(self, symbol: str, *, limit: int) -> MarketSnapshot:
         """Fetch real market data for paper trading simulation."""
-        current_price = self._get_real_price(symbol)
+        _watch(symbol)
+        return self._snapshot_from_price(symbol, self._get_real_price(symbol), limit)
+
+    def fetch_market_snapshots(self, symbols: Sequence[str], *, limit: int) -> Dict[str, MarketSnapshot]:
+        """Fetch many symbols with one batched price lookup for every cache miss."""
+        from price_cache import get_price_cache
+
+        cache = get_price_cache()
+        prices: Dict[str, float] = {}
+        missing: List[str] = []
+        for symbol in dict.fromkeys(symbols):
+            _watch(symbol)
+            cached = cache.get(f"price:{symbol}", self.cache_duration_seconds)
+            if cached is not None:
+                prices[symbol] = cached
+            else:
+                missing.append(symbol)
+
+        if missing:
+            for symbol, price in self._fetch_prices_batch(missing).items():
+                cache.put(f"price:{symbol}", price)
+                prices[symbol] = price
+            for symbol in missing:
+                if symbol not in prices:
+                    prices[symbol] = self._get_real_price(symbol)
+
+        return {symbol: self._snapshot_from_price(symbol, prices[symbol], limit) for symbol in prices}
+
+    def _snapshot_from_price(self, symbol: str, current_price: float, limit: int) -> MarketSnapshot:
         # Generate realistic price history around current price
         history = self._generate_realistic_history(current_price, limit)
+        now = datetime.utcnow()
+        candles = CandleSeries.from_closes(history, end_time=(now - datetime(1970, 1, 1)).total_seconds())
 
-        return MarketSnapshot(
-            symbol=symbol,
-            prices=history,
-            current_price=current_price,
-            timestamp=datetime.utcnow(),
-        )
+        return MarketSnapshot.from_candles(symbol, candles, timestamp=now, current_price=current_price)
 
     def execute_trade(self, symbol: str, side: str, size: float, price: float) -> TradeExecution:
         # No slippage or fees - this exchange is a sandbox for strategies.
         return TradeExecution(side=side, size=size, price=price, timestamp=datetime.utcnow())
 
     def _get_real_price(self, symbol: str) -> float:
-        """Get current real price with caching and multiple API fallbacks."""
-        now = datetime.utcnow()
-
-        # Check cache
-        if (symbol in self._price_cache and
-            symbol in self._cache_timestamp and
-            (now - self._cache_timestamp[symbol]).total_seconds() < self.cache_duration_seconds):
-            print(f"📊 Using cached price for {symbol}: ${self._price_cache[symbol]:,.2f}")
-            return self._price_cache[symbol]
+        """Get current real price via the shared cache and hedged API fallbacks."""
+        from price_cache import get_price_cache
 
-        # Try multiple APIs in order
-        price = None
-        last_error = None
+        cache = get_price_cache()
+        key = f"price:{symbol}"
+        cached = cache.get(key, self.cache_duration_seconds)
+        if cached is not None:
+            print(f"📊 Using cached price for {symbol}: ${cached:,.2f}")
+            return cached
 
-        # Try 1: Coinbase API
         try:
-            price = self._fetch_coinbase_price(symbol)
-            if price:
-                print(f"✅ Coinbase: Fetched real price for {symbol}: ${price:,.2f}")
+            # Concurrent misses for the same symbol (other bots in this process) share one lookup.
+            return cache.get_or_fetch(key, self.cache_duration_seconds, lambda: self._fetch_live_price(symbol))
         except Exception as e:
-            print(f"❌ Coinbase API failed for {symbol}: {e}")
-            last_error = e
+            # If every API failed, fall back to the cached price (even if expired)
+            stale = cache.get_stale(key)
+            if stale is not None:
+                print(f"⚠️  All APIs failed for {symbol}, using expired cached price: ${stale[0]:,.2f}")
+                return stale[0]
+            raise Exception(f"All price APIs failed for {symbol}. Last error: {e}") from e
+
+    def _fetch_live_price(self, symbol: str) -> float:
+        from price_cache import get_price_cache
+
+        # Refresh every other stale watched symbol in the same upstream call.
+        cache = get_price_cache()
+        peers = [
+            peer for peer in _watched_peers(symbol)
+            if not cache.is_fresh(f"price:{peer}", self.cache_duration_seconds)
+        ]
+        if not peers:
+            source, price = self._fetch_first_price(symbol)
+            print(f"✅ {source}: Fetched real price for {symbol}: ${price:,.2f}")
+            return price
 
-        # Try 2: CoinGecko API (if Coinbase failed)
-        if not price:
+        # Batch endpoints race first, then the per-symbol ones, under one hedged deadline.
+        symbols = [symbol, *peers]
+        sources = [
+            (name, self._batch_source(fetch, symbol)) for name, fetch in self._price_sources(batch=True)
+        ] + [
+            (name, self._single_source(fetch)) for name, fetch in self._price_sources()
+        ]
+        source, fetched = self._first_answer(sources, symbols, symbol)
+        for peer in peers:
+            if peer in fetched:
+                cache.put(f"price:{peer}", fetched[peer])
+        print(f"✅ {source}: Fetched real price for {symbol} (+{len(fetched) - 1} more)")
+        return fetched[symbol]
+
+    def _price_sources(self, *, batch: bool = False) -> List[Tuple[str, Callable[[Any], Any]]]:
+        """Sources ordered by observed latency (unmeasured sources keep their default order)."""
+        if batch:
+            sources = [("Coinbase", self._fetch_coinbase_prices), ("CoinGecko", self._fetch_coingecko_prices)]
+        else:
+            sources = [("Coinbase", self._fetch_coinbase_price), ("CoinGecko", self._fetch_coingecko_price)]
+        with self._latency_lock:
+            latency = dict(self._source_latency)
+        return sorted(sources, key=lambda item: latency.get(item[0], 0.0))
+
+    @staticmethod
+    def _batch_source(
+        fetch: Callable[[Sequence[str]], Dict[str, float]], symbol: str
+    ) -> Callable[[Sequence[str]], Dict[str, float]]:
+        """A batch lookup only counts as an answer when it priced ``symbol``."""
+        def run(symbols: Sequence[str]) -> Dict[str, float]:
+            prices = fetch(symbols)
+            if symbol not in prices:
+                raise ValueError(f"batch response has no price for {symbol}")
+            return prices
+        return run
+
+    @staticmethod
+    def _single_source(fetch: Callable[[str], float]) -> Callable[[Sequence[str]], Dict[str, float]]:
+        return lambda symbols: {symbols[0]: fetch(symbols[0])}
+
+    def _timed_fetch(self, source: str, fetch: Callable[[Any], Any], request: Any) -> Any:
+        started = time.monotonic()
+        try:
+            price = fetch(request)
+            if not price:
+                raise ValueError(f"{source} returned no price")
+        except Exception:
+            # Failures count as a full timeout so a flaky source drifts to the back.
+            self._record_latency(source, self.request_timeout_seconds)
+            raise
+        self._record_latency(source, time.monotonic() - started)
+        return price
+
+    def _record_latency(self, source: str, seconds: float) -> None:
+        with self._latency_lock:
+            previous = self._source_latency.get(source)
+            self._source_latency[source] = seconds if previous is None else previous + 0.3 * (seconds - previous)
+
+    def _fetch_first_price(self, symbol: str) -> Tuple[str, float]:
+        """Return ``(source, price)`` from the first source to answer with a valid price."""
+        return self._first_answer(self._price_sources(), symbol, symbol)
+
+    def _first_answer(
+        self, sources: List[Tuple[str, Callable[[Any], Any]]], request: Any, symbol: str
+    ) -> Tuple[str, Any]:
+        """Return ``(source, result)`` from the first source to answer ``request``.
+
+        ``sequential`` waits for each source in turn, ``hedged`` starts the next
+        source after ``hedge_delay_seconds`` (or as soon as the current one
+        fails), and ``parallel`` asks every source at once. ``symbol`` is only
+        used in log lines.
+        """
+        last_error: Optional[BaseException] = None
+
+        if self.price_mode == "sequential":
+            for source, fetch in sources:
+                try:
+                    return source, self._timed_fetch(source, fetch, request)
+                except Exception as e:
+                    print(f"❌ {source} API failed for {symbol}: {e}")
+                    last_error = e
+            raise last_error or RuntimeError("no price sources configured")
+
+        hedge_delay = 0.0 if self.price_mode == "parallel" else self.hedge_delay_seconds
+        deadline = time.monotonic() + self.request_timeout_seconds
+        pending: Dict[Future, str] = {}
+        queue = list(sources)
+        while queue or pending:
+            if queue and (not pending or hedge_delay <= 0):
+                source, fetch = queue.pop(0)
+                pending[_start_source(self._timed_fetch, source, fetch, request)] = source
+                continue
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            timeout = min(hedge_delay, remaining) if queue else remaining
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done and queue:
+                source, fetch = queue.pop(0)
+                print(f"⏱️  No price after {hedge_delay:.2f}s, hedging {symbol} with {source}")
+                pending[_start_source(self._timed_fetch, source, fetch, request)] = source
+                continue
+            for future in done:
+                source = pending.pop(future)
+                try:
+                    return source, future.result()
+                except Exception as e:
+                    print(f"❌ {source} API failed for {symbol}: {e}")
+                    last_error = e
+        raise last_error or TimeoutError(f"No price source answered within {self.request_timeout_seconds}s")
+
+    def _fetch_prices_batch(self, symbols: Sequence[str]) -> Dict[str, float]:
+        """Prices for as many ``symbols`` as possible: one Coinbase call, then one CoinGecko call."""
+        prices: Dict[str, float] = {}
+        for source, fetch in (("Coinbase", self._fetch_coinbase_prices), ("CoinGecko", self._fetch_coingecko_prices)):
+            remaining = [symbol for symbol in symbols if symbol not in prices]
+            if not remaining:
+                break
             try:
-                price = self._fetch_coingecko_price(symbol)
-                if price:
-                    print(f"✅ CoinGecko: Fetched real price for {symbol}: ${price:,.2f}")
+                prices.update(fetch(remaining))
             except Exception as e:
-                print(f"❌ CoinGecko API failed for {symbol}: {e}")
-                last_error = e
-
-        # If both APIs failed, try cached price (even if expired)
-        if not price and symbol in self._price_cache:
-            print(f"⚠️  All APIs failed for {symbol}, using expired cached price: ${self._price_cache[symbol]:,.2f}")
-            return self._price_cache[symbol]
-
-        # If we got a price, cache it
-        if price:
-            self._price_cache[symbol] = price
-            self._cache_timestamp[symbol] = now
-            return price
+                print(f"❌ {source} batch price API failed for {len(remaining)} symbols: {e}")
+        return prices
+
+    def _fetch_coinbase_prices(self, symbols: Sequence[str]) -> Dict[str, float]:
+        """Fetch many prices from Coinbase's public market products endpoint."""
+        from rate_limit import COINBASE_PUBLIC, limited_request
+
+        params = [("product_ids", symbol) for symbol in symbols]
+        response = limited_request(
+            COINBASE_PUBLIC, "GET", self.coinbase_products_url, params=params, timeout=self.request_timeout_seconds
+        )
+        response.raise_for_status()
+        prices = {}
+        for product in response.json().get("products", []):
+            if product.get("product_id") in symbols and product.get("price"):
+                prices[product["product_id"]] = float(product["price"])
+        return prices
 
-        # Complete failure
-        raise Exception(f"All price APIs failed for {symbol}. Last error: {last_error}")
+    def _fetch_coingecko_prices(self, symbols: Sequence[str]) -> Dict[str, float]:
+        """Fetch many prices from CoinGecko's ``simple/price`` in one call."""
+        from rate_limit import COINGECKO, limited_request
+
+        supported = [symbol for symbol in symbols if symbol in COINGECKO_IDS]
+        if not supported:
+            return {}
+        ids = ",".join(sorted({COINGECKO_IDS[symbol][0] for symbol in supported}))
+        currencies = ",".join(sorted({COINGECKO_IDS[symbol][1] for symbol in supported}))
+        url = f"{self.coingecko_url}?ids={ids}&vs_currencies={currencies}"
+        response = limited_request(COINGECKO, "GET", url, timeout=self.request_timeout_seconds)
+        response.raise_for_status()
+        data = response.json()
+        prices = {}
+        for symbol in supported:
+            coin_id, vs_currency = COINGECKO_IDS[symbol]
+            value = data.get(coin_id, {}).get(vs_currency)
+            if value:
+                prices[symbol] = float(value)
+        return prices
 
     def _fetch_coinbase_price(self, symbol: str) -> float:
         """Fetch price from Coinbase API."""
-        import requests
+        from rate_limit import COINBASE_PUBLIC, limited_request
         url = f"{self.coinbase_url}/products/{symbol}/ticker"
         print(f"🔗 Coinbase URL: {url}")
 
-        response = requests.get(url, timeout=10)
+        response = limited_request(COINBASE_PUBLIC, "GET", url, timeout=self.request_timeout_seconds)
         response.raise_for_status()
         data = response.json()
         return float(data['price'])
 
     def _fetch_coingecko_price(self, symbol: str) -> float:
         """Fetch price from CoinGecko API."""
-        import requests
-
-        # Convert symbol format (BTC-USD -> bitcoin vs usd)
-        symbol_map = {
-            'BTC-USD': ('bitcoin', 'usd'),
-            'ETH-USD': ('ethereum', 'usd'),
-            'DOT-USD': ('polkadot', 'usd'),
-            'SOL-USD': ('solana', 'usd'),
-            'ADA-USD': ('cardano', 'usd'),
-        }
-
-        if symbol not in symbol_map:
+        from rate_limit import COINGECKO, limited_request
+
+        if symbol not in COINGECKO_IDS:
             raise Exception(f"Symbol {symbol} not supported by CoinGecko")
 
-        coin_id, vs_currency = symbol_map[symbol]
+        coin_id, vs_currency = COINGECKO_IDS[symbol]
         url = f"{self.coingecko_url}?ids={coin_id}&vs_currencies={vs_currency}"
         print(f"🔗 CoinGecko URL: {url}")
 
-        response = requests.get(url, timeout=10)
+        response = limited_request(COINGECKO, "GET", url, timeout=self.request_timeout_seconds)
         response.raise_for_status()
         data = response.json()
         return float(data[coin_id][vs_currency])
@@ -199,5 +620,10 @@ class PaperExchange:
 
 
 
-# Register built-in exchanges.
+# Register built-in exchanges. Adapters with heavier imports (HTTP clients,
+# sockets, mmap tapes) load the first time a bot asks for them.
 ExchangeRegistry.register("paper", PaperExchange)
+ExchangeRegistry.register_module("coinbase", "coinbase_exchange")
+ExchangeRegistry.register_module("stream", "market_feed")
+ExchangeRegistry.register_module("record", "market_tape")
+ExchangeRegistry.register_module("replay", "market_tape")
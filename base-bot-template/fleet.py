@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""Process-wide registry of running bots and batched control fan-out.
+
+A host running many bots in one process registers each ``UniversalBot`` here
+while its loop runs. ``POST /bulk`` on any control server takes one signed
+batch of ``{"bot_id", "command" | "settings"}`` entries, verifies the signature
+once and applies the entries to the registered bots on a shared thread pool,
+returning one result per target bot. Only bots configured with the same
+``BOT_SECRET`` as the receiving server can be addressed. Different bots run
+concurrently; the entries addressed to one bot (explicitly or through ``"*"``)
+run one after another in request order.
+"""
+
+from __future__ import annotations
+
+import hmac
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+
+BULK_WILDCARD = "*"
+MAX_BULK_ENTRIES = 10000
+
+
+class BulkRequestError(ValueError):
+    """The batch itself is malformed (as opposed to one entry failing)."""
+
+
+class FleetRegistry:
+    """Thread-safe set of running bots addressable by ``bot_instance_id``."""
+
+    def __init__(self, *, max_workers: int = 32, logger: Optional[logging.Logger] = None) -> None:
+        self.max_workers = max(1, max_workers)
+        self.logger = logger or logging.getLogger(__name__)
+        self._bots: List[Any] = []
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def register(self, bot: Any) -> None:
+        """Add ``bot``; raises ``ValueError`` if it has no id or another bot already uses its id."""
+        bot_id = bot.config.bot_instance_id
+        if not bot_id:
+            raise ValueError("bots need a bot_instance_id to join the fleet")
+        with self._lock:
+            if bot in self._bots:
+                return
+            if any(str(other.config.bot_instance_id) == str(bot_id) for other in self._bots):
+                raise ValueError(f"another running bot already uses bot_instance_id {bot_id}")
+            self._bots.append(bot)
+
+    def unregister(self, bot: Any) -> None:
+        with self._lock:
+            if bot in self._bots:
+                self._bots.remove(bot)
+
+    def bots(self) -> List[Any]:
+        with self._lock:
+            return list(self._bots)
+
+    def ids(self) -> List[str]:
+        return [str(bot.config.bot_instance_id) for bot in self.bots()]
+
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="fleet")
+            return self._executor
+
+    # --- dispatch --------------------------------------------------------
+
+    def dispatch(self, entries: Any, *, bot_secret: str) -> Dict[str, Any]:
+        """Apply a batch of entries and return per-bot results in request order.
+
+        Bots are resolved by their current ``bot_instance_id`` (``"*"`` targets
+        every authorised bot). Raises :class:`BulkRequestError` when the batch
+        is not a list of well-formed entries; failures of individual bots are
+        reported in their result instead.
+        """
+        started = time.perf_counter()
+        tasks = self._plan(entries, bot_secret)
+        # One sequential queue per bot, so overlapping entries apply in request order.
+        queues: Dict[int, List[int]] = {}
+        for position, (_, bot, _) in enumerate(tasks):
+            queues.setdefault(id(bot) if bot is not None else -1 - position, []).append(position)
+        results: List[Dict[str, Any]] = [{}] * len(tasks)
+
+        def run_queue(positions: List[int]) -> None:
+            for position in positions:
+                results[position] = _run_task(*tasks[position])
+
+        if len(queues) > 1:
+            list(self._pool().map(run_queue, queues.values()))
+        else:
+            for positions in queues.values():
+                run_queue(positions)
+        failed = sum(1 for result in results if not result["ok"])
+        return {
+            "results": results,
+            "succeeded": len(results) - failed,
+            "failed": failed,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+        }
+
+    def _plan(self, entries: Any, bot_secret: str) -> List[Tuple[str, Any, Dict[str, Any]]]:
+        if not isinstance(entries, list) or not entries:
+            raise BulkRequestError("entries must be a non-empty list")
+        if len(entries) > MAX_BULK_ENTRIES:
+            raise BulkRequestError(f"at most {MAX_BULK_ENTRIES} entries per batch")
+
+        by_id: Dict[str, Any] = {}
+        ambiguous = set()
+        for bot in self.bots():
+            bot_id = bot.config.bot_instance_id
+            secret = bot.config.bot_secret or ""
+            if not bot_id or not secret or not hmac.compare_digest(secret, bot_secret):
+                continue
+            if str(bot_id) in by_id:
+                ambiguous.add(str(bot_id))  # ids changed through settings after register
+            by_id[str(bot_id)] = bot
+        for bot_id in ambiguous:
+            del by_id[bot_id]
+            self.logger.warning("Several running bots use bot_instance_id %s; /bulk skips them", bot_id)
+
+        tasks: List[Tuple[str, Any, Dict[str, Any]]] = []
+        for index, entry in enumerate(entries):
+            if not isinstance(entry, dict) or "bot_id" not in entry:
+                raise BulkRequestError(f"entry {index} must be an object with a bot_id")
+            if ("command" in entry) == ("settings" in entry):
+                raise BulkRequestError(f"entry {index} needs exactly one of command or settings")
+            if "settings" in entry and not isinstance(entry["settings"], dict):
+                raise BulkRequestError(f"entry {index}: settings must be an object")
+            bot_id = str(entry["bot_id"])
+            if bot_id == BULK_WILDCARD:
+                tasks.extend((target_id, bot, entry) for target_id, bot in by_id.items())
+            else:
+                tasks.append((bot_id, by_id.get(bot_id), entry))
+        return tasks
+
+
+def _run_task(bot_id: str, bot: Any, entry: Dict[str, Any]) -> Dict[str, Any]:
+    if bot is None:
+        return {"bot_id": bot_id, "ok": False, "error": "unknown bot or not authorised"}
+    try:
+        if "command" in entry:
+            metadata = entry.get("metadata") if isinstance(entry.get("metadata"), dict) else {}
+            response = bot.handle_command(str(entry["command"]).lower(), metadata)
+            return {"bot_id": bot_id, "ok": response.get("status") == "ok", "result": response}
+        bot.apply_settings(entry["settings"])
+        return {"bot_id": bot_id, "ok": True}
+    except Exception as exc:  # noqa: BLE001 - one bot failing must not fail the batch
+        return {"bot_id": bot_id, "ok": False, "error": str(exc)}
+
+
+_fleet: Optional[FleetRegistry] = None
+_fleet_lock = threading.Lock()
+
+
+def get_fleet() -> FleetRegistry:
+    """Return the process-wide registry."""
+    global _fleet
+    if _fleet is None:
+        with _fleet_lock:
+            if _fleet is None:
+                _fleet = FleetRegistry()
+    return _fleet
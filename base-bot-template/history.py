@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""Cursor-paginated trade and log history for the control API.
+
+Hot pages come from memory: the trade journal (bisected time column plus
+per-side / per-reason row indexes) and a ring buffer of recent log records.
+Once a cursor walks past the oldest in-memory entry it continues in the
+database; those cold pages never change, so they are kept in a small LRU
+cache and repeated scrolling does not query the database again.
+
+Cursors are opaque, URL-safe strings: ``j<row>`` (journal), ``m<seq>`` (log
+buffer) and ``d<epoch microseconds>_<skip>`` (database).
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from collections import OrderedDict, deque
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Deque, Dict, Hashable, List, Optional, Tuple
+
+from trade_journal import TradeJournal
+
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+_LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+class LogBuffer(logging.Handler):
+    """Keep the last ``capacity`` log records in memory with increasing sequence numbers."""
+
+    def __init__(self, capacity: int = 5000, level: int = logging.INFO) -> None:
+        super().__init__(level)
+        self._records: Deque[Tuple[int, float, str, str]] = deque(maxlen=capacity)
+        self._next_seq = 0
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            message = record.getMessage()
+        except Exception:  # noqa: BLE001 - a bad format string must not break logging
+            self.handleError(record)
+            return
+        self._records.append((self._next_seq, record.created, record.levelname, message))
+        self._next_seq += 1
+
+    def first_time(self) -> Optional[float]:
+        with self.lock:
+            return self._records[0][1] if self._records else None
+
+    def page(
+        self, *, before: Optional[int] = None, limit: int = DEFAULT_PAGE_SIZE, min_level: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """Newest-first records with ``seq < before``; returns them and the next ``before`` (or ``None``)."""
+        threshold = _LEVELS.index(min_level) if min_level else 0
+        with self.lock:
+            records = list(self._records)
+        if not records:
+            return [], None
+        first_seq = records[0][0]
+        end = len(records) if before is None else max(0, min(len(records), before - first_seq))
+        entries: List[Dict[str, Any]] = []
+        for position in range(end - 1, -1, -1):
+            seq, created, level, message = records[position]
+            if threshold and (level not in _LEVELS or _LEVELS.index(level) < threshold):
+                continue
+            if len(entries) == limit:
+                return entries, entries[-1]["seq"]
+            entries.append({
+                "seq": seq,
+                "timestamp": _iso(created),
+                "level": level,
+                "message": message,
+            })
+        return entries, None
+
+
+class PageCache:
+    """Tiny thread-safe LRU for immutable database pages."""
+
+    def __init__(self, maxsize: int = 128) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._pages: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            page = self._pages.get(key)
+            if page is None:
+                self.misses += 1
+                return None
+            self._pages.move_to_end(key)
+            self.hits += 1
+            return page
+
+    def put(self, key: Hashable, page: Any) -> None:
+        with self._lock:
+            self._pages[key] = page
+            self._pages.move_to_end(key)
+            while len(self._pages) > self.maxsize:
+                self._pages.popitem(last=False)
+
+    def stats(self) -> Dict[str, int]:
+        return {"size": len(self._pages), "hits": self.hits, "misses": self.misses}
+
+
+def _iso(epoch: float) -> str:
+    return datetime.fromtimestamp(epoch, tz=timezone.utc).replace(tzinfo=None).isoformat()
+
+
+def _naive_utc(value: datetime) -> datetime:
+    return value.astimezone(timezone.utc).replace(tzinfo=None) if value.tzinfo else value
+
+
+def _aware_utc(value: datetime) -> datetime:
+    return value.astimezone(timezone.utc) if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def _decode_cursor(cursor: Optional[str]) -> Tuple[Optional[str], Any]:
+    if not cursor:
+        return None, None
+    kind, body = cursor[0], cursor[1:]
+    try:
+        if kind in ("j", "m"):
+            return kind, int(body)
+        if kind == "d":
+            micros, _, skip = body.partition("_")
+            return kind, (_EPOCH + int(micros) * _MICROSECOND, int(skip or 0))
+    except ValueError:
+        pass
+    raise ValueError(f"Invalid cursor: {cursor}")
+
+
+def _db_cursor(before: datetime, skip: int) -> str:
+    if before.tzinfo is None:
+        before = before.replace(tzinfo=timezone.utc)
+    return f"d{(before - _EPOCH) // _MICROSECOND}_{skip}"
+
+
+class HistoryService:
+    """Serve ``/trades`` and ``/logs`` pages from memory first and the database second."""
+
+    def __init__(
+        self,
+        journal: TradeJournal,
+        log_buffer: LogBuffer,
+        db_client: Callable[[], Any],
+        *,
+        lock: Optional[threading.RLock] = None,
+        cache_size: int = 128,
+    ) -> None:
+        self.journal = journal
+        self.log_buffer = log_buffer
+        self._db_client = db_client
+        # Held while reading the journal (the trading loop appends to it); never during DB reads.
+        self._lock = lock or threading.RLock()
+        self.cache = PageCache(cache_size)
+        # Upper bound for the first database page while memory is still empty; fixed so the
+        # page cache key stays stable (anything written after this lands in memory first).
+        self._opened = datetime.now(timezone.utc)
+
+    def _database(self) -> Any:
+        client = self._db_client()
+        return client if client is not None and client.connection is not None else None
+
+    def _cold_cursor(self, oldest: Optional[float]) -> Optional[str]:
+        """Cursor for the first database page older than everything held in memory."""
+        if self._database() is None:
+            return None
+        if oldest is None:
+            return _db_cursor(self._opened, 0)
+        before = datetime.fromtimestamp(oldest, tz=timezone.utc) - _MICROSECOND
+        return _db_cursor(before, 0)
+
+    def _cold_page(
+        self,
+        key: Tuple[Any, ...],
+        fetch: Callable[..., Optional[List[Dict[str, Any]]]],
+        before: datetime,
+        skip: int,
+        limit: int,
+    ) -> Tuple[Optional[List[Dict[str, Any]]], Optional[str]]:
+        cache_key = key + (before, skip, limit)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+        rows = fetch(before=before, skip=skip, limit=limit + 1)
+        if rows is None:
+            return None, _db_cursor(before, skip)  # database unavailable: let the client retry
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            # The database may hand back naive timestamps; cursors are aware UTC.
+            last = _aware_utc(rows[-1]["timestamp"])
+            ties = sum(1 for row in rows if _aware_utc(row["timestamp"]) == last)
+            next_cursor = _db_cursor(last, ties + skip if last == before else ties)
+        page = (rows, next_cursor)
+        self.cache.put(cache_key, page)
+        return page
+
+    def trades(
+        self,
+        *,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        side: Optional[str] = None,
+        reason: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> Dict[str, Any]:
+        limit = max(1, min(MAX_PAGE_SIZE, limit))
+        kind, position = _decode_cursor(cursor)
+        if kind not in (None, "j", "d"):
+            raise ValueError(f"Invalid cursor: {cursor}")
+        if kind != "d":
+            with self._lock:
+                rows, before = self.journal.page(
+                    before=position, limit=limit, side=side, reason=reason, start=start, end=end
+                )
+                oldest = self.journal.first_time()
+            next_cursor = f"j{before}" if before is not None else self._cold_cursor(oldest)
+            if rows or next_cursor is None:
+                return {"trades": rows, "next_cursor": next_cursor, "source": "journal"}
+            kind, position = _decode_cursor(next_cursor)
+
+        database = self._database()
+        if database is None:
+            return {"trades": [], "next_cursor": None, "source": "database", "error": "database unavailable"}
+        before, skip = position
+        rows, next_cursor = self._cold_page(
+            ("trades", side, reason, start, end),
+            lambda **page: database.fetch_trades(side=side, reason=reason, start=start, end=end, **page),
+            before,
+            skip,
+            limit,
+        )
+        if rows is None:
+            return {"trades": [], "next_cursor": next_cursor, "source": "database", "error": "database unavailable"}
+        trades = []
+        for row in rows:
+            trade = {
+                "side": row["side"],
+                "size": float(row["amount"]),
+                "price": float(row["price"]),
+                "timestamp": _naive_utc(row["timestamp"]).isoformat(),
+                "reason": row.get("reasoning") or "",
+            }
+            if row.get("symbol") and row["symbol"] != "UNKNOWN":
+                trade["symbol"] = row["symbol"]
+            if row.get("profit") is not None:
+                trade["realized_pnl"] = float(row["profit"])
+            trades.append(trade)
+        return {"trades": trades, "next_cursor": next_cursor, "source": "database"}
+
+    def logs(
+        self,
+        *,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        level: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        limit = max(1, min(MAX_PAGE_SIZE, limit))
+        min_level = level.upper() if level else None
+        if min_level is not None and min_level not in _LEVELS:
+            raise ValueError(f"Unknown log level: {level}")
+        kind, position = _decode_cursor(cursor)
+        if kind not in (None, "m", "d"):
+            raise ValueError(f"Invalid cursor: {cursor}")
+        if kind != "d":
+            entries, before = self.log_buffer.page(before=position, limit=limit, min_level=min_level)
+            next_cursor = f"m{before}" if before is not None else self._cold_cursor(self.log_buffer.first_time())
+            if entries or next_cursor is None:
+                return {"logs": entries, "next_cursor": next_cursor, "source": "memory"}
+            kind, position = _decode_cursor(next_cursor)
+
+        database = self._database()
+        if database is None:
+            return {"logs": [], "next_cursor": None, "source": "database", "error": "database unavailable"}
+        levels = _LEVELS[_LEVELS.index(min_level):] if min_level else None
+        before, skip = position
+        rows, next_cursor = self._cold_page(
+            ("logs", min_level),
+            lambda **page: database.fetch_logs(levels=levels, **page),
+            before,
+            skip,
+            limit,
+        )
+        if rows is None:
+            return {"logs": [], "next_cursor": next_cursor, "source": "database", "error": "database unavailable"}
+        entries = [
+            {
+                "timestamp": _naive_utc(row["timestamp"]).isoformat(),
+                "level": row["level"],
+                "message": row["message"],
+            }
+            for row in rows
+        ]
+        return {"logs": entries, "next_cursor": next_cursor, "source": "database"}
@@ -1,5 +1,10 @@
 ﻿#!/usr/bin/env python3
-"""HTTP endpoints exposing health, runtime settings, and control hooks."""
+"""HTTP endpoints exposing health, runtime settings, and control hooks.
+
+Routing lives in plain functions (``status_get``, ``control_get``,
+``control_post`` and the combined ``dispatch``) so the threaded servers here
+and the asyncio front end in ``async_http`` answer every path identically.
+"""
 
 from __future__ import annotations
 
@@ -8,15 +13,264 @@ import time
 import hmac
 import hashlib
 import threading
+import zlib
+from datetime import datetime
 from http import HTTPStatus
 from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
-from typing import Any, Optional
-from urllib.parse import urlparse
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+try:  # pragma: no cover - optional dependency
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
 
+from fleet import get_fleet
 from strategy_interface import available_strategies
 
 
 MAX_SKEW_MS = 5 * 60 * 1000
+COMPRESS_MIN_BYTES = 512  # smaller bodies are sent as-is
+COMPRESS_LEVEL = 5
+
+# Content-Encoding -> zlib wbits ("deflate" is the zlib container per RFC 9110)
+_ENCODINGS = (("gzip", 16 + zlib.MAX_WBITS), ("deflate", zlib.MAX_WBITS))
+
+Route = Tuple[HTTPStatus, Any]
+
+_NOT_FOUND: Route = (HTTPStatus.NOT_FOUND, {"error": "unknown endpoint"})
+
+
+def render_json(payload: Any) -> bytes:
+    """Compact JSON, through orjson when it is installed."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass  # e.g. integers beyond 64 bits; the stdlib encoder handles them
+    return json.dumps(payload, separators=(",", ":")).encode("utf-8")
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Pick gzip or deflate from an ``Accept-Encoding`` header (honouring ``q=0``)."""
+    if not accept_encoding:
+        return None
+    accepted = {}
+    for item in accept_encoding.lower().split(","):
+        name, _, params = item.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip()] = quality
+    wildcard = accepted.get("*", 0.0)
+    best, best_quality = None, 0.0
+    for name, _ in _ENCODINGS:
+        quality = accepted.get(name, wildcard)
+        if quality > best_quality:
+            best, best_quality = name, quality
+    return best
+
+
+def encode_response(payload: Any, accept_encoding: Optional[str] = None) -> Tuple[bytes, Optional[str]]:
+    """Render ``payload`` and compress it when the client accepts it and it is worth it.
+
+    Returns ``(body, content_encoding)``; ``content_encoding`` is ``None`` for identity.
+    """
+    body = render_json(payload)
+    if len(body) < COMPRESS_MIN_BYTES:
+        return body, None
+    encoding = negotiate_encoding(accept_encoding)
+    if encoding is None:
+        return body, None
+    compressor = zlib.compressobj(COMPRESS_LEVEL, zlib.DEFLATED, dict(_ENCODINGS)[encoding])
+    return compressor.compress(body) + compressor.flush(), encoding
+
+
+class _JsonHandler(BaseHTTPRequestHandler):
+    def log_message(self, format: str, *args):  # noqa: D401 - silence default logging
+        return
+
+    def _send_json(self, status: HTTPStatus, payload: Any) -> None:
+        body, encoding = encode_response(payload, self.headers.get("Accept-Encoding"))
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Vary", "Accept-Encoding")
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class _ReplayGuard:
+    """Signatures seen within the timestamp window; a repeat is a replayed request."""
+
+    def __init__(self) -> None:
+        self._seen: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def first_use(self, signature: str) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            if len(self._seen) > 1024:
+                self._seen = {sig: expiry for sig, expiry in self._seen.items() if expiry > now}
+            if self._seen.get(signature, 0.0) > now:
+                return False
+            self._seen[signature] = now + 2 * MAX_SKEW_MS / 1000
+            return True
+
+
+_bulk_replays = _ReplayGuard()
+
+
+def verify_hmac(
+    bot_secret: Optional[str], headers: Any, payload: Any, raw_body: bytes, *, path: Optional[str] = None
+) -> Optional[str]:
+    """Return an error message, or ``None`` when the request is correctly signed.
+
+    With ``path`` the MAC covers ``"<timestamp>\nPOST\n<path>\n" + body`` and each
+    signature is accepted once, so a captured request cannot be replayed to
+    another route, re-dated or sent again.
+    """
+    if not bot_secret:
+        return "HMAC secret is not configured"
+
+    signature = headers.get("X-Bot-Signature")
+    timestamp = headers.get("X-Bot-Timestamp")
+    if not signature or not timestamp:
+        return "Missing authentication headers"
+
+    try:
+        request_time = int(timestamp)
+    except ValueError:
+        return "Invalid timestamp"
+
+    now = int(time.time() * 1000)
+    if abs(now - request_time) > MAX_SKEW_MS:
+        return "Request timestamp outside allowed window"
+
+    prefix = f"{timestamp}\nPOST\n{path}\n".encode("utf-8") if path is not None else b""
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    digest_canonical = hmac.new(
+        bot_secret.encode("utf-8"),
+        prefix + canonical.encode("utf-8"),
+        hashlib.sha256,
+    ).hexdigest()
+    digest_raw = hmac.new(
+        bot_secret.encode("utf-8"),
+        prefix + raw_body,
+        hashlib.sha256,
+    ).hexdigest()
+
+    if not hmac.compare_digest(signature, digest_canonical) and not hmac.compare_digest(signature, digest_raw):
+        return "Invalid signature"
+
+    if path is not None and not _bulk_replays.first_use(signature):
+        return "Replayed request"
+
+    return None
+
+
+def status_get(bot, path: str) -> Route:
+    if path == "/health":
+        payload = bot.get_status()
+        payload["strategies"] = available_strategies()
+        return HTTPStatus.OK, payload
+    if path == "/settings":
+        return HTTPStatus.OK, bot.get_settings()
+    return _NOT_FOUND
+
+
+_PAGE_PARAMS = {
+    "limit": int,
+    "cursor": str,
+    "side": str,
+    "reason": str,
+    "level": str,
+    "start": datetime.fromisoformat,
+    "end": datetime.fromisoformat,
+}
+
+
+def _page_query(query: str, allowed: Tuple[str, ...]) -> Dict[str, Any]:
+    """Parse ``?limit=&cursor=&...`` for the paginated history routes."""
+    params: Dict[str, Any] = {}
+    for name, values in parse_qs(query).items():
+        if name not in allowed:
+            continue
+        try:
+            params[name] = _PAGE_PARAMS[name](values[-1])
+        except ValueError:
+            raise ValueError(f"Invalid {name}: {values[-1]}") from None
+    return params
+
+
+def control_get(bot, path: str, query: str = "") -> Route:
+    if path == "/settings":
+        return HTTPStatus.OK, bot.get_settings()
+    if path == "/performance":
+        return HTTPStatus.OK, bot.get_performance()
+    try:
+        if path == "/trades":
+            params = _page_query(query, ("limit", "cursor", "side", "reason", "start", "end"))
+            return HTTPStatus.OK, bot.get_trade_history(**params)
+        if path == "/logs":
+            params = _page_query(query, ("limit", "cursor", "level"))
+            # Without paging parameters /logs keeps returning the dashboard summary.
+            return HTTPStatus.OK, bot.get_log_history(**params) if params else bot.get_logs()
+    except ValueError as exc:
+        return HTTPStatus.BAD_REQUEST, {"error": str(exc)}
+    return _NOT_FOUND
+
+
+def control_post(bot, bot_secret: Optional[str], path: str, headers: Any, raw_body: bytes) -> Route:
+    if path not in {"/settings", "/commands", "/bulk"}:
+        return _NOT_FOUND
+
+    if not raw_body:
+        return HTTPStatus.BAD_REQUEST, {"error": "Missing request body"}
+
+    try:
+        payload = json.loads(raw_body)
+    except json.JSONDecodeError:
+        return HTTPStatus.BAD_REQUEST, {"error": "Invalid JSON"}
+
+    # /bulk reaches every bot in the process, so its signature is bound to the route and time.
+    error = verify_hmac(bot_secret, headers, payload, raw_body, path=path if path == "/bulk" else None)
+    if error:
+        return HTTPStatus.UNAUTHORIZED, {"error": error}
+
+    try:
+        if path == "/settings":
+            bot.apply_settings(payload)
+            return HTTPStatus.OK, bot.get_settings()
+
+        if path == "/bulk":
+            entries = payload.get("entries") if isinstance(payload, dict) else None
+            return HTTPStatus.OK, get_fleet().dispatch(entries, bot_secret=bot_secret)
+
+        command = str(payload.get("command", "")).lower()
+        metadata = payload.get("metadata") if isinstance(payload.get("metadata"), dict) else {}
+        return HTTPStatus.OK, bot.handle_command(command, metadata)
+    except Exception as exc:  # noqa: BLE001 - surface as JSON error
+        return HTTPStatus.BAD_REQUEST, {"error": str(exc)}
+
+
+def dispatch(
+    bot, bot_secret: Optional[str], method: str, path: str, headers: Any, raw_body: bytes, query: str = ""
+) -> Route:
+    """Status and control routes on one port (used by the asyncio server)."""
+    if method == "GET":
+        if path == "/health":
+            return status_get(bot, path)
+        return control_get(bot, path, query)
+    if method == "POST":
+        return control_post(bot, bot_secret, path, headers, raw_body)
+    return HTTPStatus.METHOD_NOT_ALLOWED, {"error": f"{method} not supported"}
 
 
 class BotHTTPServer:
@@ -32,30 +286,9 @@ class BotHTTPServer:
     def _handler_factory(self):
         bot = self.bot
 
-        class Handler(BaseHTTPRequestHandler):
-            def _send_json(self, status: HTTPStatus, payload: Any) -> None:
-                body = json.dumps(payload).encode("utf-8")
-                self.send_response(status)
-                self.send_header("Content-Type", "application/json")
-                self.send_header("Content-Length", str(len(body)))
-                self.end_headers()
-                self.wfile.write(body)
-
-            def log_message(self, format: str, *args):  # noqa: D401 - silence default logging
-                return
-
+        class Handler(_JsonHandler):
             def do_GET(self):  # noqa: N802
-                parsed = urlparse(self.path)
-                if parsed.path == "/health":
-                    payload = bot.get_status()
-                    payload["strategies"] = available_strategies()
-                    self._send_json(HTTPStatus.OK, payload)
-                    return
-                if parsed.path == "/settings":
-                    self._send_json(HTTPStatus.OK, bot.get_settings())
-                    return
-
-                self._send_json(HTTPStatus.NOT_FOUND, {"error": "unknown endpoint"})
+                self._send_json(*status_get(bot, urlparse(self.path).path))
 
             def do_POST(self):  # noqa: N802 - not supported on this port
                 self._send_json(HTTPStatus.METHOD_NOT_ALLOWED, {"error": "POST not supported"})
@@ -93,110 +326,21 @@ class BotControlServer:
         bot = self.bot
         bot_secret = self.bot_secret
 
-        class Handler(BaseHTTPRequestHandler):
-            def log_message(self, format: str, *args):  # noqa: D401
-                return
-
-            def _send_json(self, status: HTTPStatus, payload: Any) -> None:
-                body = json.dumps(payload).encode("utf-8")
-                self.send_response(status)
-                self.send_header("Content-Type", "application/json")
-                self.send_header("Content-Length", str(len(body)))
-                self.end_headers()
-                self.wfile.write(body)
-
+        class Handler(_JsonHandler):
             def _read_body(self) -> bytes:
                 length = int(self.headers.get("Content-Length", 0))
                 if length <= 0:
                     return b""
                 return self.rfile.read(length)
 
-            def _verify_hmac(self, payload: Any, raw_body: bytes) -> Optional[str]:
-                if not bot_secret:
-                    return "HMAC secret is not configured"
-
-                signature = self.headers.get("X-Bot-Signature")
-                timestamp = self.headers.get("X-Bot-Timestamp")
-                if not signature or not timestamp:
-                    return "Missing authentication headers"
-
-                try:
-                    request_time = int(timestamp)
-                except ValueError:
-                    return "Invalid timestamp"
-
-                now = int(time.time() * 1000)
-                if abs(now - request_time) > MAX_SKEW_MS:
-                    return "Request timestamp outside allowed window"
-
-                canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
-                digest_canonical = hmac.new(
-                    bot_secret.encode("utf-8"),
-                    canonical.encode("utf-8"),
-                    hashlib.sha256,
-                ).hexdigest()
-                digest_raw = hmac.new(
-                    bot_secret.encode("utf-8"),
-                    raw_body,
-                    hashlib.sha256,
-                ).hexdigest()
-
-                if not hmac.compare_digest(signature, digest_canonical) and not hmac.compare_digest(signature, digest_raw):
-                    return "Invalid signature"
-
-                return None
-
             def do_GET(self):  # noqa: N802
                 parsed = urlparse(self.path)
-                if parsed.path == "/settings":
-                    self._send_json(HTTPStatus.OK, bot.get_settings())
-                    return
-                if parsed.path == "/performance":
-                    self._send_json(HTTPStatus.OK, bot.get_performance())
-                    return
-                if parsed.path == "/logs":
-                    self._send_json(HTTPStatus.OK, bot.get_logs())
-                    return
-
-                self._send_json(HTTPStatus.NOT_FOUND, {"error": "unknown endpoint"})
+                self._send_json(*control_get(bot, parsed.path, parsed.query))
 
             def do_POST(self):  # noqa: N802
-                parsed = urlparse(self.path)
-                if parsed.path not in {"/settings", "/commands"}:
-                    self._send_json(HTTPStatus.NOT_FOUND, {"error": "unknown endpoint"})
-                    return
-
-                raw_body = self._read_body()
-                if not raw_body:
-                    self._send_json(HTTPStatus.BAD_REQUEST, {"error": "Missing request body"})
-                    return
-
-                try:
-                    payload = json.loads(raw_body)
-                except json.JSONDecodeError:
-                    self._send_json(HTTPStatus.BAD_REQUEST, {"error": "Invalid JSON"})
-                    return
-
-                error = self._verify_hmac(payload, raw_body)
-                if error:
-                    self._send_json(HTTPStatus.UNAUTHORIZED, {"error": error})
-                    return
-
-                try:
-                    if parsed.path == "/settings":
-                        bot.apply_settings(payload)
-                        self._send_json(HTTPStatus.OK, bot.get_settings())
-                        return
-
-                    if parsed.path == "/commands":
-                        command = str(payload.get("command", "")).lower()
-                        metadata = payload.get("metadata") if isinstance(payload.get("metadata"), dict) else {}
-                        result = bot.handle_command(command, metadata)
-                        self._send_json(HTTPStatus.OK, result)
-                        return
-                except Exception as exc:  # noqa: BLE001 - surface as JSON error
-                    self._send_json(HTTPStatus.BAD_REQUEST, {"error": str(exc)})
-                    return
+                path = urlparse(self.path).path
+                raw_body = self._read_body() if path in {"/settings", "/commands", "/bulk"} else b""
+                self._send_json(*control_post(bot, bot_secret, path, self.headers, raw_body))
 
         return Handler
 
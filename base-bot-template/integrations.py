@@ -8,19 +8,29 @@ import logging
 import time
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 from urllib.parse import urljoin
 import hmac
 import hashlib
 
-import requests
+# psycopg2 is optional during local development and only imported once a
+# DatabaseClient has a database URL (see _load_psycopg2).
+psycopg2 = None
+RealDictCursor = None
+execute_values = None
 
-try:  # psycopg2 is optional during local development
-    import psycopg2
-    from psycopg2.extras import RealDictCursor
-except ImportError:  # pragma: no cover - handled gracefully at runtime
-    psycopg2 = None  # type: ignore[assignment]
-    RealDictCursor = None  # type: ignore[assignment]
+
+def _load_psycopg2() -> bool:
+    """Import psycopg2 on first use; ``False`` when it is not installed."""
+    global psycopg2, RealDictCursor, execute_values
+    if psycopg2 is None:
+        try:
+            import psycopg2 as driver
+            from psycopg2.extras import RealDictCursor as cursor_factory, execute_values as insert_rows
+        except ImportError:  # pragma: no cover - handled gracefully at runtime
+            return False
+        RealDictCursor, execute_values, psycopg2 = cursor_factory, insert_rows, driver
+    return True
 
 
 @dataclass
@@ -89,6 +99,8 @@ class StatusBroadcaster:
         endpoint = f"/api/bots/{self.bot_instance_id}/status"
         url = urljoin(self.base_url + "/", endpoint.lstrip("/"))
 
+        import requests
+
         try:
             response = requests.post(url, headers=headers, data=serialized.encode("utf-8"), timeout=5)
         except Exception as exc:  # pragma: no cover - network failures handled at runtime
@@ -115,7 +127,7 @@ class DatabaseClient:
         if not self.database_url:
             self.logger.debug("No database URL provided; skipping DB integration")
             return
-        if psycopg2 is None:
+        if not _load_psycopg2():
             self.logger.warning("psycopg2 not installed; database integration disabled")
             return
 
@@ -202,6 +214,45 @@ class DatabaseClient:
         )
         self._execute(query, params)
 
+    def log_trades(self, trades: Sequence[Dict[str, Any]]) -> None:
+        """Insert several trades (``log_trade`` keyword dicts) with one multi-row INSERT."""
+        if not trades or not self.connection or not self.bot_instance_id:
+            return
+        now = datetime.now(timezone.utc)
+        rows = [
+            (
+                self.bot_instance_id,
+                trade["side"].lower(),
+                trade.get("symbol") or 'UNKNOWN',
+                trade["amount"],
+                trade["price"],
+                trade.get("fees", 0.0),
+                trade.get("profit"),
+                trade.get("exchange"),
+                trade.get("external_trade_id"),
+                now,
+                trade.get("reasoning"),
+                trade.get("strategy"),
+                trade.get("target_price"),
+                trade.get("stop_loss"),
+                trade.get("entry_price"),
+            )
+            for trade in trades
+        ]
+        query = (
+            "INSERT INTO bot_trades (bot_id, side, symbol, amount, price, fees, profit, exchange, external_trade_id, timestamp, reasoning, strategy, target_price, stop_loss, entry_price) "
+            "VALUES %s"
+        )
+        try:
+            with self.connection.cursor() as cursor:
+                execute_values(cursor, query, rows)
+        except Exception as exc:  # pragma: no cover - depends on remote DB
+            self.logger.debug("Database batch insert failed: %s", exc)
+            try:
+                self._connect()
+            except Exception:  # pragma: no cover - reconnection best effort
+                pass
+
     def log_event(self, level: str, message: str, *, metadata: Optional[Dict[str, Any]] = None) -> None:
         if not self.connection or not self.bot_instance_id:
             return
@@ -248,8 +299,12 @@ class DatabaseClient:
 
     def get_portfolio_quantity(self) -> float:
         """Get current portfolio quantity from database."""
+        return self.read_portfolio_quantity() or 0.0
+
+    def read_portfolio_quantity(self) -> Optional[float]:
+        """Portfolio quantity from the database, or ``None`` when it cannot be read."""
         if not self.connection or not self.bot_instance_id:
-            return 0.0
+            return None
         try:
             with self.connection.cursor() as cursor:
                 cursor.execute(
@@ -262,7 +317,7 @@ class DatabaseClient:
                 return 0.0
         except Exception as exc:
             self.logger.debug("Failed to get portfolio_quantity: %s", exc)
-            return 0.0
+            return None
 
     def update_portfolio_quantity(self, delta: float) -> None:
         """Add delta to portfolio_quantity for this bot (positive for buy, negative for sell)."""
@@ -361,6 +416,91 @@ class DatabaseClient:
             self.logger.debug("Failed to get currency from trades: %s", exc)
             return ""
 
+    def _fetch_page(
+        self,
+        table: str,
+        columns: str,
+        tiebreak: str,
+        *,
+        before: datetime,
+        skip: int,
+        limit: int,
+        filters: Sequence[Tuple[str, Any]],
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Newest-first rows with ``timestamp <= before``, skipping the first ``skip``.
+
+        ``skip`` counts rows at exactly ``before`` already returned by the previous
+        page; ``tiebreak`` orders such rows deterministically. ``filters`` are
+        ``(clause, value)`` pairs added when ``value`` is not ``None``.
+        Returns ``None`` when the database cannot be read.
+        """
+        if not self.connection or not self.bot_instance_id:
+            return None
+        clauses = ["bot_id = %s", "timestamp <= %s"]
+        params: List[Any] = [self.bot_instance_id, before]
+        for clause, value in filters:
+            if value is not None:
+                clauses.append(clause)
+                params.append(value)
+        query = (
+            f"SELECT {columns} FROM {table} WHERE {' AND '.join(clauses)} "
+            f"ORDER BY timestamp DESC, {tiebreak} OFFSET %s LIMIT %s"
+        )
+        params.extend((skip, limit))
+        try:
+            with self.connection.cursor() as cursor:
+                cursor.execute(query, tuple(params))
+                return [dict(row) for row in cursor.fetchall()]
+        except Exception as exc:
+            self.logger.debug("Failed to read %s page: %s", table, exc)
+            return None
+
+    def fetch_trades(
+        self,
+        *,
+        before: datetime,
+        skip: int = 0,
+        limit: int = 50,
+        side: Optional[str] = None,
+        reason: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> Optional[List[Dict[str, Any]]]:
+        """One page of ``bot_trades`` for the history API (see ``_fetch_page``)."""
+        return self._fetch_page(
+            "bot_trades",
+            "side, symbol, amount, price, profit, reasoning, timestamp",
+            "side, price, amount",
+            before=before,
+            skip=skip,
+            limit=limit,
+            filters=(
+                ("side = %s", side.lower() if side else None),
+                ("reasoning = %s", reason),
+                ("timestamp >= %s", start),
+                ("timestamp < %s", end),
+            ),
+        )
+
+    def fetch_logs(
+        self,
+        *,
+        before: datetime,
+        skip: int = 0,
+        limit: int = 50,
+        levels: Optional[Sequence[str]] = None,
+    ) -> Optional[List[Dict[str, Any]]]:
+        """One page of ``bot_logs`` for the history API (see ``_fetch_page``)."""
+        return self._fetch_page(
+            "bot_logs",
+            "level, message, timestamp",
+            "level, message",
+            before=before,
+            skip=skip,
+            limit=limit,
+            filters=(("level = ANY(%s)", list(levels) if levels else None),),
+        )
+
     def close(self) -> None:
         if self.connection:
             try:
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""Tiny host-local coordinator shared by bot processes over a Unix socket.
+
+The protocol is one JSON object per line in each direction:
+``{"op": "<name>", ...}`` -> ``{"ok": true, ...}`` or ``{"ok": false, "error": "..."}``.
+Services (rate limits, shared caches) register handlers by op name, so a
+single coordinator process can back every bot container on a host.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import socket
+import socketserver
+import threading
+from typing import Any, Callable, Dict, Optional
+
+
+COORDINATOR_ENV = "BOT_COORDINATOR_SOCKET"
+DEFAULT_SOCKET_PATH = "/tmp/bot-coordinator.sock"
+
+Handler = Callable[[Dict[str, Any]], Dict[str, Any]]
+
+
+class CoordinatorError(OSError):
+    """The coordinator answered ``{"ok": false}``; callers fall back like on a transport error."""
+
+
+class CoordinatorServer:
+    """Threaded Unix-socket server dispatching JSON-line requests to handlers."""
+
+    def __init__(self, path: str = DEFAULT_SOCKET_PATH, handlers: Optional[Dict[str, Handler]] = None) -> None:
+        self.path = path
+        self.handlers: Dict[str, Handler] = dict(handlers or {})
+        if os.path.exists(path):
+            os.unlink(path)
+        self._server = socketserver.ThreadingUnixStreamServer(path, self._handler_factory())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    def register(self, op: str, handler: Handler) -> None:
+        self.handlers[op] = handler
+
+    def _handler_factory(self):
+        handlers = self.handlers
+
+        class RequestHandler(socketserver.StreamRequestHandler):
+            def handle(self) -> None:
+                for line in self.rfile:
+                    try:
+                        request = json.loads(line)
+                        handler = handlers.get(request.get("op"))
+                        if handler is None:
+                            response = {"ok": False, "error": f"unknown op {request.get('op')!r}"}
+                        else:
+                            response = handler(request)
+                            response.setdefault("ok", True)
+                    except Exception as exc:  # noqa: BLE001 - report errors to the caller
+                        response = {"ok": False, "error": str(exc)}
+                    try:
+                        self.wfile.write((json.dumps(response) + "\n").encode("utf-8"))
+                        self.wfile.flush()
+                    except OSError:
+                        return
+
+        return RequestHandler
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def serve_forever(self) -> None:
+        self._server.serve_forever()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread.is_alive():
+            self._thread.join(timeout=2)
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
+
+
+class CoordinatorClient:
+    """Client with one persistent connection per thread; raises OSError when unreachable."""
+
+    def __init__(self, path: str, *, timeout: float = 30.0) -> None:
+        self.path = path
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            sock.connect(self.path)
+            conn = (sock, sock.makefile("r", encoding="utf-8"))
+            self._local.conn = conn
+        return conn
+
+    def _reset(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        self._local.conn = None
+        if conn is not None:
+            try:
+                conn[1].close()
+                conn[0].close()
+            except OSError:
+                pass
+
+    def call(self, op: str, **payload: Any) -> Dict[str, Any]:
+        request = dict(payload, op=op)
+        try:
+            sock, reader = self._connection()
+            sock.sendall((json.dumps(request) + "\n").encode("utf-8"))
+            line = reader.readline()
+        except OSError:
+            self._reset()
+            raise
+        if not line:
+            self._reset()
+            raise ConnectionError("coordinator closed the connection")
+        response = json.loads(line)
+        if not response.get("ok", False):
+            raise CoordinatorError(response.get("error", "coordinator error"))
+        return response
+
+
+def client_from_env() -> Optional[CoordinatorClient]:
+    """Return a client when ``BOT_COORDINATOR_SOCKET`` points at a live socket."""
+    path = os.getenv(COORDINATOR_ENV)
+    if not path or not os.path.exists(path):
+        return None
+    return CoordinatorClient(path)
+
+
+def build_server(path: str) -> CoordinatorServer:
+    """Coordinator with every built-in service registered."""
+    import price_cache
+    import rate_limit
+
+    server = CoordinatorServer(path)
+    rate_limit.register_coordinator_handlers(server)
+    price_cache.register_coordinator_handlers(server)
+    return server
+
+
+def main() -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Host-local coordinator shared by bot processes")
+    parser.add_argument("--socket", default=os.getenv(COORDINATOR_ENV, DEFAULT_SOCKET_PATH))
+    args = parser.parse_args()
+
+    server = build_server(args.socket)
+    print(f"Coordinator listening on {args.socket} (ops: {', '.join(sorted(server.handlers))})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
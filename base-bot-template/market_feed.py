@@ -0,0 +1,563 @@
+#!/usr/bin/env python3
+"""Push-based market data feeds, in-memory candle building and a local replay server.
+
+Feeds deliver Coinbase ``ticker``-style messages; each tick is folded into a
+per-symbol ``CandleBuilder`` so strategies see fresh candles without a REST
+call per cycle. ``ReplayServer`` streams recorded ticks over TCP (one JSON
+message per line) at 1x-1000x speed so the whole path can be exercised offline.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import socket
+import socketserver
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from dataclasses import dataclass, replace
+from datetime import datetime, timezone
+from typing import Callable, Deque, Dict, Iterable, Iterator, List, Optional, Protocol, Sequence
+
+from exchange_interface import CandleSeries, ExchangeRegistry, MarketSnapshot, TradeExecution
+
+try:  # websocket-client is optional; only needed for the live Coinbase feed
+    import websocket
+except ImportError:  # pragma: no cover - handled gracefully at runtime
+    websocket = None  # type: ignore[assignment]
+
+
+COINBASE_WS_URL = "wss://ws-feed.exchange.coinbase.com"
+MIN_REPLAY_SPEED = 1.0
+MAX_REPLAY_SPEED = 1000.0
+
+
+@dataclass
+class Tick:
+    """Single trade/ticker update."""
+
+    symbol: str
+    price: float
+    size: float
+    time: float  # epoch seconds
+
+
+@dataclass
+class Candle:
+    """OHLCV bucket starting at ``start`` (epoch seconds)."""
+
+    start: float
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+
+
+def _parse_time(value: object) -> float:
+    if isinstance(value, (int, float)):
+        return float(value)
+    if not value:
+        return time.time()
+    parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def tick_from_message(message: Dict[str, object]) -> Optional[Tick]:
+    """Convert a Coinbase ``ticker``/``match`` message into a Tick (None for other types)."""
+    if message.get("type") not in {"ticker", "match", "last_match"}:
+        return None
+    try:
+        price = float(message["price"])  # type: ignore[arg-type]
+    except (KeyError, TypeError, ValueError):
+        return None
+    size = message.get("last_size", message.get("size", 0.0))
+    return Tick(
+        symbol=str(message.get("product_id", "")),
+        price=price,
+        size=float(size or 0.0),  # type: ignore[arg-type]
+        time=_parse_time(message.get("time")),
+    )
+
+
+def tick_to_message(tick: Tick) -> Dict[str, object]:
+    return {
+        "type": "ticker",
+        "product_id": tick.symbol,
+        "price": repr(tick.price),
+        "last_size": repr(tick.size),
+        "time": datetime.fromtimestamp(tick.time, tz=timezone.utc).isoformat().replace("+00:00", "Z"),
+    }
+
+
+class CandleBuilder:
+    """Aggregate ticks for one symbol into fixed-granularity OHLCV candles."""
+
+    def __init__(self, symbol: str, *, granularity: int = 900, max_candles: int = 300) -> None:
+        self.symbol = symbol
+        self.granularity = max(1, int(granularity))
+        self.candles: Deque[Candle] = deque(maxlen=max_candles)
+        self.current: Optional[Candle] = None
+        self.last_price: Optional[float] = None
+        self.last_time: Optional[float] = None
+
+    def add_tick(self, tick: Tick) -> Optional[Candle]:
+        """Fold a tick into the open candle; return the candle it closed, if any."""
+        start = tick.time - (tick.time % self.granularity)
+        closed = None
+        current = self.current
+        if current is not None and start > current.start:
+            self.candles.append(current)
+            closed = current
+            current = None
+        if current is None:
+            self.current = Candle(start, tick.price, tick.price, tick.price, tick.price, tick.size)
+        elif start == current.start:
+            current.high = max(current.high, tick.price)
+            current.low = min(current.low, tick.price)
+            current.close = tick.price
+            current.volume += tick.size
+        # Out-of-order ticks for already-closed buckets only move the last price.
+        self.last_price = tick.price
+        self.last_time = tick.time
+        return closed
+
+    def add_candle(self, candle: Candle) -> None:
+        """Seed or extend history with a completed candle (e.g. from REST backfill)."""
+        if self.candles and candle.start <= self.candles[-1].start:
+            return
+        self.candles.append(candle)
+        if self.last_time is None or candle.start + self.granularity > self.last_time:
+            self.last_price = candle.close
+            self.last_time = candle.start + self.granularity
+
+    def series(self, limit: int) -> CandleSeries:
+        """Completed candles plus the open one as a columnar series (most recent ``limit``)."""
+        candles = list(self.candles)
+        if self.current is not None:
+            candles.append(self.current)
+        if limit > 0:
+            candles = candles[-limit:]
+        return CandleSeries.from_rows(
+            (candle.start, candle.open, candle.high, candle.low, candle.close, candle.volume)
+            for candle in candles
+        )
+
+
+TickListener = Callable[[Tick], None]
+
+
+class MarketFeed(Protocol):
+    """Protocol implemented by push-based market data feeds."""
+
+    def subscribe(self, symbols: Iterable[str]) -> None:
+        """Start streaming the given symbols (idempotent)."""
+
+    def add_listener(self, listener: TickListener) -> None:
+        """Register a callback invoked for every tick."""
+
+    def start(self) -> None:
+        """Connect and begin delivering ticks."""
+
+    def stop(self) -> None:
+        """Disconnect and stop delivering ticks."""
+
+
+class _BaseFeed(ABC):
+    """Shared listener/subscription bookkeeping and reconnect loop for feeds."""
+
+    reconnect_delay = 2.0
+    reconnect_on_eof = True  # False when a closed stream means there is nothing more to send
+
+    def __init__(self) -> None:
+        self._listeners: List[TickListener] = []
+        self._symbols: set = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def add_listener(self, listener: TickListener) -> None:
+        self._listeners.append(listener)
+
+    def subscribe(self, symbols: Iterable[str]) -> None:
+        new = set(symbols) - self._symbols
+        if not new:
+            return
+        with self._lock:
+            self._symbols |= new
+        self._send_subscribe(sorted(new))
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=type(self).__name__, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._close_connection()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+
+    def _dispatch(self, message: Dict[str, object]) -> None:
+        tick = tick_from_message(message)
+        if tick is None:
+            return
+        for listener in self._listeners:
+            try:
+                listener(tick)
+            except Exception as exc:  # noqa: BLE001 - a bad listener must not kill the feed
+                print(f"⚠️ Feed listener failed: {exc}")
+
+    def _subscribe_message(self, symbols: Sequence[str]) -> Dict[str, object]:
+        return {"type": "subscribe", "product_ids": list(symbols), "channels": ["ticker"]}
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self._stream()
+                if not self.reconnect_on_eof and not self._stop.is_set():
+                    print(f"ℹ️ {type(self).__name__} stream finished")
+                    return
+            except Exception as exc:  # noqa: BLE001 - reconnect on any transport error
+                if not self._stop.is_set():
+                    print(f"⚠️ {type(self).__name__} disconnected: {exc}")
+            self._stop.wait(self.reconnect_delay)
+
+    # Transport hooks -----------------------------------------------------
+    @abstractmethod
+    def _stream(self) -> None:
+        """Connect, (re)subscribe and dispatch messages until the stream ends."""
+
+    @abstractmethod
+    def _send_subscribe(self, symbols: Sequence[str]) -> None:
+        """Subscribe on the live connection (no-op while disconnected)."""
+
+    @abstractmethod
+    def _close_connection(self) -> None:
+        """Interrupt a blocking ``_stream``."""
+
+
+class ReplayFeed(_BaseFeed):
+    """Client for ``ReplayServer``: newline-delimited JSON over TCP.
+
+    The server closes the connection when the tape ends; reconnecting would
+    replay it from the start and move time backwards, so the feed stops then.
+    Connection errors are still retried.
+    """
+
+    reconnect_on_eof = False
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 9555) -> None:
+        super().__init__()
+        self.host = host
+        self.port = port
+        self._sock: Optional[socket.socket] = None
+
+    def _stream(self) -> None:
+        sock = socket.create_connection((self.host, self.port), timeout=10)
+        sock.settimeout(None)
+        self._sock = sock
+        try:
+            if self._symbols:
+                self._send_subscribe(sorted(self._symbols))
+            with sock.makefile("r", encoding="utf-8") as stream:
+                for line in stream:
+                    if self._stop.is_set():
+                        return
+                    line = line.strip()
+                    if line:
+                        self._dispatch(json.loads(line))
+        finally:
+            self._sock = None
+            sock.close()
+
+    def _send_subscribe(self, symbols: Sequence[str]) -> None:
+        sock = self._sock
+        if sock is None:
+            return  # sent on (re)connect
+        try:
+            sock.sendall((json.dumps(self._subscribe_message(symbols)) + "\n").encode("utf-8"))
+        except OSError:
+            pass
+
+    def _close_connection(self) -> None:
+        sock = self._sock
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+
+class CoinbaseWebSocketFeed(_BaseFeed):
+    """Live Coinbase Exchange ``ticker`` channel (requires ``websocket-client``)."""
+
+    def __init__(self, url: str = COINBASE_WS_URL) -> None:
+        if websocket is None:
+            raise RuntimeError("websocket-client is required for the Coinbase WebSocket feed")
+        super().__init__()
+        self.url = url
+        self._ws = None
+
+    def _stream(self) -> None:
+        ws = websocket.create_connection(self.url, timeout=10)
+        self._ws = ws
+        try:
+            if self._symbols:
+                self._send_subscribe(sorted(self._symbols))
+            while not self._stop.is_set():
+                raw = ws.recv()
+                if raw:
+                    self._dispatch(json.loads(raw))
+        finally:
+            self._ws = None
+            ws.close()
+
+    def _send_subscribe(self, symbols: Sequence[str]) -> None:
+        ws = self._ws
+        if ws is None:
+            return
+        try:
+            ws.send(json.dumps(self._subscribe_message(symbols)))
+        except Exception:  # noqa: BLE001 - resent on reconnect
+            pass
+
+    def _close_connection(self) -> None:
+        ws = self._ws
+        if ws is not None:
+            try:
+                ws.close()
+            except Exception:  # noqa: BLE001
+                pass
+
+
+def create_feed(source: str = "replay", *, url: Optional[str] = None) -> MarketFeed:
+    """Build a feed from a short source name (``replay`` or ``coinbase``)."""
+    if source == "coinbase":
+        return CoinbaseWebSocketFeed(url or COINBASE_WS_URL)
+    if source == "replay":
+        host, _, port = (url or "127.0.0.1:9555").replace("tcp://", "").rpartition(":")
+        return ReplayFeed(host or "127.0.0.1", int(port))
+    raise ValueError(f"Unknown feed source '{source}'. Available: coinbase, replay")
+
+
+# --- Streaming exchange ------------------------------------------------------
+
+class StreamingExchange:
+    """Exchange backed by a push feed: snapshots come from in-memory candles.
+
+    Trades are simulated like ``PaperExchange``. Listeners registered through
+    ``add_update_listener`` are called with the symbol whenever a candle
+    closes, which lets the bot run one cycle per new bar instead of per tick.
+    """
+
+    name = "stream"
+
+    def __init__(
+        self,
+        feed: str = "replay",
+        feed_url: Optional[str] = None,
+        granularity: int = 900,
+        max_candles: int = 300,
+        first_tick_timeout: float = 30.0,
+    ) -> None:
+        self.granularity = int(granularity)
+        self.max_candles = int(max_candles)
+        self.first_tick_timeout = float(first_tick_timeout)
+        self._builders: Dict[str, CandleBuilder] = {}
+        self._update_listeners: List[Callable[[str], None]] = []
+        self._first_tick = threading.Condition()
+        self._feed = create_feed(feed, url=feed_url)
+        self._feed.add_listener(self._on_tick)
+        self._feed.start()
+
+    def add_update_listener(self, listener: Callable[[str], None]) -> None:
+        self._update_listeners.append(listener)
+
+    def builder(self, symbol: str) -> CandleBuilder:
+        builder = self._builders.get(symbol)
+        if builder is None:
+            builder = CandleBuilder(symbol, granularity=self.granularity, max_candles=self.max_candles)
+            self._builders[symbol] = builder
+        return builder
+
+    def _on_tick(self, tick: Tick) -> None:
+        builder = self._builders.get(tick.symbol)
+        if builder is None:
+            return
+        with self._first_tick:
+            closed = builder.add_tick(tick)
+            self._first_tick.notify_all()
+        if closed is None:
+            return
+        for listener in self._update_listeners:
+            listener(tick.symbol)
+
+    def fetch_market_snapshot(self, symbol: str, *, limit: int) -> MarketSnapshot:
+        builder = self.builder(symbol)
+        self._feed.subscribe([symbol])
+        with self._first_tick:
+            if builder.last_price is None:
+                self._first_tick.wait_for(lambda: builder.last_price is not None, self.first_tick_timeout)
+            if builder.last_price is None:
+                raise RuntimeError(f"No streamed data received for {symbol}")
+            candles = builder.series(limit)
+            current_price = builder.last_price
+            last_time = builder.last_time
+        return MarketSnapshot.from_candles(
+            symbol,
+            candles,
+            timestamp=datetime.utcfromtimestamp(last_time),
+            current_price=current_price,
+        )
+
+    def execute_trade(self, symbol: str, side: str, size: float, price: float) -> TradeExecution:
+        return TradeExecution(side=side, size=size, price=price, timestamp=datetime.utcnow())
+
+    def close(self) -> None:
+        self._feed.stop()
+
+
+ExchangeRegistry.register("stream", StreamingExchange)
+
+
+# --- Local replay server -----------------------------------------------------
+
+def load_ticks(path: str) -> List[Tick]:
+    """Load recorded ticks from NDJSON (Coinbase messages) or CSV (time,product_id,price,size)."""
+    ticks: List[Tick] = []
+    with open(path, "r", encoding="utf-8") as handle:
+        if path.endswith(".csv"):
+            for row in csv.DictReader(handle):
+                ticks.append(Tick(
+                    symbol=row["product_id"],
+                    price=float(row["price"]),
+                    size=float(row.get("size") or 0.0),
+                    time=_parse_time(row["time"]),
+                ))
+        else:
+            for line in handle:
+                line = line.strip()
+                if not line:
+                    continue
+                tick = tick_from_message(json.loads(line))
+                if tick is not None:
+                    ticks.append(tick)
+    ticks.sort(key=lambda tick: tick.time)
+    return ticks
+
+
+class _ReplayTCPServer(socketserver.ThreadingTCPServer):
+    # Class attributes: they must be set before the constructor binds.
+    allow_reuse_address = True
+    daemon_threads = True
+
+
+class ReplayServer:
+    """Stream recorded ticks to TCP clients at a configurable speed (1x-1000x).
+
+    Clients send a Coinbase-style ``subscribe`` message; each connection gets
+    its own replay of the matching ticks, paced by the recorded timestamps.
+    """
+
+    def __init__(
+        self,
+        ticks: Sequence[Tick],
+        *,
+        host: str = "127.0.0.1",
+        port: int = 9555,
+        speed: float = 1.0,
+        loop: bool = False,
+    ) -> None:
+        self.ticks = list(ticks)
+        self.speed = min(MAX_REPLAY_SPEED, max(MIN_REPLAY_SPEED, float(speed)))
+        self.loop = loop
+        self._server = _ReplayTCPServer((host, port), self._handler_factory())
+        self.host, self.port = self._server.server_address[:2]
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    def _iter_ticks(self, symbols: set) -> Iterator[Tick]:
+        """Matching ticks; with ``loop`` each pass is shifted after the previous one so time keeps moving forward."""
+        ticks = [tick for tick in self.ticks if tick.symbol in symbols]
+        if not ticks:
+            return
+        span = ticks[-1].time - ticks[0].time
+        period = span + (span / (len(ticks) - 1) if len(ticks) > 1 and span > 0 else 1.0)
+        offset = 0.0
+        while True:
+            for tick in ticks:
+                yield replace(tick, time=tick.time + offset) if offset else tick
+            if not self.loop:
+                return
+            offset += period
+
+    def _handler_factory(self):
+        server = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self) -> None:
+                line = self.rfile.readline()
+                if not line:
+                    return
+                try:
+                    request = json.loads(line)
+                except json.JSONDecodeError:
+                    return
+                symbols = set(request.get("product_ids") or [])
+                started = time.monotonic()
+                first_time: Optional[float] = None
+                for tick in server._iter_ticks(symbols):
+                    if first_time is None:
+                        first_time = tick.time
+                    delay = (tick.time - first_time) / server.speed - (time.monotonic() - started)
+                    if delay > 0:
+                        time.sleep(delay)
+                    payload = json.dumps(tick_to_message(tick)) + "\n"
+                    try:
+                        self.wfile.write(payload.encode("utf-8"))
+                        self.wfile.flush()
+                    except OSError:
+                        return
+
+        return Handler
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join(timeout=2)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Replay recorded ticks over TCP for offline bot testing")
+    parser.add_argument("path", help="NDJSON (Coinbase ticker messages) or CSV tick file")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9555)
+    parser.add_argument("--speed", type=float, default=1.0, help="replay speed multiplier (1-1000)")
+    parser.add_argument("--loop", action="store_true", help="restart from the beginning when the tape ends")
+    args = parser.parse_args(argv)
+
+    ticks = load_ticks(args.path)
+    server = ReplayServer(ticks, host=args.host, port=args.port, speed=args.speed, loop=args.loop)
+    print(f"Replaying {len(ticks)} ticks on {server.host}:{server.port} at {server.speed:g}x")
+    server.start()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,417 @@
+#!/usr/bin/env python3
+"""Append-only binary market tape: record any exchange, replay it without a network.
+
+Tape layout (little-endian)::
+
+    header  : magic "MTAPE" | version u8 | reserved u16
+    record  : kind u8 | payload length u32 | payload
+    snapshot: recorded_at f64 | timestamp f64 | current_price f64 | symbol_len u16 | count u32
+              | symbol bytes | count * f64 prices
+    candles : same header as snapshot | symbol bytes | 6 columns of count * f64
+              (time, open, high, low, close, volume)  [version 2+]
+    trade   : recorded_at f64 | timestamp f64 | size f64 | price f64 | side u8 | symbol_len u16
+              | symbol bytes
+
+``RecordingExchange`` wraps any registered exchange and appends every
+snapshot and execution it produces. ``ReplayExchange`` memory-maps a tape and
+serves it back, optionally paced at a multiple of the recorded speed.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+import threading
+import time
+from array import array
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Deque, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from exchange_interface import CANDLE_COLUMNS, CandleSeries, ExchangeRegistry, MarketSnapshot, TradeExecution
+
+
+TAPE_MAGIC = b"MTAPE"
+TAPE_VERSION = 2
+
+KIND_SNAPSHOT = 1
+KIND_TRADE = 2
+KIND_CANDLES = 3
+
+_HEADER = struct.Struct("<5sBH")
+_RECORD = struct.Struct("<BI")
+_SNAPSHOT = struct.Struct("<dddHI")
+_TRADE = struct.Struct("<ddddBH")
+SNAPSHOT_KINDS = (KIND_SNAPSHOT, KIND_CANDLES)
+
+_SIDES = {"buy": 0, "sell": 1}
+_SIDE_NAMES = {value: key for key, value in _SIDES.items()}
+
+
+@dataclass
+class SnapshotRecord:
+    recorded_at: float
+    snapshot: MarketSnapshot
+
+
+@dataclass
+class TradeRecord:
+    recorded_at: float
+    symbol: str
+    execution: TradeExecution
+
+
+TapeRecord = Union[SnapshotRecord, TradeRecord]
+
+
+def _complete_length(handle: Any) -> int:
+    """Length of the header plus every complete record (0 when the header itself is torn)."""
+    size = os.fstat(handle.fileno()).st_size
+    handle.seek(0)
+    header = handle.read(_HEADER.size)
+    if len(header) < _HEADER.size:
+        return 0
+    if _HEADER.unpack(header)[0] != TAPE_MAGIC:
+        raise ValueError(f"{handle.name} is not a market tape")
+    offset = _HEADER.size
+    while offset + _RECORD.size <= size:
+        handle.seek(offset)
+        _, length = _RECORD.unpack(handle.read(_RECORD.size))
+        if offset + _RECORD.size + length > size:
+            break
+        offset += _RECORD.size + length
+    return offset
+
+
+class TapeWriter:
+    """Thread-safe append-only writer; every record is flushed as it is written.
+
+    Reopening a tape drops a record torn by an interrupted writer, so new
+    records stay readable.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._handle = open(path, "a+b")
+        self._lock = threading.Lock()
+        try:
+            length = _complete_length(self._handle)
+        except ValueError:
+            self._handle.close()
+            raise
+        if length != os.fstat(self._handle.fileno()).st_size:
+            self._handle.truncate(length)
+        if length == 0:
+            self._handle.write(_HEADER.pack(TAPE_MAGIC, TAPE_VERSION, 0))
+            self._handle.flush()
+
+    def _append(self, kind: int, payload: bytes) -> None:
+        with self._lock:
+            self._handle.write(_RECORD.pack(kind, len(payload)) + payload)
+            self._handle.flush()
+
+    def write_snapshot(self, snapshot: MarketSnapshot) -> None:
+        symbol = snapshot.symbol.encode("utf-8")
+        candles = snapshot.candles
+        if candles is not None:
+            kind = KIND_CANDLES
+            count = len(candles)
+            body = b"".join(candles.column(name).tobytes() for name in CANDLE_COLUMNS)
+        else:
+            kind = KIND_SNAPSHOT
+            count = len(snapshot.prices)
+            body = struct.pack(f"<{count}d", *snapshot.prices)
+        header = _SNAPSHOT.pack(
+            time.time(),
+            _epoch(snapshot.timestamp),
+            float(snapshot.current_price),
+            len(symbol),
+            count,
+        )
+        self._append(kind, b"".join((header, symbol, body)))
+
+    def write_trade(self, symbol: str, execution: TradeExecution) -> None:
+        encoded = symbol.encode("utf-8")
+        payload = _TRADE.pack(
+            time.time(),
+            _epoch(execution.timestamp),
+            float(execution.size),
+            float(execution.price),
+            _SIDES.get(execution.side.lower(), 0),
+            len(encoded),
+        ) + encoded
+        self._append(KIND_TRADE, payload)
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._handle.closed:
+                self._handle.close()
+
+
+class TapeReader:
+    """Memory-mapped, sequential reader over a tape file."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._handle = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._handle.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError as exc:  # empty file
+            self._handle.close()
+            raise ValueError(f"Tape {path} is empty") from exc
+        magic, version, _ = _HEADER.unpack_from(self._map, 0)
+        if magic != TAPE_MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a market tape")
+        if version > TAPE_VERSION:
+            self.close()
+            raise ValueError(f"Unsupported tape version {version} (max {TAPE_VERSION})")
+        self.version = version
+
+    def scan(self) -> Iterator[Tuple[int, int]]:
+        """Yield ``(kind, payload_offset)`` for every complete record without decoding it."""
+        data = self._map
+        offset = _HEADER.size
+        end = len(data)
+        while offset + _RECORD.size <= end:
+            kind, length = _RECORD.unpack_from(data, offset)
+            start = offset + _RECORD.size
+            if start + length > end:
+                break  # torn final record from an interrupted writer
+            offset = start + length
+            yield kind, start
+
+    def __iter__(self) -> Iterator[TapeRecord]:
+        for kind, offset in self.scan():
+            if kind in SNAPSHOT_KINDS:
+                yield self.decode_snapshot(offset, kind)
+            elif kind == KIND_TRADE:
+                yield self.decode_trade(offset)
+            # Unknown kinds are skipped so newer writers stay readable.
+
+    def snapshot_key(self, offset: int) -> Tuple[float, str]:
+        """Return ``(recorded_at, symbol)`` of a snapshot record without copying its prices."""
+        recorded_at, _, _, symbol_len, _ = _SNAPSHOT.unpack_from(self._map, offset)
+        start = offset + _SNAPSHOT.size
+        return recorded_at, self._map[start:start + symbol_len].decode("utf-8")
+
+    def decode_snapshot(self, offset: int, kind: int = KIND_SNAPSHOT) -> SnapshotRecord:
+        recorded_at, timestamp, current_price, symbol_len, count = _SNAPSHOT.unpack_from(self._map, offset)
+        offset += _SNAPSHOT.size
+        symbol = self._map[offset:offset + symbol_len].decode("utf-8")
+        offset += symbol_len
+        when = datetime.utcfromtimestamp(timestamp)
+        width = 8 * count
+        if kind == KIND_CANDLES:
+            columns = []
+            for _ in CANDLE_COLUMNS:
+                column = array("d")
+                column.frombytes(self._map[offset:offset + width])
+                columns.append(column)
+                offset += width
+            snapshot = MarketSnapshot.from_candles(
+                symbol, CandleSeries(*columns), timestamp=when, current_price=current_price
+            )
+        else:
+            prices = array("d")
+            prices.frombytes(self._map[offset:offset + width])
+            snapshot = MarketSnapshot(symbol=symbol, prices=prices, current_price=current_price, timestamp=when)
+        return SnapshotRecord(recorded_at, snapshot)
+
+    def decode_trade(self, offset: int) -> TradeRecord:
+        recorded_at, timestamp, size, price, side, symbol_len = _TRADE.unpack_from(self._map, offset)
+        offset += _TRADE.size
+        symbol = self._map[offset:offset + symbol_len].decode("utf-8")
+        execution = TradeExecution(
+            side=_SIDE_NAMES.get(side, "buy"),
+            size=size,
+            price=price,
+            timestamp=datetime.utcfromtimestamp(timestamp),
+        )
+        return TradeRecord(recorded_at, symbol, execution)
+
+    def close(self) -> None:
+        try:
+            self._map.close()
+        finally:
+            self._handle.close()
+
+
+def _epoch(value: datetime) -> float:
+    # Naive datetimes in this codebase are UTC (datetime.utcnow()).
+    if value.tzinfo is None:
+        return (value - datetime(1970, 1, 1)).total_seconds()
+    return value.timestamp()
+
+
+class RecordingExchange:
+    """Wrap a registered exchange and tape every snapshot and execution it returns."""
+
+    name = "record"
+
+    def __init__(
+        self,
+        inner: str = "paper",
+        tape_path: str = "/app/state/market.tape",
+        inner_params: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        self.inner = ExchangeRegistry.create(inner, **(inner_params or {}))
+        self.tape_path = tape_path
+        self._writer = TapeWriter(tape_path)
+
+    def fetch_market_snapshot(self, symbol: str, *, limit: int) -> MarketSnapshot:
+        snapshot = self.inner.fetch_market_snapshot(symbol, limit=limit)
+        self._writer.write_snapshot(snapshot)
+        return snapshot
+
+    def execute_trade(self, symbol: str, side: str, size: float, price: float) -> TradeExecution:
+        execution = self.inner.execute_trade(symbol, side, size, price)
+        self._writer.write_trade(symbol, execution)
+        return execution
+
+    def close(self) -> None:
+        self._writer.close()
+        close = getattr(self.inner, "close", None)
+        if callable(close):
+            close()
+
+    def __getattr__(self, item: str) -> Any:
+        # Expose optional inner capabilities (update listeners, batch fetches, ...).
+        if item == "inner":
+            raise AttributeError(item)
+        return getattr(self.inner, item)
+
+
+class ReplayExchange:
+    """Serve a recorded tape back as an exchange, with no network access.
+
+    ``speed`` paces snapshots against their recorded wall-clock spacing
+    (``10`` replays ten times faster, ``0`` as fast as the bot asks). Trades
+    fill the requested size, at the recorded fill price when the next recorded
+    trade for the symbol has the same side and at the requested price
+    otherwise. With ``loop`` both snapshots and recorded fills start over.
+    """
+
+    name = "replay"
+
+    def __init__(self, tape_path: str = "/app/state/market.tape", speed: float = 0.0, loop: bool = False) -> None:
+        self.tape_path = tape_path
+        self.speed = max(0.0, float(speed))
+        self.loop = loop
+        self._reader = TapeReader(tape_path)
+        # Only offsets are indexed up front; snapshots are decoded from the map on demand.
+        self._snapshots: Dict[str, List[Tuple[float, int, int]]] = {}
+        self._recorded_trades: Dict[str, List[TradeRecord]] = {}
+        for kind, offset in self._reader.scan():
+            if kind in SNAPSHOT_KINDS:
+                recorded_at, symbol = self._reader.snapshot_key(offset)
+                self._snapshots.setdefault(symbol, []).append((recorded_at, kind, offset))
+            elif kind == KIND_TRADE:
+                record = self._reader.decode_trade(offset)
+                self._recorded_trades.setdefault(record.symbol, []).append(record)
+        self._trades: Dict[str, Deque[TradeRecord]] = {
+            symbol: deque(records) for symbol, records in self._recorded_trades.items()
+        }
+        self._positions: Dict[str, int] = {}
+        self._started_at: Optional[float] = None
+        self._first_recorded_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def symbols(self) -> Sequence[str]:
+        return sorted(self._snapshots)
+
+    def fetch_market_snapshot(self, symbol: str, *, limit: int) -> MarketSnapshot:
+        with self._lock:
+            records = self._snapshots.get(symbol)
+            if not records:
+                raise RuntimeError(f"Tape {self.tape_path} has no snapshots for {symbol}")
+            position = self._positions.get(symbol, 0)
+            if position >= len(records):
+                if not self.loop:
+                    raise RuntimeError(f"Tape {self.tape_path} exhausted for {symbol}")
+                position = 0
+                self._started_at = None
+                self._trades[symbol] = deque(self._recorded_trades.get(symbol, ()))
+            recorded_at, kind, offset = records[position]
+            self._positions[symbol] = position + 1
+            delay = self._pace(recorded_at)
+            snapshot = self._reader.decode_snapshot(offset, kind).snapshot
+        if delay > 0:
+            time.sleep(delay)
+        if limit and len(snapshot) > limit:
+            if snapshot.candles is not None:
+                return MarketSnapshot.from_candles(
+                    snapshot.symbol,
+                    snapshot.candles.window(limit),
+                    timestamp=snapshot.timestamp,
+                    current_price=snapshot.current_price,
+                )
+            snapshot = MarketSnapshot(
+                symbol=snapshot.symbol,
+                prices=snapshot.prices[-limit:],
+                current_price=snapshot.current_price,
+                timestamp=snapshot.timestamp,
+            )
+        return snapshot
+
+    def _pace(self, recorded_at: float) -> float:
+        if self.speed <= 0:
+            return 0.0
+        now = time.monotonic()
+        if self._started_at is None:
+            self._started_at = now
+            self._first_recorded_at = recorded_at
+            return 0.0
+        target = (recorded_at - self._first_recorded_at) / self.speed
+        return target - (now - self._started_at)
+
+    def execute_trade(self, symbol: str, side: str, size: float, price: float) -> TradeExecution:
+        with self._lock:
+            queue = self._trades.get(symbol)
+            if queue and queue[0].execution.side == side.lower():
+                recorded = queue.popleft().execution
+                # The bot sized the order against its own cash; never fill more than it asked for.
+                return TradeExecution(side=recorded.side, size=size, price=recorded.price, timestamp=recorded.timestamp)
+        return TradeExecution(side=side.lower(), size=size, price=price, timestamp=datetime.utcnow())
+
+    def close(self) -> None:
+        self._reader.close()
+
+
+ExchangeRegistry.register("record", RecordingExchange)
+ExchangeRegistry.register("replay", ReplayExchange)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Inspect a recorded market tape")
+    parser.add_argument("path")
+    parser.add_argument("--limit", type=int, default=20, help="records to print (0 = summary only)")
+    args = parser.parse_args(argv)
+
+    reader = TapeReader(args.path)
+    snapshots = trades = 0
+    try:
+        for record in reader:
+            if isinstance(record, SnapshotRecord):
+                snapshots += 1
+                line = f"SNAP  {record.snapshot.symbol} {record.snapshot.timestamp} price={record.snapshot.current_price:.2f} history={len(record.snapshot)}"
+            else:
+                trades += 1
+                ex = record.execution
+                line = f"TRADE {record.symbol} {ex.timestamp} {ex.side} {ex.size:.8f} @ {ex.price:.2f}"
+            if snapshots + trades <= args.limit:
+                print(line)
+    finally:
+        reader.close()
+    print(f"{args.path}: v{reader.version}, {snapshots} snapshots, {trades} trades")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""Online equity-curve and trade statistics, updated in O(1) per observation.
+
+Shared by the live bot and the backtester so both report the same numbers:
+running peak and max drawdown, Welford mean/variance of per-period returns,
+annualised Sharpe and Sortino ratios, win rate and profit factor.
+
+Observations that carry a timestamp are annualised by the average time that
+actually elapsed between them, so irregular cycles (early wakeups, a changed
+sleep interval, downtime) do not skew the ratios; ``periods_per_year`` is only
+the fallback until two timestamped observations exist.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Any, Dict, Optional
+
+
+SECONDS_PER_YEAR = 365 * 24 * 3600
+
+
+class PerformanceTracker:
+    """Incremental performance statistics for one equity curve."""
+
+    def __init__(self, *, periods_per_year: float = 365 * 24, risk_free_rate: float = 0.0) -> None:
+        self.periods_per_year = periods_per_year
+        self.risk_free_rate = risk_free_rate  # annual
+        self.reset()
+
+    @classmethod
+    def for_interval(cls, seconds: float, **kwargs: Any) -> "PerformanceTracker":
+        """Tracker annualising returns sampled every ``seconds`` until timestamps say otherwise."""
+        return cls(periods_per_year=SECONDS_PER_YEAR / max(seconds, 1e-9), **kwargs)
+
+    def reset(self) -> None:
+        self.last_equity: Optional[float] = None
+        self.peak_equity = 0.0
+        self.max_drawdown_pct = 0.0
+        self.current_drawdown_pct = 0.0
+        # Welford accumulators over per-period returns.
+        self.return_count = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._downside_sq = 0.0
+        # Wall-clock time covered by timestamped returns.
+        self.last_at: Optional[float] = None
+        self._timed_returns = 0
+        self._elapsed = 0.0
+        # Closed-trade accumulators.
+        self.wins = 0
+        self.losses = 0
+        self.breakeven = 0
+        self.gross_profit = 0.0
+        self.gross_loss = 0.0
+
+    # --- updates ---------------------------------------------------------
+
+    def update_equity(self, equity: float, at: Optional[float] = None) -> None:
+        """Add one equity observation (e.g. portfolio value at the end of a cycle).
+
+        ``at`` is the observation time in epoch seconds.
+        """
+        if equity > self.peak_equity:
+            self.peak_equity = equity
+        if self.peak_equity > 0:
+            self.current_drawdown_pct = (self.peak_equity - equity) / self.peak_equity * 100
+            if self.current_drawdown_pct > self.max_drawdown_pct:
+                self.max_drawdown_pct = self.current_drawdown_pct
+
+        previous, previous_at = self.last_equity, self.last_at
+        self.last_equity = equity
+        self.last_at = at
+        if previous is None or previous <= 0:
+            return
+        period_return = equity / previous - 1.0
+        self.return_count += 1
+        if at is not None and previous_at is not None and at > previous_at:
+            self._timed_returns += 1
+            self._elapsed += at - previous_at
+        delta = period_return - self._mean
+        self._mean += delta / self.return_count
+        self._m2 += delta * (period_return - self._mean)
+        excess = period_return - self._period_risk_free
+        if excess < 0:
+            self._downside_sq += excess * excess
+
+    def record_trade(self, pnl: float) -> None:
+        """Add the realised PnL of one closed trade."""
+        if pnl > 0:
+            self.wins += 1
+            self.gross_profit += pnl
+        elif pnl < 0:
+            self.losses += 1
+            self.gross_loss += -pnl
+        else:
+            self.breakeven += 1
+
+    # --- statistics ------------------------------------------------------
+
+    @property
+    def annualisation(self) -> float:
+        """Return periods per year: observed from timestamps, else ``periods_per_year``."""
+        if self._timed_returns and self._elapsed > 0:
+            return SECONDS_PER_YEAR * self._timed_returns / self._elapsed
+        return self.periods_per_year
+
+    @property
+    def _period_risk_free(self) -> float:
+        periods = self.annualisation
+        return self.risk_free_rate / periods if periods else 0.0
+
+    @property
+    def mean_return(self) -> float:
+        return self._mean
+
+    @property
+    def return_stdev(self) -> float:
+        if self.return_count < 2:
+            return 0.0
+        return math.sqrt(self._m2 / (self.return_count - 1))
+
+    @property
+    def sharpe_ratio(self) -> float:
+        stdev = self.return_stdev
+        if stdev <= 0:
+            return 0.0
+        return (self._mean - self._period_risk_free) / stdev * math.sqrt(self.annualisation)
+
+    @property
+    def sortino_ratio(self) -> float:
+        if self.return_count < 2 or self._downside_sq <= 0:
+            return 0.0
+        downside = math.sqrt(self._downside_sq / self.return_count)
+        return (self._mean - self._period_risk_free) / downside * math.sqrt(self.annualisation)
+
+    @property
+    def closed_trades(self) -> int:
+        return self.wins + self.losses + self.breakeven
+
+    @property
+    def win_rate(self) -> float:
+        """Percentage of closed trades with positive PnL."""
+        total = self.closed_trades
+        return self.wins / total * 100 if total else 0.0
+
+    @property
+    def profit_factor(self) -> Optional[float]:
+        """Gross profit / gross loss; ``None`` until there is a losing trade."""
+        if self.gross_loss <= 0:
+            return None
+        return self.gross_profit / self.gross_loss
+
+    def snapshot(self) -> Dict[str, Any]:
+        profit_factor = self.profit_factor
+        return {
+            "peak_equity": round(self.peak_equity, 2),
+            "max_drawdown_pct": round(self.max_drawdown_pct, 2),
+            "current_drawdown_pct": round(self.current_drawdown_pct, 2),
+            "sharpe_ratio": round(self.sharpe_ratio, 3),
+            "sortino_ratio": round(self.sortino_ratio, 3),
+            "return_periods": self.return_count,
+            "win_rate": round(self.win_rate, 1),
+            "profit_factor": round(profit_factor, 3) if profit_factor is not None else None,
+            "closed_trades": self.closed_trades,
+        }
+
+    # --- persistence -----------------------------------------------------
+
+    def get_state(self) -> Dict[str, Any]:
+        return {
+            "last_equity": self.last_equity,
+            "peak_equity": self.peak_equity,
+            "max_drawdown_pct": self.max_drawdown_pct,
+            "current_drawdown_pct": self.current_drawdown_pct,
+            "return_count": self.return_count,
+            "mean": self._mean,
+            "m2": self._m2,
+            "downside_sq": self._downside_sq,
+            "last_at": self.last_at,
+            "timed_returns": self._timed_returns,
+            "elapsed": self._elapsed,
+            "wins": self.wins,
+            "losses": self.losses,
+            "breakeven": self.breakeven,
+            "gross_profit": self.gross_profit,
+            "gross_loss": self.gross_loss,
+        }
+
+    def set_state(self, state: Dict[str, Any]) -> None:
+        self.last_equity = state.get("last_equity")
+        self.peak_equity = float(state.get("peak_equity", 0.0))
+        self.max_drawdown_pct = float(state.get("max_drawdown_pct", 0.0))
+        self.current_drawdown_pct = float(state.get("current_drawdown_pct", 0.0))
+        self.return_count = int(state.get("return_count", 0))
+        self._mean = float(state.get("mean", 0.0))
+        self._m2 = float(state.get("m2", 0.0))
+        self._downside_sq = float(state.get("downside_sq", 0.0))
+        self.last_at = state.get("last_at")
+        self._timed_returns = int(state.get("timed_returns", 0))
+        self._elapsed = float(state.get("elapsed", 0.0))
+        self.wins = int(state.get("wins", 0))
+        self.losses = int(state.get("losses", 0))
+        self.breakeven = int(state.get("breakeven", 0))
+        self.gross_profit = float(state.get("gross_profit", 0.0))
+        self.gross_loss = float(state.get("gross_loss", 0.0))
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""Background reconciliation of the in-memory position against the database.
+
+The trading loop never reads the database; instead a daemon thread compares
+``portfolio.quantity`` with ``bots.portfolio_quantity`` every ``interval``
+seconds, publishes the result as a metric, alerts when the two diverge and can
+optionally repair one side from the other.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, Optional
+
+
+CORRECT_OFF = "off"
+CORRECT_DATABASE = "database"  # memory is authoritative: overwrite the DB row
+CORRECT_MEMORY = "memory"  # database is authoritative: overwrite the portfolio
+CORRECT_MODES = (CORRECT_OFF, CORRECT_DATABASE, CORRECT_MEMORY)
+
+
+@dataclass
+class ReconcileResult:
+    checked_at: float
+    memory_quantity: float
+    database_quantity: Optional[float]
+    divergence: float
+    diverged: bool
+    corrected: Optional[str] = None
+    error: Optional[str] = None
+
+
+class PositionReconciler:
+    """Periodically compare memory and database positions on a daemon thread.
+
+    A divergence has to be seen on ``confirmations`` consecutive checks before
+    it is alerted or corrected, so a trade landing between the two reads does
+    not trigger a false alarm.
+    """
+
+    def __init__(
+        self,
+        *,
+        read_memory: Callable[[], float],
+        read_database: Callable[[], Optional[float]],
+        write_memory: Callable[[float], None],
+        write_database: Callable[[float], None],
+        interval: float = 300.0,
+        tolerance: float = 1e-8,
+        auto_correct: str = CORRECT_OFF,
+        confirmations: int = 2,
+        on_alert: Optional[Callable[[ReconcileResult], None]] = None,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        if auto_correct not in CORRECT_MODES:
+            raise ValueError(f"auto_correct must be one of {CORRECT_MODES}, got {auto_correct!r}")
+        self.read_memory = read_memory
+        self.read_database = read_database
+        self.write_memory = write_memory
+        self.write_database = write_database
+        self.interval = interval
+        self.tolerance = tolerance
+        self.auto_correct = auto_correct
+        self.confirmations = max(1, confirmations)
+        self.on_alert = on_alert
+        self.logger = logger or logging.getLogger(__name__)
+        self.checks = 0
+        self.divergences = 0
+        self.corrections = 0
+        self.last_result: Optional[ReconcileResult] = None
+        self._streak = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None or self.interval <= 0:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="position-reconciler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.run_once()
+            except Exception as exc:  # noqa: BLE001 - the reconciler must never die
+                self.logger.error(f"Position reconciliation failed: {exc}")
+
+    def run_once(self) -> ReconcileResult:
+        memory_quantity = self.read_memory()
+        try:
+            database_quantity = self.read_database()
+        except Exception as exc:  # noqa: BLE001 - report and retry next interval
+            database_quantity, error = None, str(exc)
+        else:
+            error = None if database_quantity is not None else "database unavailable"
+
+        divergence = 0.0 if database_quantity is None else memory_quantity - database_quantity
+        diverged = database_quantity is not None and abs(divergence) > self.tolerance
+        result = ReconcileResult(
+            checked_at=time.time(),
+            memory_quantity=memory_quantity,
+            database_quantity=database_quantity,
+            divergence=divergence,
+            diverged=diverged,
+            error=error,
+        )
+        self.checks += 1
+        self._streak = self._streak + 1 if diverged else 0
+
+        if diverged:
+            self.logger.debug(
+                f"Position divergence {divergence:+.8f} (memory={memory_quantity:.8f}, "
+                f"db={database_quantity:.8f}, streak={self._streak})"
+            )
+        if self._streak == self.confirmations:
+            self.divergences += 1
+            self.logger.warning(
+                f"⚠️ Position divergence: memory={memory_quantity:.8f} db={database_quantity:.8f} "
+                f"({divergence:+.8f}), auto_correct={self.auto_correct}"
+            )
+            if self.auto_correct == CORRECT_DATABASE:
+                self.write_database(memory_quantity)
+                result.corrected = CORRECT_DATABASE
+            elif self.auto_correct == CORRECT_MEMORY:
+                self.write_memory(database_quantity)
+                result.corrected = CORRECT_MEMORY
+            if result.corrected:
+                self.corrections += 1
+                self._streak = 0
+            if self.on_alert is not None:
+                self.on_alert(result)
+
+        self.last_result = result
+        return result
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "interval": self.interval,
+            "auto_correct": self.auto_correct,
+            "checks": self.checks,
+            "divergences": self.divergences,
+            "corrections": self.corrections,
+            "last": asdict(self.last_result) if self.last_result else None,
+        }
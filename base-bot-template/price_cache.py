@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""Process-wide price/candle cache with TTLs and single-flight request coalescing.
+
+Exchanges are rebuilt on every settings change, so per-instance caches are
+lost and N bots on one symbol make N identical upstream calls. This cache is
+shared by every exchange in the process: concurrent misses for one key wait
+for a single in-flight fetch instead of issuing their own. With
+``BOT_COORDINATOR_SOCKET`` set, fresh values are also shared between bot
+processes on the host through ``local_coordinator``, and the coordinator
+hands out a short lease per missing key so only one process fetches it.
+
+Entries are kept for ``retention`` seconds (for ``get_stale`` fallbacks) and
+swept periodically, so per-``limit`` candle keys do not accumulate forever.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from local_coordinator import CoordinatorClient, CoordinatorServer, client_from_env
+
+
+DEFAULT_RETENTION = 900.0
+# How long one process may hold a host-wide fetch lease; below the client's socket timeout.
+LEASE_TIMEOUT = 20.0
+
+
+class _Flight:
+    """One in-progress upstream fetch that other callers can wait on."""
+
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SharedPriceCache:
+    """Thread-safe TTL cache; ``get_or_fetch`` coalesces concurrent misses per key."""
+
+    source = "process"
+
+    def __init__(self, *, retention: float = DEFAULT_RETENTION) -> None:
+        self.retention = max(1.0, float(retention))
+        self._entries: Dict[str, Tuple[Any, float]] = {}
+        self._inflight: Dict[str, _Flight] = {}
+        self._lock = threading.Lock()
+        self._next_sweep = time.monotonic() + self.retention
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.upstream_calls = 0
+        self.evicted = 0
+
+    def get(self, key: str, max_age: float) -> Optional[Any]:
+        """Return the cached value if it is younger than ``max_age`` seconds."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[1] < max_age:
+                self.hits += 1
+                return entry[0]
+        return None
+
+    def is_fresh(self, key: str, max_age: float) -> bool:
+        """Whether ``key`` holds a value younger than ``max_age`` (does not count as a hit)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and time.monotonic() - entry[1] < max_age
+
+    def get_stale(self, key: str) -> Optional[Tuple[Any, float]]:
+        """Return ``(value, age_seconds)`` regardless of age, for last-resort fallbacks."""
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            return None
+        return entry[0], time.monotonic() - entry[1]
+
+    def put(self, key: str, value: Any, *, age: float = 0.0) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self._entries[key] = (value, now - max(0.0, age))
+            if now >= self._next_sweep:
+                self._evict(now)
+
+    def _evict(self, now: float) -> None:
+        """Drop entries older than ``retention``; caller holds the lock."""
+        cutoff = now - self.retention
+        expired = [key for key, (_, stored_at) in self._entries.items() if stored_at < cutoff]
+        for key in expired:
+            del self._entries[key]
+        self.evicted += len(expired)
+        self._next_sweep = now + self.retention / 4
+
+    def get_or_fetch(self, key: str, max_age: float, fetch: Callable[[], Any]) -> Any:
+        """Return a fresh cached value or run ``fetch`` once for all concurrent callers."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[1] < max_age:
+                self.hits += 1
+                return entry[0]
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = _Flight()
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = self._fetch_miss(key, max_age, fetch)
+            return flight.value
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            flight.done.set()
+
+    def _fetch_miss(self, key: str, max_age: float, fetch: Callable[[], Any]) -> Any:
+        """Fill a miss from upstream; runs in exactly one thread per key at a time."""
+        with self._lock:
+            self.upstream_calls += 1
+        value = fetch()
+        self.put(key, value)
+        return value
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "source": self.source,
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "upstream_calls": self.upstream_calls,
+                "evicted": self.evicted,
+            }
+
+
+class HostPriceCache(SharedPriceCache):
+    """Process cache backed by the host coordinator so bot processes share fresh values.
+
+    Values must be JSON-serialisable. A miss asks the coordinator for the
+    key with a lease: the first process gets the lease and fetches, the others
+    wait (up to ``LEASE_TIMEOUT``) for its ``cache.put``. When the coordinator
+    is unreachable the cache silently degrades to process scope.
+    """
+
+    source = "coordinator"
+
+    def __init__(self, client: CoordinatorClient) -> None:
+        super().__init__()
+        self.client = client
+
+    def _fetch_miss(self, key: str, max_age: float, fetch: Callable[[], Any]) -> Any:
+        leased = False
+        try:
+            shared = self.client.call("cache.get", key=key, max_age=max_age, lease_timeout=LEASE_TIMEOUT)
+            if shared.get("hit"):
+                with self._lock:
+                    self.hits += 1
+                self.put(key, shared["value"], age=float(shared.get("age", 0.0)))
+                return shared["value"]
+            leased = bool(shared.get("lease"))
+        except (OSError, ValueError):
+            pass
+        try:
+            value = super()._fetch_miss(key, max_age, fetch)
+        except BaseException:
+            if leased:
+                self._call_quietly("cache.release", key=key)
+            raise
+        self._call_quietly("cache.put", key=key, value=value)
+        return value
+
+    def _call_quietly(self, op: str, **payload: Any) -> None:
+        try:
+            self.client.call(op, **payload)
+        except (OSError, ValueError, TypeError):
+            pass
+
+
+_cache: Optional[SharedPriceCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_price_cache() -> SharedPriceCache:
+    """Return the process-wide cache, host-shared when a coordinator is configured."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                client = client_from_env()
+                _cache = HostPriceCache(client) if client else SharedPriceCache()
+    return _cache
+
+
+def register_coordinator_handlers(server: CoordinatorServer) -> None:
+    """Serve ``cache.get``/``cache.put``/``cache.release`` from a cache held by the coordinator.
+
+    ``cache.get`` with ``lease_timeout`` is the host-wide single flight: on a
+    miss the first caller gets ``{"lease": true}`` and must ``put`` or
+    ``release`` the key; later callers block until then (or until the lease
+    expires, when the next waiter takes it over). Each connection has its own
+    server thread, so waiting blocks only that caller.
+    """
+    cache = SharedPriceCache()
+    leases: Dict[str, float] = {}  # key -> monotonic expiry
+    changed = threading.Condition()
+
+    def get(request: Dict[str, Any]) -> Dict[str, Any]:
+        key = str(request["key"])
+        max_age = float(request.get("max_age", 0.0))
+        lease_timeout = float(request.get("lease_timeout", 0.0))
+        deadline = time.monotonic() + lease_timeout
+        with changed:
+            while True:
+                if cache.get(key, max_age) is not None:
+                    value, age = cache.get_stale(key)
+                    return {"hit": True, "value": value, "age": age}
+                now = time.monotonic()
+                if lease_timeout <= 0:
+                    return {"hit": False}
+                expires = leases.get(key, 0.0)
+                if expires <= now:
+                    leases[key] = now + lease_timeout
+                    return {"hit": False, "lease": True}
+                if now >= deadline:
+                    return {"hit": False}
+                changed.wait(min(expires, deadline) - now)
+
+    def put(request: Dict[str, Any]) -> Dict[str, Any]:
+        key = str(request["key"])
+        cache.put(key, request.get("value"))
+        with changed:
+            leases.pop(key, None)
+            changed.notify_all()
+        return {}
+
+    def release(request: Dict[str, Any]) -> Dict[str, Any]:
+        with changed:
+            leases.pop(str(request["key"]), None)
+            changed.notify_all()
+        return {}
+
+    def stats(_request: Dict[str, Any]) -> Dict[str, Any]:
+        return {"stats": cache.stats()}
+
+    server.register("cache.get", get)
+    server.register("cache.put", put)
+    server.register("cache.release", release)
+    server.register("cache.stats", stats)
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""Token-bucket rate limiting for exchange/data API calls.
+
+One bucket per endpoint family is shared by every bot in the process. When
+``BOT_COORDINATOR_SOCKET`` points at a running ``local_coordinator`` the
+buckets live in the coordinator instead, so all bot processes on a host
+share one budget per egress IP. Order placement always wins over data
+fetches: data requests leave a small reserve untouched and yield to any
+waiting order.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from local_coordinator import CoordinatorClient, CoordinatorServer, client_from_env
+
+
+PRIORITY_ORDER = 0
+PRIORITY_DATA = 1
+
+COINBASE_PUBLIC = "coinbase_public"
+COINBASE_PRIVATE = "coinbase_private"
+COINGECKO = "coingecko"
+
+DEFAULT_ACQUIRE_TIMEOUT = 10.0
+DEFAULT_RETRY_AFTER = 1.0
+
+
+@dataclass(frozen=True)
+class BucketSpec:
+    rate: float   # tokens per second
+    burst: float  # bucket capacity
+
+
+# Published limits: Coinbase Exchange public 10 req/s (burst 15) and private
+# 15 req/s (burst 30) per IP; CoinGecko's public API allows roughly 30 calls/min.
+DEFAULT_LIMITS: Dict[str, BucketSpec] = {
+    COINBASE_PUBLIC: BucketSpec(rate=10.0, burst=15.0),
+    COINBASE_PRIVATE: BucketSpec(rate=15.0, burst=30.0),
+    COINGECKO: BucketSpec(rate=0.5, burst=5.0),
+}
+FALLBACK_LIMIT = BucketSpec(rate=5.0, burst=5.0)
+
+
+class RateLimitExceeded(RuntimeError):
+    """Raised when a request could not get a token within its timeout."""
+
+
+class TokenBucket:
+    """Thread-safe token bucket with order-over-data priority and 429 back-off."""
+
+    def __init__(self, rate: float, burst: float, *, order_reserve: float = 1.0) -> None:
+        self.rate = max(1e-6, float(rate))
+        self.burst = max(1.0, float(burst))
+        self.order_reserve = max(0.0, min(float(order_reserve), self.burst - 1.0))
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._waiting_orders = 0
+        self._cond = threading.Condition()
+        self.granted = 0
+        self.throttled = 0
+        self.timeouts = 0
+        self.penalties = 0
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+            self._updated = now
+
+    def acquire(self, priority: int = PRIORITY_DATA, timeout: Optional[float] = None) -> bool:
+        is_order = priority <= PRIORITY_ORDER
+        needed = 1.0 if is_order else 1.0 + self.order_reserve
+        deadline = None if timeout is None else time.monotonic() + timeout
+        waited = False
+        with self._cond:
+            if is_order:
+                self._waiting_orders += 1
+            try:
+                while True:
+                    now = time.monotonic()
+                    self._refill(now)
+                    open_for_us = is_order or self._waiting_orders == 0
+                    if now >= self._blocked_until and open_for_us and self._tokens >= needed:
+                        self._tokens -= 1.0
+                        self.granted += 1
+                        if waited:
+                            self.throttled += 1
+                        return True
+                    wait = max(self._blocked_until - now, (needed - self._tokens) / self.rate, 0.01)
+                    if deadline is not None:
+                        remaining = deadline - now
+                        if remaining <= 0:
+                            self.timeouts += 1
+                            return False
+                        wait = min(wait, remaining)
+                    waited = True
+                    self._cond.wait(wait)
+            finally:
+                if is_order:
+                    self._waiting_orders -= 1
+                    self._cond.notify_all()
+
+    def penalize(self, retry_after: float) -> None:
+        """Drain the bucket and block it after the upstream answered 429."""
+        with self._cond:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens = 0.0
+            self._blocked_until = max(self._blocked_until, now + max(0.0, retry_after))
+            self.penalties += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._cond:
+            now = time.monotonic()
+            self._refill(now)
+            return {
+                "tokens": round(self._tokens, 3),
+                "rate": self.rate,
+                "burst": self.burst,
+                "blocked_for": round(max(0.0, self._blocked_until - now), 3),
+                "waiting_orders": self._waiting_orders,
+                "granted": self.granted,
+                "throttled": self.throttled,
+                "timeouts": self.timeouts,
+                "penalties": self.penalties,
+            }
+
+
+def _limits_from_env() -> Dict[str, BucketSpec]:
+    """Merge ``BOT_RATE_LIMITS='{"coingecko": {"rate": 0.2, "burst": 3}}'`` over the defaults.
+
+    A malformed value is logged and ignored rather than taking ``/health`` down with it.
+    """
+    limits = dict(DEFAULT_LIMITS)
+    raw = os.getenv("BOT_RATE_LIMITS")
+    if not raw:
+        return limits
+    try:
+        overrides = {
+            family: BucketSpec(rate=float(spec["rate"]), burst=float(spec["burst"]))
+            for family, spec in json.loads(raw).items()
+        }
+    except (AttributeError, KeyError, TypeError, ValueError) as exc:
+        logging.getLogger(__name__).warning("Ignoring invalid BOT_RATE_LIMITS (%s); using defaults", exc)
+        return limits
+    limits.update(overrides)
+    return limits
+
+
+class RateLimiter:
+    """Process-local set of buckets, one per endpoint family."""
+
+    source = "process"
+
+    def __init__(self, limits: Optional[Dict[str, BucketSpec]] = None) -> None:
+        self.limits = dict(limits if limits is not None else _limits_from_env())
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, family: str) -> TokenBucket:
+        bucket = self._buckets.get(family)
+        if bucket is None:
+            with self._lock:
+                bucket = self._buckets.get(family)
+                if bucket is None:
+                    spec = self.limits.get(family, FALLBACK_LIMIT)
+                    bucket = TokenBucket(spec.rate, spec.burst)
+                    self._buckets[family] = bucket
+        return bucket
+
+    def acquire(self, family: str, priority: int = PRIORITY_DATA, timeout: Optional[float] = DEFAULT_ACQUIRE_TIMEOUT) -> None:
+        if not self.bucket(family).acquire(priority, timeout):
+            raise RateLimitExceeded(f"Rate limit budget for {family} exhausted (waited {timeout}s)")
+
+    def penalize(self, family: str, retry_after: float = DEFAULT_RETRY_AFTER) -> None:
+        self.bucket(family).penalize(retry_after)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "source": self.source,
+            "buckets": {family: bucket.snapshot() for family, bucket in sorted(self._buckets.items())},
+        }
+
+
+class CoordinatedRateLimiter(RateLimiter):
+    """Limiter whose buckets live in the host coordinator; falls back to local buckets."""
+
+    source = "coordinator"
+
+    def __init__(self, client: CoordinatorClient) -> None:
+        super().__init__()
+        self.client = client
+
+    def acquire(self, family: str, priority: int = PRIORITY_DATA, timeout: Optional[float] = DEFAULT_ACQUIRE_TIMEOUT) -> None:
+        try:
+            granted = self.client.call("ratelimit.acquire", family=family, priority=priority, timeout=timeout)["granted"]
+        except (OSError, ValueError):
+            return super().acquire(family, priority, timeout)
+        if not granted:
+            raise RateLimitExceeded(f"Rate limit budget for {family} exhausted (waited {timeout}s)")
+
+    def penalize(self, family: str, retry_after: float = DEFAULT_RETRY_AFTER) -> None:
+        try:
+            self.client.call("ratelimit.penalize", family=family, retry_after=retry_after)
+        except (OSError, ValueError):
+            super().penalize(family, retry_after)
+
+    def snapshot(self) -> Dict[str, Any]:
+        try:
+            return dict(self.client.call("ratelimit.snapshot")["limits"], source=self.source)
+        except (OSError, ValueError, KeyError):
+            return dict(super().snapshot(), source="process (coordinator unreachable)")
+
+
+_limiter: Optional[RateLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Return the shared limiter, using the host coordinator when one is configured."""
+    global _limiter
+    if _limiter is None:
+        with _limiter_lock:
+            if _limiter is None:
+                client = client_from_env()
+                _limiter = CoordinatedRateLimiter(client) if client else RateLimiter()
+    return _limiter
+
+
+def _retry_after(response: Any) -> float:
+    value = response.headers.get("Retry-After") if getattr(response, "headers", None) else None
+    try:
+        return float(value) if value else DEFAULT_RETRY_AFTER
+    except ValueError:
+        return DEFAULT_RETRY_AFTER
+
+
+def limited_request(family: str, method: str, url: str, *, priority: int = PRIORITY_DATA, **kwargs: Any):
+    """Issue an HTTP request through the shared limiter; a 429 drains the family's bucket."""
+    import requests
+
+    limiter = get_rate_limiter()
+    limiter.acquire(family, priority)
+    response = requests.request(method, url, **kwargs)
+    if response.status_code == 429:
+        limiter.penalize(family, _retry_after(response))
+    return response
+
+
+def register_coordinator_handlers(server: CoordinatorServer) -> None:
+    """Expose a process-local limiter through the coordinator protocol."""
+    limiter = RateLimiter()
+
+    def acquire(request: Dict[str, Any]) -> Dict[str, Any]:
+        bucket = limiter.bucket(str(request["family"]))
+        granted = bucket.acquire(int(request.get("priority", PRIORITY_DATA)), request.get("timeout"))
+        return {"granted": granted}
+
+    def penalize(request: Dict[str, Any]) -> Dict[str, Any]:
+        limiter.penalize(str(request["family"]), float(request.get("retry_after", DEFAULT_RETRY_AFTER)))
+        return {}
+
+    def snapshot(_request: Dict[str, Any]) -> Dict[str, Any]:
+        return {"limits": limiter.snapshot()}
+
+    server.register("ratelimit.acquire", acquire)
+    server.register("ratelimit.penalize", penalize)
+    server.register("ratelimit.snapshot", snapshot)
@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""Dashboard settings payloads compiled into per-strategy lookup tables.
+
+``env_schema`` describes the dashboard payload (required fields, ENV mapping,
+non-negative fields); the bot adds how each dashboard field lands in
+``BotConfig`` and ``strategy_params``. Both are compiled once at import into
+one :class:`CompiledSettings` per strategy, whose ``apply`` validates, coerces
+and diffs a payload in a single walk over its keys. A settings push then costs
+one dict lookup per field instead of re-deriving the mapping every time.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from env_schema import (
+    DASHBOARD_ENV_FIELDS,
+    NON_NEGATIVE_SUFFIXES,
+    STRATEGY_NAMES,
+    STRATEGY_REQUIRED_FIELDS,
+    ValidationError,
+)
+
+
+_EMPTY = (None, "", [])
+_EMPTY_PARAM = (None, "")  # strategy params accept an empty list (e.g. a basket)
+_MISSING = object()
+
+
+def coerce_value(value: Any, *, prefer_int: bool = False) -> Any:
+    """Parse a dashboard value: numbers stay numbers, numeric strings become int/float."""
+    if isinstance(value, (int, float)):
+        return int(value) if prefer_int else value
+    if isinstance(value, str):
+        candidate = value.strip()
+        if not candidate:
+            return None
+        if prefer_int:
+            try:
+                return int(candidate)
+            except ValueError:
+                try:
+                    return int(float(candidate))
+                except ValueError:
+                    return candidate
+        try:
+            return int(candidate)
+        except ValueError:
+            try:
+                return float(candidate)
+            except ValueError:
+                return candidate
+    return value
+
+
+def _as_symbol(value: Any) -> Optional[str]:
+    return str(value).replace("/", "-")
+
+
+def _as_float(value: Any) -> Optional[float]:
+    coerced = coerce_value(value)
+    return float(coerced) if isinstance(coerced, (int, float)) else None
+
+
+def _minutes_as_seconds(value: Any) -> Optional[int]:
+    coerced = coerce_value(value, prefer_int=True)
+    return int(coerced) * 60 if isinstance(coerced, (int, float)) else None
+
+
+# dashboard key -> (BotConfig field, priority, converter). When several keys
+# feed the same field the highest priority wins, whatever the payload order.
+_CONFIG_FIELDS: Dict[str, Tuple[str, int, Callable[[Any], Any]]] = {
+    "cryptoSymbol": ("symbol", 0, _as_symbol),
+    "botSymbol": ("symbol", 1, _as_symbol),
+    "tradeAmount": ("starting_cash", 0, _as_float),
+    "botStartingCash": ("starting_cash", 1, _as_float),
+    "botSleep": ("sleep_seconds", 0, _as_float),
+    "checkInterval": ("sleep_seconds", 1, _minutes_as_seconds),
+    "botExchange": ("exchange", 0, str),
+}
+
+_EXCHANGE_PARAM_FIELDS = {
+    "coinbaseApiKey": "api_key",
+    "coinbaseSecret": "api_secret",
+}
+
+
+@dataclass(frozen=True)
+class ParamField:
+    dashboard_key: str
+    param_key: str
+    prefer_int: bool = False
+    empty: Tuple[Any, ...] = _EMPTY_PARAM
+
+
+# Parameters every strategy understands.
+_COMMON_PARAMS = (
+    ParamField("rsiBuyThreshold", "rsi_buy_threshold", empty=_EMPTY),
+    ParamField("rsiSellThreshold", "rsi_sell_threshold", empty=_EMPTY),
+    ParamField("maxTradesPerHour", "max_trades_per_hour", prefer_int=True, empty=_EMPTY),
+    ParamField("maxTradesPerDay", "max_trades_per_day", prefer_int=True, empty=_EMPTY),
+    ParamField("maxHoldings", "max_holdings", empty=_EMPTY),
+    ParamField("swingWindow", "swing_window", prefer_int=True, empty=_EMPTY),
+    ParamField("swingDiffThreshold", "swing_diff_threshold", empty=_EMPTY),
+    ParamField("sellPercentage", "sell_percentage", empty=_EMPTY),
+    ParamField("trailingProfitThreshold", "trailing_profit_threshold", empty=_EMPTY),
+)
+
+_GRID_PARAMS = (
+    ParamField("amount", "amount"),
+    ParamField("gridSize", "grid_size"),
+    ParamField("gridCount", "grid_count", prefer_int=True),
+    ParamField("maxOrders", "max_orders", prefer_int=True),
+)
+_DCA_PARAMS = (
+    ParamField("baseAmount", "base_amount"),
+    ParamField("intervalMinutes", "interval_minutes", prefer_int=True),
+)
+_BASKET_DCA_PARAMS = _DCA_PARAMS + (
+    ParamField("basket", "basket"),
+    ParamField("rebalanceThresholdPct", "rebalance_threshold_pct"),
+)
+_MOMENTUM_PARAMS = (
+    ParamField("baseAmount", "base_amount"),
+    ParamField("momentumThreshold", "momentum_threshold"),
+    ParamField("momentumPeriod", "momentum_period", prefer_int=True),
+    ParamField("volumeThreshold", "volume_threshold"),
+)
+_SCALPING_PARAMS = (
+    ParamField("tradeAmount", "trade_amount"),
+    ParamField("scalpTarget", "scalp_target"),
+    # Filter parameters (gates & scoring)
+    ParamField("buyThreshold", "buy_threshold"),
+    ParamField("shortMaPeriod", "short_ma_period", prefer_int=True),
+    ParamField("longMaPeriod", "long_ma_period", prefer_int=True),
+    ParamField("rsiThreshold", "rsi_threshold"),
+    ParamField("rsiMin", "rsi_min"),
+    ParamField("rsiMax", "rsi_max"),
+    ParamField("enableVolumeConfirmation", "enable_volume_confirmation"),
+    ParamField("volumeThreshold", "volume_threshold"),
+)
+
+STRATEGY_PARAM_FIELDS: Dict[str, Tuple[ParamField, ...]] = {
+    "grid": _GRID_PARAMS,
+    "advanced_grid": _GRID_PARAMS,
+    "dca": _DCA_PARAMS,
+    "advanced_dca": _DCA_PARAMS,
+    "basket_dca": _BASKET_DCA_PARAMS,
+    "momentum": _MOMENTUM_PARAMS,
+    "advanced_momentum": _MOMENTUM_PARAMS,
+    "scalping": _SCALPING_PARAMS,
+    "advanced_scalping": _SCALPING_PARAMS,
+}
+
+
+@dataclass
+class SettingsUpdate:
+    """Outcome of applying one dashboard payload to the current config."""
+
+    strategy: str
+    env_vars: Dict[str, str] = field(default_factory=dict)
+    updates: Dict[str, Any] = field(default_factory=dict)  # BotConfig.update() payload
+    param_changes: Dict[str, Any] = field(default_factory=dict)
+    enabled: Optional[bool] = None
+
+
+class CompiledSettings:
+    """Per-strategy dispatch table: dashboard key -> everything that key affects."""
+
+    __slots__ = ("strategy", "validated", "required", "_by_key")
+
+    def __init__(self, strategy: str, param_fields: Iterable[ParamField]) -> None:
+        self.strategy = strategy
+        self.validated = strategy in STRATEGY_NAMES
+        self.required = tuple(STRATEGY_REQUIRED_FIELDS.get(strategy, ())) if self.validated else ()
+        env_fields = DASHBOARD_ENV_FIELDS if self.validated else {}
+
+        keys = set(env_fields) | set(_CONFIG_FIELDS) | set(_EXCHANGE_PARAM_FIELDS)
+        params_by_key: Dict[str, Tuple[ParamField, ...]] = {}
+        for param in tuple(_COMMON_PARAMS) + tuple(param_fields):
+            params_by_key[param.dashboard_key] = params_by_key.get(param.dashboard_key, ()) + (param,)
+            keys.add(param.dashboard_key)
+
+        # (env var, config field spec, exchange param, strategy params)
+        self._by_key: Dict[str, Tuple[Optional[str], Any, Optional[str], Tuple[ParamField, ...]]] = {
+            key: (
+                env_fields.get(key),
+                _CONFIG_FIELDS.get(key),
+                _EXCHANGE_PARAM_FIELDS.get(key),
+                params_by_key.get(key, ()),
+            )
+            for key in keys
+        }
+
+    def apply(self, payload: Dict[str, Any], config: Any, *, strategy_override: Any = None) -> SettingsUpdate:
+        """Validate ``payload`` and map it onto ``config`` (a ``BotConfig``) without mutating it.
+
+        Raises :class:`env_schema.ValidationError` exactly where
+        ``validate_dashboard_settings`` would.
+        """
+        result = SettingsUpdate(strategy=self.strategy)
+        updates = result.updates
+        if strategy_override not in _EMPTY:
+            updates["strategy"] = str(strategy_override).lower()
+
+        exchange_params = dict(config.exchange_params)
+        current_params = config.strategy_params
+        strategy_params = dict(current_params)
+        config_priority: Dict[str, int] = {}
+        type_error: Optional[ValidationError] = None
+        validated = self.validated
+        by_key = self._by_key
+
+        for key, value in payload.items():
+            if validated and type_error is None and key.endswith(NON_NEGATIVE_SUFFIXES):
+                if not isinstance(value, (int, float)) or value < 0:
+                    type_error = ValidationError(key, f"{key} must be a positive number", "INVALID_TYPE")
+            plan = by_key.get(key)
+            if plan is None:
+                continue
+            env_key, config_field, exchange_key, params = plan
+            if env_key is not None and value is not None:
+                result.env_vars[env_key] = str(value)
+            if value not in _EMPTY:
+                if config_field is not None:
+                    name, priority, convert = config_field
+                    if priority >= config_priority.get(name, -1):
+                        converted = convert(value)
+                        if converted is not None:
+                            updates[name] = converted
+                            config_priority[name] = priority
+                if exchange_key is not None:
+                    exchange_params[exchange_key] = str(value)
+            for param in params:
+                if value in param.empty:
+                    continue
+                coerced = coerce_value(value, prefer_int=param.prefer_int)
+                if coerced is not None:
+                    strategy_params[param.param_key] = coerced
+
+        if validated:
+            missing = [key for key in self.required if payload.get(key) is None]
+            if missing:
+                raise ValidationError(
+                    "validation",
+                    f"Missing required fields for {self.strategy}: {', '.join(missing)}",
+                    "MISSING_REQUIRED",
+                )
+            if type_error is not None:
+                raise type_error
+            result.env_vars["BOT_STRATEGY"] = self.strategy
+            if payload.get("coinbaseApiKey"):
+                result.env_vars["COINBASE_API_KEY"] = str(payload["coinbaseApiKey"])
+            if payload.get("coinbaseSecret"):
+                result.env_vars["COINBASE_SECRET"] = str(payload["coinbaseSecret"])
+
+        if exchange_params != config.exchange_params:
+            updates["exchange_params"] = exchange_params
+        if strategy_params != current_params:
+            updates["strategy_params"] = strategy_params
+            result.param_changes = {
+                key: value
+                for key, value in strategy_params.items()
+                if current_params.get(key, _MISSING) != value
+            }
+        if "isEnabled" in payload:
+            result.enabled = bool(payload["isEnabled"])
+        return result
+
+
+_COMPILED: Dict[str, CompiledSettings] = {
+    name: CompiledSettings(name, STRATEGY_PARAM_FIELDS.get(name, ()))
+    for name in set(STRATEGY_NAMES) | set(STRATEGY_PARAM_FIELDS)
+}
+
+
+def compiled_settings(strategy: Optional[str]) -> CompiledSettings:
+    """Compiled table for ``strategy``; unknown names get (and cache) the common table."""
+    key = (strategy or "").lower()
+    compiled = _COMPILED.get(key)
+    if compiled is None:
+        compiled = _COMPILED[key] = CompiledSettings(key, ())
+    return compiled
+
+
+def apply_dashboard_settings(payload: Dict[str, Any], config: Any) -> SettingsUpdate:
+    """Validate, coerce and diff a dashboard ``config`` payload against ``config``.
+
+    Raises ``ValueError`` for an unknown ``botStrategy`` and
+    :class:`env_schema.ValidationError` for invalid fields.
+    """
+    strategy_override = payload.get("botStrategy") or payload.get("strategy")
+    strategy_key = str(strategy_override or config.strategy or "").lower()
+    if strategy_override not in _EMPTY and strategy_key not in STRATEGY_NAMES:
+        raise ValueError(f"Unsupported strategy: {strategy_key}")
+    return compiled_settings(strategy_key).apply(payload, config, strategy_override=strategy_override)
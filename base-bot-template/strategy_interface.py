@@ -7,10 +7,22 @@ from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from statistics import mean, pstdev
-from typing import Any, Callable, Deque, Dict, List, Optional
+from typing import Any, Callable, Deque, Dict, FrozenSet, List, Optional, Tuple
 from collections import deque
 
-from exchange_interface import Exchange, MarketSnapshot
+from exchange_interface import CandleSeries, Exchange, MarketSnapshot, TradeExecution
+from settings_schema import coerce_value
+
+
+@dataclass
+class Leg:
+    """One order of a multi-symbol signal; the bot executes and records legs in order."""
+
+    symbol: str
+    side: str  # "buy" or "sell"
+    size: float
+    price: float
+    reason: str = ""
 
 
 @dataclass
@@ -26,6 +38,9 @@ class Signal:
     stop_loss: Optional[float] = None        # Stop loss price for this trade
     entry_price: Optional[float] = None      # Entry price (for sell signals)
 
+    # Multi-symbol orders; when set they are executed instead of ``action``/``size``.
+    legs: Tuple[Leg, ...] = ()
+
 
 @dataclass
 class Portfolio:
@@ -42,6 +57,13 @@ class Portfolio:
 class BaseStrategy(ABC):
     """Base class every concrete strategy extends."""
 
+    #: Candles the bot should pass to ``warm_up`` after ``prepare`` (0 disables warm-up).
+    warmup_candles: int = 0
+
+    #: ``strategy_params`` keys applied in place through ``on_params_changed``; changing
+    #: any other key rebuilds the strategy (its state is carried over via get/set_state).
+    hot_reload_params: FrozenSet[str] = frozenset()
+
     def __init__(self, *, config: Dict[str, Any], exchange: Exchange):
         self.config = config
         self.exchange = exchange
@@ -49,6 +71,45 @@ class BaseStrategy(ABC):
     def prepare(self) -> None:
         """Allow strategies to warm up. Optional."""
 
+    def warm_up(self, history: CandleSeries) -> None:
+        """Seed indicator state from up to ``warmup_candles`` recent candles in one call. Optional.
+
+        Called once per component build, after ``prepare``, so a restarted bot
+        can trade on its first cycle instead of re-accumulating ticks.
+        """
+
+    def on_params_changed(self, changes: Dict[str, Any]) -> None:
+        """Apply changed ``hot_reload_params`` without a rebuild.
+
+        The default stores the values in ``self.config`` and updates attributes
+        named like the changed keys, coerced to the attribute's current type.
+        Every value is validated before anything is applied; a value that cannot
+        be coerced raises ``ValueError`` and leaves the strategy unchanged.
+        """
+        coerced: Dict[str, Any] = {}
+        for key, value in changes.items():
+            if not hasattr(self, key):
+                continue
+            current = getattr(self, key)
+            if isinstance(current, bool):
+                value = str(value).strip().lower() in ("1", "true", "yes", "on")
+            elif isinstance(current, (int, float)) and value is not None:
+                number = coerce_value(value, prefer_int=isinstance(current, int))
+                if isinstance(number, bool) or not isinstance(number, (int, float)):
+                    raise ValueError(f"{key} must be a number, got {value!r}")
+                value = type(current)(number)
+            coerced[key] = value
+
+        self.config.update(changes)
+        self.config.update(coerced)
+        for key, value in coerced.items():
+            setattr(self, key, value)
+
+    def external_positions_value(self) -> float:
+        """Market value of positions the strategy manages outside the bot's single-symbol
+        portfolio (e.g. a DCA basket); added to the reported portfolio value."""
+        return 0.0
+
     def get_state(self) -> Dict[str, Any]:
         """Optional hook to expose serialisable strategy state."""
         return {}
@@ -63,6 +124,19 @@ class BaseStrategy(ABC):
     def on_trade(self, signal: Signal, execution_price: float, execution_size: float, timestamp: datetime) -> None:
         """Hook for strategies to update internal state after a fill."""
 
+    def on_leg_filled(self, leg: Leg, execution: TradeExecution) -> Optional[float]:
+        """Update state after one leg of ``Signal.legs`` fills; return its realised PnL, if any.
+
+        Called before the bot records the fill and sends the next leg.
+        """
+        return None
+
+    def on_legs_finished(self, fills: List[Tuple[Leg, TradeExecution]]) -> None:
+        """Called once per multi-leg signal with the legs that filled, even if a later leg failed.
+
+        The place for per-interval bookkeeping such as one combined database write.
+        """
+
 
 # --- Simple strategy factory -------------------------------------------------
 
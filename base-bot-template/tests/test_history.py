@@ -0,0 +1,71 @@
+"""Database pagination in ``HistoryService`` (run with ``python -m pytest tests``)."""
+
+import os
+import sys
+import unittest
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from history import HistoryService, LogBuffer  # noqa: E402
+from trade_journal import TradeJournal  # noqa: E402
+
+
+class _FakeDatabase:
+    """Mimics ``DatabaseClient.fetch_trades``: ``timestamp <= before`` newest first, then OFFSET/LIMIT."""
+
+    connection = object()
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def fetch_trades(self, *, before, skip=0, limit=50, **_filters):
+        def aware(value):
+            return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+        matching = [row for row in self.rows if aware(row["timestamp"]) <= before]
+        matching.sort(key=lambda row: (aware(row["timestamp"]), row["price"]), reverse=True)
+        return matching[skip:skip + limit]
+
+
+def _rows(stamp, tie_count):
+    rows = [
+        {"side": "buy", "amount": 1, "price": 100 + index, "profit": None, "reasoning": "basket", "timestamp": stamp}
+        for index in range(tie_count)
+    ]
+    rows.append({
+        "side": "sell", "amount": 1, "price": 1, "profit": None, "reasoning": "older",
+        "timestamp": stamp - timedelta(seconds=1),
+    })
+    return rows
+
+
+class ColdPaginationTest(unittest.TestCase):
+    def _walk(self, stamp):
+        database = _FakeDatabase(_rows(stamp, 12))
+        service = HistoryService(TradeJournal(None), LogBuffer(), lambda: database)
+        seen, cursors, cursor = [], [], None
+        for _ in range(10):
+            page = service.trades(limit=5, cursor=cursor)
+            seen.extend(trade["price"] for trade in page["trades"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+            cursors.append(cursor)
+        return seen, cursors, cursor
+
+    def _assert_complete(self, stamp):
+        seen, cursors, cursor = self._walk(stamp)
+        self.assertIsNone(cursor, "pagination did not terminate")
+        self.assertEqual(len(cursors), len(set(cursors)))
+        self.assertEqual(sorted(seen), sorted([1.0] + [100.0 + index for index in range(12)]))
+
+    def test_tie_group_larger_than_page_with_naive_timestamps(self):
+        self._assert_complete(datetime(2024, 1, 2, 3, 4, 5))
+
+    def test_tie_group_larger_than_page_with_aware_timestamps(self):
+        self._assert_complete(datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,420 @@
+#!/usr/bin/env python3
+"""Append-only, memory-mapped columnar trade journal.
+
+Each column lives in its own pre-allocated file inside the journal directory
+and is accessed through ``mmap``::
+
+    meta.bin     <8sIQ  magic b"TJOURNAL", version, committed row count
+    time.f64     epoch seconds (non-decreasing, so ranges are found by bisection)
+    side.u8      0 = buy, 1 = sell, 2 = other
+    size.f64 / price.f64 / pnl.f64   (pnl is NaN when the trade realised nothing)
+    reason.u32   index into reasons.txt (interned, one reason per line)
+    symbol.u32   0 = not recorded, else 1 + line in symbols.txt (interned)
+
+A row is committed by bumping the count in ``meta.bin`` after its columns are
+written, so a crash mid-append never exposes a partial row. Running
+aggregates and the per-side / per-reason row indexes used by ``page`` are kept
+in memory and rebuilt with one scan on open. A column file missing from an
+older journal is created zero-filled at the size of the others.
+"""
+
+from __future__ import annotations
+
+import math
+import mmap
+import os
+import struct
+from array import array
+from bisect import bisect_left
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+
+JOURNAL_MAGIC = b"TJOURNAL"
+JOURNAL_VERSION = 1
+
+SIDE_BUY = 0
+SIDE_SELL = 1
+SIDE_OTHER = 2
+_SIDE_CODES = {"buy": SIDE_BUY, "sell": SIDE_SELL}
+_SIDE_NAMES = {SIDE_BUY: "buy", SIDE_SELL: "sell", SIDE_OTHER: "other"}
+
+# (column name, file name, memoryview format)
+_COLUMNS: Tuple[Tuple[str, str, str], ...] = (
+    ("time", "time.f64", "d"),
+    ("side", "side.u8", "B"),
+    ("size", "size.f64", "d"),
+    ("price", "price.f64", "d"),
+    ("pnl", "pnl.f64", "d"),
+    ("reason", "reason.u32", "I"),
+    ("symbol", "symbol.u32", "I"),
+)
+_META = struct.Struct("<8sIQ")
+
+
+class _Column:
+    """One fixed-width column backed by a file (or anonymous memory) and an mmap."""
+
+    def __init__(self, path: Optional[str], fmt: str, capacity: int) -> None:
+        self.path = path
+        self.fmt = fmt
+        self.itemsize = struct.calcsize(fmt)
+        self._file = None
+        if path is not None:
+            self._file = open(path, "a+b")
+            existing = os.path.getsize(path) // self.itemsize
+            capacity = max(capacity, existing)
+        self._map(capacity)
+
+    def _map(self, capacity: int) -> None:
+        self.capacity = capacity
+        size = capacity * self.itemsize
+        if self._file is not None:
+            if os.path.getsize(self.path) < size:
+                self._file.truncate(size)
+            self._mmap = mmap.mmap(self._file.fileno(), size)
+        else:
+            self._mmap = mmap.mmap(-1, size)
+        self.view = memoryview(self._mmap).cast(self.fmt)
+
+    def grow(self, capacity: int) -> None:
+        """Remap at ``capacity``; views taken earlier keep reading the old mapping."""
+        old_map, old_view = self._mmap, self.view
+        old_map.flush()
+        self._map(capacity)
+        if self._file is None:
+            self._mmap[:len(old_map)] = old_map
+        old_view.release()
+        try:
+            old_map.close()
+        except BufferError:
+            pass  # a column() slice is still alive; the mapping closes when it is collected
+
+    def flush(self) -> None:
+        self._mmap.flush()
+
+    def close(self) -> None:
+        self.view.release()
+        self._mmap.close()
+        if self._file is not None:
+            self._file.close()
+
+
+class _Interned:
+    """Strings stored once and referenced by index, appended to a text file (one per line).
+
+    ``reserved`` strings take the first ids and are never written to the file.
+    """
+
+    def __init__(self, path: Optional[str], reserved: Tuple[str, ...] = ()) -> None:
+        self.values: List[str] = []
+        self.ids: Dict[str, int] = {}
+        for value in reserved:
+            self._remember(value)
+        self._file = None
+        if path is not None:
+            if os.path.exists(path):
+                with open(path, "r", encoding="utf-8", newline="\n") as handle:
+                    for line in handle:
+                        self._remember(line.rstrip("\n"))
+            self._file = open(path, "a", encoding="utf-8", newline="\n")
+
+    def _remember(self, value: str) -> int:
+        value_id = len(self.values)
+        self.values.append(value)
+        self.ids[value] = value_id
+        return value_id
+
+    def intern(self, value: str) -> int:
+        value = (value or "").replace("\n", " ")
+        value_id = self.ids.get(value)
+        if value_id is None:
+            value_id = self._remember(value)
+            if self._file is not None:
+                self._file.write(value + "\n")
+                self._file.flush()
+        return value_id
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+
+
+class TradeJournal:
+    """Columnar trade history with O(1) appends, bisected time ranges and running aggregates.
+
+    ``directory=None`` keeps the journal in anonymous memory (same API, no persistence).
+    """
+
+    def __init__(self, directory: Optional[str] = None, *, initial_capacity: int = 1024) -> None:
+        self.directory = directory
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+        capacity = initial_capacity
+        if directory is not None:
+            # Columns added in later versions start at the size of the existing ones.
+            for _, filename, fmt in _COLUMNS:
+                path = os.path.join(directory, filename)
+                if os.path.exists(path):
+                    capacity = max(capacity, os.path.getsize(path) // struct.calcsize(fmt))
+        self._columns: Dict[str, _Column] = {
+            name: _Column(os.path.join(directory, filename) if directory else None, fmt, capacity)
+            for name, filename, fmt in _COLUMNS
+        }
+        self._meta_file = None
+        if directory is not None:
+            meta_path = os.path.join(directory, "meta.bin")
+            self._meta_file = open(meta_path, "a+b")
+            if os.path.getsize(meta_path) < _META.size:
+                self._meta_file.truncate(_META.size)
+            self._meta = mmap.mmap(self._meta_file.fileno(), _META.size)
+        else:
+            self._meta = mmap.mmap(-1, _META.size)
+        magic, version, count = _META.unpack_from(self._meta)
+        if magic != JOURNAL_MAGIC or version != JOURNAL_VERSION:
+            count = 0
+        self._count = min(count, *(column.capacity for column in self._columns.values()))
+        self._write_count()
+
+        self._reasons = _Interned(os.path.join(directory, "reasons.txt") if directory else None)
+        self._symbols = _Interned(os.path.join(directory, "symbols.txt") if directory else None, reserved=("",))
+        self._rebuild_aggregates()
+
+    # --- writes ----------------------------------------------------------
+
+    def _write_count(self) -> None:
+        _META.pack_into(self._meta, 0, JOURNAL_MAGIC, JOURNAL_VERSION, self._count)
+
+    def append(
+        self,
+        *,
+        timestamp: datetime,
+        side: str,
+        size: float,
+        price: float,
+        realized_pnl: Optional[float] = None,
+        reason: str = "",
+        symbol: Optional[str] = None,
+    ) -> int:
+        """Append one trade and return its row index."""
+        index = self._count
+        if index >= self._columns["time"].capacity:
+            for column in self._columns.values():
+                column.grow(max(1024, column.capacity * 2))
+        if timestamp.tzinfo is None:
+            timestamp = timestamp.replace(tzinfo=timezone.utc)
+        side_code = _SIDE_CODES.get(side.lower(), SIDE_OTHER)
+        pnl = float("nan") if realized_pnl is None else float(realized_pnl)
+
+        columns = self._columns
+        columns["time"].view[index] = timestamp.timestamp()
+        columns["side"].view[index] = side_code
+        columns["size"].view[index] = float(size)
+        columns["price"].view[index] = float(price)
+        columns["pnl"].view[index] = pnl
+        reason_id = self._reasons.intern(reason)
+        columns["reason"].view[index] = reason_id
+        columns["symbol"].view[index] = self._symbols.intern(symbol or "")
+        self._count = index + 1
+        self._write_count()
+        self._accumulate(side_code, float(size), float(price), pnl)
+        self._index(index, side_code, reason_id)
+        return index
+
+    def truncate(self, length: int) -> None:
+        """Drop every row from ``length`` on (e.g. trades newer than a restored checkpoint)."""
+        if length >= self._count:
+            return
+        self._count = max(0, length)
+        self._write_count()
+        self._rebuild_aggregates()
+
+    def clear(self) -> None:
+        """Forget every trade (interned reasons and symbols are kept)."""
+        self._count = 0
+        self._write_count()
+        self._rebuild_aggregates()
+
+    def flush(self) -> None:
+        for column in self._columns.values():
+            column.flush()
+        self._meta.flush()
+
+    def close(self) -> None:
+        self.flush()
+        for column in self._columns.values():
+            column.close()
+        self._meta.close()
+        if self._meta_file is not None:
+            self._meta_file.close()
+        self._reasons.close()
+        self._symbols.close()
+
+    # --- aggregates ------------------------------------------------------
+
+    def _rebuild_aggregates(self) -> None:
+        self._side_rows: Dict[int, array] = {}
+        self._reason_rows: Dict[int, array] = {}
+        self._aggregates: Dict[str, float] = {
+            "buys": 0,
+            "sells": 0,
+            "buy_size": 0.0,
+            "sell_size": 0.0,
+            "buy_notional": 0.0,
+            "sell_notional": 0.0,
+            "realized_pnl": 0.0,
+            "closed_trades": 0,
+            "winning_trades": 0,
+        }
+        sides, sizes = self.column("side"), self.column("size")
+        prices, pnls, reasons = self.column("price"), self.column("pnl"), self.column("reason")
+        for i in range(self._count):
+            self._accumulate(sides[i], sizes[i], prices[i], pnls[i])
+            self._index(i, sides[i], reasons[i])
+
+    def _index(self, row: int, side_code: int, reason_id: int) -> None:
+        rows = self._side_rows.get(side_code)
+        if rows is None:
+            rows = self._side_rows[side_code] = array("q")
+        rows.append(row)
+        rows = self._reason_rows.get(reason_id)
+        if rows is None:
+            rows = self._reason_rows[reason_id] = array("q")
+        rows.append(row)
+
+    def _accumulate(self, side_code: int, size: float, price: float, pnl: float) -> None:
+        agg = self._aggregates
+        if side_code == SIDE_BUY:
+            agg["buys"] += 1
+            agg["buy_size"] += size
+            agg["buy_notional"] += size * price
+        elif side_code == SIDE_SELL:
+            agg["sells"] += 1
+            agg["sell_size"] += size
+            agg["sell_notional"] += size * price
+        if not math.isnan(pnl):
+            agg["realized_pnl"] += pnl
+            agg["closed_trades"] += 1
+            if pnl > 0:
+                agg["winning_trades"] += 1
+
+    def aggregates(self) -> Dict[str, float]:
+        return dict(self._aggregates, trades=self._count)
+
+    # --- reads -----------------------------------------------------------
+
+    def __len__(self) -> int:
+        return self._count
+
+    def column(self, name: str) -> memoryview:
+        """Read-only zero-copy view of the committed rows of one column."""
+        return self._columns[name].view[:self._count].toreadonly()
+
+    def reason(self, reason_id: int) -> str:
+        return self._reasons.values[reason_id]
+
+    def index_range(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> Tuple[int, int]:
+        """Row indices ``[lo, hi)`` of trades with ``start <= time < end``."""
+        times = self.column("time")
+
+        def epoch(value: datetime) -> float:
+            return (value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value).timestamp()
+
+        lo = bisect_left(times, epoch(start)) if start is not None else 0
+        hi = bisect_left(times, epoch(end)) if end is not None else self._count
+        return lo, max(lo, hi)
+
+    def row(self, index: int) -> Dict[str, Any]:
+        """One trade in the dict shape used by the bot's logs and API."""
+        if not 0 <= index < self._count:
+            raise IndexError(index)
+        columns = self._columns
+        timestamp = datetime.fromtimestamp(columns["time"].view[index], tz=timezone.utc).replace(tzinfo=None)
+        trade: Dict[str, Any] = {
+            "side": _SIDE_NAMES[columns["side"].view[index]],
+            "size": columns["size"].view[index],
+            "price": columns["price"].view[index],
+            "timestamp": timestamp.isoformat(),
+            "reason": self._reasons.values[columns["reason"].view[index]],
+        }
+        symbol = self._symbols.values[columns["symbol"].view[index]]
+        if symbol:
+            trade["symbol"] = symbol
+        pnl = columns["pnl"].view[index]
+        if not math.isnan(pnl):
+            trade["realized_pnl"] = pnl
+        return trade
+
+    def rows(self, lo: int = 0, hi: Optional[int] = None) -> List[Dict[str, Any]]:
+        hi = self._count if hi is None else min(hi, self._count)
+        return [self.row(i) for i in range(max(0, lo), hi)]
+
+    def recent(self, limit: int) -> List[Dict[str, Any]]:
+        return self.rows(self._count - limit)
+
+    def first_time(self) -> Optional[float]:
+        """Epoch seconds of the oldest row, or ``None`` when the journal is empty."""
+        return self._columns["time"].view[0] if self._count else None
+
+    def page(
+        self,
+        *,
+        before: Optional[int] = None,
+        limit: int = 50,
+        side: Optional[str] = None,
+        reason: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """Newest-first rows with index below ``before`` that match every given filter.
+
+        Returns the rows (each with its row ``id``) and the ``before`` to pass for
+        the next page, or ``None`` when nothing older matches.
+        """
+        lo, hi = self.index_range(start, end)
+        if before is not None:
+            hi = max(lo, min(hi, before))
+
+        side_code = None if side is None else _SIDE_CODES.get(side.lower(), SIDE_OTHER)
+        reason_id = None if reason is None else self._reasons.ids.get(reason, -1)
+        indexes = []
+        if side_code is not None:
+            indexes.append(self._side_rows.get(side_code, array("q")))
+        if reason_id is not None:
+            indexes.append(self._reason_rows.get(reason_id, array("q")))
+
+        if indexes:
+            # Walk the smaller index and check the other filter against its column.
+            candidates = min(indexes, key=len)
+            first, last = bisect_left(candidates, lo), bisect_left(candidates, hi)
+            row_ids = (candidates[i] for i in range(last - 1, first - 1, -1))
+        else:
+            row_ids = iter(range(hi - 1, lo - 1, -1))
+        sides = self._columns["side"].view
+        reasons = self._columns["reason"].view
+
+        rows: List[Dict[str, Any]] = []
+        for row_id in row_ids:
+            if side_code is not None and sides[row_id] != side_code:
+                continue
+            if reason_id is not None and reasons[row_id] != reason_id:
+                continue
+            if len(rows) == limit:
+                return rows, rows[-1]["id"]
+            rows.append(dict(self.row(row_id), id=row_id))
+        return rows, None
+
+
+def open_journal(directory: Optional[str], logger=None) -> TradeJournal:
+    """Open a persistent journal, falling back to an in-memory one if the directory is unusable."""
+    if directory is not None:
+        try:
+            return TradeJournal(directory)
+        except OSError as exc:
+            if logger is not None:
+                logger.warning(f"Trade journal at {directory} unavailable ({exc}); keeping trades in memory")
+    return TradeJournal(None)
+
+
+def default_journal_dir(bot_instance_id: Optional[str]) -> str:
+    return f"/app/state/journal-{bot_instance_id or 'default'}"
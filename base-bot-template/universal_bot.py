@@ -7,9 +7,8 @@ import os
 import sys
 import threading
 import time
-from collections import deque
 from datetime import datetime
-from typing import Any, Deque, Dict, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Union
 
 # Import enhanced logging system
 from enhanced_logging import (
@@ -22,21 +21,24 @@ from enhanced_logging import (
     log_performance_metrics
 )
 
-# Ensure built-in exchanges/strategies are registered.
-import coinbase_exchange  # noqa: F401
-
-from exchange_interface import ExchangeRegistry, TradeExecution
+from checkpoint import CheckpointError, default_checkpoint_path, load_checkpoint, save_checkpoint
+from bot_events import WAKE_COMMAND, WAKE_CONFIG, WAKE_PRICE, WAKE_SETTINGS, BotWakeup, FileWatcher
+from exchange_interface import CandleSeries, ExchangeRegistry, TradeExecution
+from fleet import get_fleet
+from history import HistoryService, LogBuffer
 from http_endpoints import BotControlServer, BotHTTPServer
 from integrations import DatabaseClient, StatusBroadcaster
-from strategy_interface import Portfolio, Signal, available_strategies, create_strategy
+from performance_metrics import PerformanceTracker
+from position_reconciler import PositionReconciler, ReconcileResult
+from price_cache import get_price_cache
+from rate_limit import get_rate_limiter
+from settings_schema import apply_dashboard_settings
+from strategy_interface import Leg, Portfolio, Signal, available_strategies, create_strategy
+from trade_journal import default_journal_dir, open_journal
 from universal_config import BotConfig
-# Generated ENV schema from registry - replaces settings_mapping.py
-from env_schema import (
-    STRATEGY_MAPPINGS,
-    map_dashboard_to_env_vars,
-    validate_dashboard_settings,
-    apply_settings_with_scope_check,
-)
+
+if TYPE_CHECKING:  # imported on demand: asyncio is only needed with BOT_HTTP_SERVER=async
+    from async_http import AsyncBotServer
 
 
 class UniversalBot:
@@ -45,7 +47,7 @@ class UniversalBot:
     def __init__(self, config_path: Optional[str] = None) -> None:
         self._lock = threading.RLock()
         self.config = BotConfig.load(config_path)
-        self._http_server: Optional[BotHTTPServer] = None
+        self._http_server: Optional[Union[BotHTTPServer, AsyncBotServer]] = None
         self._control_server: Optional[BotControlServer] = None
         self._cycle = 0
         self._running = False
@@ -60,8 +62,14 @@ class UniversalBot:
         self._realized_pnl = 0.0
         self._unrealized_pnl = 0.0
         self._avg_entry_price = 0.0
-        self._trades: Deque[Dict[str, Any]] = deque(maxlen=100)
+        self._metrics = PerformanceTracker.for_interval(self.config.sleep_seconds or 60.0)
         self._started_at = datetime.utcnow()
+        self._wakeup = BotWakeup()
+        self._checkpoint_path = self.config.checkpoint_path or default_checkpoint_path(self.config.bot_instance_id)
+        self._last_checkpoint_at = time.monotonic()
+        self._checkpoint_dirty = False
+        self._pending_strategy_state: Optional[Dict[str, Any]] = None
+        self._warmup_pending = False
 
         self._configure_logging()
 
@@ -77,13 +85,21 @@ class UniversalBot:
             log_file=log_file_path,
             detail_logging=True,  # Enable detailed logging by default
             logger_name="universal-bot"
-        )
+        ).getChild(str(self.config.bot_instance_id or id(self)))
 
         # Log where logs are being saved
         if log_file_path:
             self.logger.info(f"📁 Logs are being saved to: {log_file_path}")
             self.logger.info(f"📁 Log rotation: 10MB max size, 5 backup files")
 
+        # Per-bot child logger, so the buffer only sees this bot's records (they still propagate
+        # to the shared handlers).
+        self._log_buffer = LogBuffer()
+        self.logger.addHandler(self._log_buffer)
+        self._journal = open_journal(
+            self.config.trade_journal_dir or default_journal_dir(self.config.bot_instance_id), self.logger
+        )
+        self._history = HistoryService(self._journal, self._log_buffer, lambda: self._db_client, lock=self._lock)
         self.trade_logger = get_trade_logger()
         self.performance_logger = get_performance_logger()
         self._last_applied_env_vars: Dict[str, str] = {}
@@ -96,9 +112,23 @@ class UniversalBot:
             logger=self.logger,
         )
 
-        # Initialize portfolio and restore position from database (source of truth)
+        self._reconciler = PositionReconciler(
+            # Looked up per call: apply_settings replaces _db_client when the database changes.
+            read_memory=lambda: self.portfolio.quantity,
+            read_database=lambda: self._db_client.read_portfolio_quantity(),
+            write_memory=self._set_memory_quantity,
+            write_database=lambda quantity: self._db_client.set_portfolio_quantity(quantity),
+            interval=self.config.reconcile_interval,
+            tolerance=self.config.reconcile_tolerance,
+            auto_correct=self.config.reconcile_auto_correct,
+            on_alert=self._on_position_divergence,
+            logger=self.logger,
+        )
+
+        # Initialize portfolio; restore from the local checkpoint, falling back to the database
         self.portfolio = Portfolio(symbol=self.config.symbol, cash=self.config.starting_cash)
-        self._restore_portfolio_from_database()
+        if not self._restore_from_checkpoint():
+            self._restore_portfolio_from_database()
         self._status_broadcaster = StatusBroadcaster(
             base_url=self.config.base_url,
             bot_instance_id=self.config.bot_instance_id,
@@ -124,30 +154,109 @@ class UniversalBot:
         except Exception as exc:
             self.logger.warning(f"Failed to restore portfolio position from database: {exc}")
 
-    def _build_components(self) -> None:
-        print(">>>>>>>>> STARTUP IS STARTING")
-        print("Initializing bot components...")
-
-        with self._lock:
-            print("Creating exchange connection...")
-            self.exchange = ExchangeRegistry.create(self.config.exchange, **self.config.exchange_params)
+    def _restore_from_checkpoint(self) -> bool:
+        """Restore portfolio, PnL, trades and pending strategy state from the local checkpoint."""
+        started = time.perf_counter()
+        try:
+            checkpoint = load_checkpoint(self._checkpoint_path)
+        except (CheckpointError, OSError, ValueError) as exc:
+            self.logger.info(f"No usable checkpoint ({exc}) - falling back to database")
+            return False
 
-            print(f"Loading strategy: {self.config.strategy}")
+        state = checkpoint.state
+        if state.get("symbol") != self.config.symbol or state.get("bot_instance_id") != self.config.bot_instance_id:
+            self.logger.info("Checkpoint belongs to a different bot or symbol - ignoring it")
+            return False
 
-            # Prepare strategy config with additional universal bot parameters
-            strategy_config = dict(self.config.strategy_params)
-            strategy_config["starting_cash"] = self.config.starting_cash
-            strategy_config["db_client"] = self._db_client
+        try:
+            self.portfolio.cash = float(state["portfolio"]["cash"])
+            self.portfolio.quantity = float(state["portfolio"]["quantity"])
+            self._realized_pnl = float(state.get("realized_pnl", 0.0))
+            self._unrealized_pnl = float(state.get("unrealized_pnl", 0.0))
+            self._avg_entry_price = float(state.get("avg_entry_price", 0.0))
+            self._cycle = int(state.get("cycle", 0))
+            self._last_price = state.get("last_price")
+            journal_length = state.get("journal_length")
+            if journal_length is not None and len(self._journal) != int(journal_length):
+                self.logger.warning(
+                    f"Trade journal has {len(self._journal)} trades but the checkpoint expects "
+                    f"{int(journal_length)}; keeping the first {min(len(self._journal), int(journal_length))}"
+                )
+                self._journal.truncate(int(journal_length))
+            if not len(self._journal):
+                self._import_checkpoint_trades(state.get("trades", []))
+            self._metrics.set_state(state.get("metrics", {}))
+        except (KeyError, TypeError, ValueError) as exc:
+            self.logger.warning(f"Checkpoint is incomplete ({exc}) - falling back to database")
+            self.portfolio = Portfolio(symbol=self.config.symbol, cash=self.config.starting_cash)
+            return False
 
-            self.strategy = create_strategy(
-                self.config.strategy,
-                config=strategy_config,
-                exchange=self.exchange,
+        if state.get("strategy") == self.config.strategy:
+            self._pending_strategy_state = state.get("strategy_state")
+        self.logger.info(
+            f"Restored checkpoint saved {time.time() - checkpoint.saved_at:.0f}s ago in "
+            f"{(time.perf_counter() - started) * 1000:.1f} ms (quantity={self.portfolio.quantity:.8f})"
+        )
+        return True
+
+    def _import_checkpoint_trades(self, trades: Any) -> None:
+        """Seed an empty journal from checkpoints written before trades moved to the journal."""
+        for trade in trades:
+            self._journal.append(
+                timestamp=datetime.fromisoformat(trade["timestamp"]),
+                side=trade["side"],
+                size=trade["size"],
+                price=trade["price"],
+                realized_pnl=trade.get("realized_pnl"),
+                reason=trade.get("reason", ""),
+                symbol=trade.get("symbol"),
             )
 
-            print("Preparing strategy...")
-            self.strategy.prepare()
-            self.portfolio.symbol = self.config.symbol
+    def _checkpoint_state(self) -> Dict[str, Any]:
+        with self._lock:
+            strategy_state: Dict[str, Any] = {}
+            if self.strategy is not None:
+                try:
+                    strategy_state = self.strategy.get_state()
+                except Exception as exc:  # noqa: BLE001 - never lose the bot checkpoint to a strategy bug
+                    self.logger.warning(f"Strategy get_state failed: {exc}")
+            return {
+                "bot_instance_id": self.config.bot_instance_id,
+                "symbol": self.config.symbol,
+                "strategy": self.config.strategy,
+                "portfolio": {"cash": self.portfolio.cash, "quantity": self.portfolio.quantity},
+                "realized_pnl": self._realized_pnl,
+                "unrealized_pnl": self._unrealized_pnl,
+                "avg_entry_price": self._avg_entry_price,
+                "cycle": self._cycle,
+                "last_price": self._last_price,
+                "journal_length": len(self._journal),
+                "metrics": self._metrics.get_state(),
+                "strategy_state": strategy_state,
+            }
+
+    def _save_checkpoint(self) -> None:
+        try:
+            size = save_checkpoint(self._checkpoint_path, self._checkpoint_state())
+            self.logger.debug(f"Checkpoint written ({size} bytes)")
+        except (OSError, TypeError, ValueError) as exc:
+            self.logger.warning(f"Failed to write checkpoint to {self._checkpoint_path}: {exc}")
+        self._last_checkpoint_at = time.monotonic()
+        self._checkpoint_dirty = False
+
+    def _maybe_checkpoint(self) -> None:
+        """Checkpoint after trades and every ``checkpoint_interval`` seconds."""
+        interval = self.config.checkpoint_interval
+        if self._checkpoint_dirty or (interval > 0 and time.monotonic() - self._last_checkpoint_at >= interval):
+            self._save_checkpoint()
+
+    def _build_components(self) -> None:
+        print(">>>>>>>>> STARTUP IS STARTING")
+        print("Initializing bot components...")
+
+        with self._lock:
+            self._build_exchange()
+            self._build_strategy()
 
             print("Bot components initialized successfully")
             self.logger.info(
@@ -156,9 +265,156 @@ class UniversalBot:
                 self.config.strategy,
                 self.config.symbol,
             )
+        self._warm_up_strategy()
         print(">>>>>>>>> STARTUP COMPLETED")
         print()
 
+    def _build_exchange(self) -> None:
+        print("Creating exchange connection...")
+        self._close_exchange()
+        self.exchange = ExchangeRegistry.create(self.config.exchange, **self.config.exchange_params)
+        # Push-based exchanges (e.g. "stream") wake the loop on every tick.
+        if hasattr(self.exchange, "add_update_listener"):
+            self.exchange.add_update_listener(self.notify_market_update)
+        if self.strategy is not None:
+            self.strategy.exchange = self.exchange
+
+    def _build_strategy(self, *, carry_state: bool = False) -> None:
+        """Create and prepare the strategy; ``carry_state`` keeps the old instance's state."""
+        print(f"Loading strategy: {self.config.strategy}")
+        if carry_state and self.strategy is not None:
+            try:
+                self._pending_strategy_state = self.strategy.get_state()
+            except Exception as exc:  # noqa: BLE001 - fall back to a fresh strategy
+                self.logger.warning(f"Could not carry strategy state across rebuild: {exc}")
+
+        # Prepare strategy config with additional universal bot parameters
+        strategy_config = dict(self.config.strategy_params)
+        strategy_config["starting_cash"] = self.config.starting_cash
+        strategy_config["db_client"] = self._db_client
+        strategy_config["bot_instance_id"] = self.config.bot_instance_id
+
+        self.strategy = create_strategy(
+            self.config.strategy,
+            config=strategy_config,
+            exchange=self.exchange,
+        )
+        # Restored or carried-over state already holds live samples; warm-up is
+        # only for a strategy starting from nothing.
+        self._warmup_pending = self._pending_strategy_state is None
+        if self._pending_strategy_state is not None:
+            print("Restoring strategy state...")
+            self.strategy.set_state(self._pending_strategy_state)
+            self._pending_strategy_state = None
+
+        print("Preparing strategy...")
+        self.strategy.prepare()
+        self.portfolio.symbol = self.config.symbol
+
+    def _reload_components(
+        self,
+        *,
+        exchange_changed: bool,
+        strategy_changed: bool,
+        param_changes: Dict[str, Any],
+        previous_params: Dict[str, Any],
+        starting_cash_changed: bool = False,
+    ) -> None:
+        """Apply a settings diff, rebuilding only what the change actually requires.
+
+        Runs under the bot lock; a rebuilt strategy is warmed up by ``apply_settings``
+        once the lock is released.
+        """
+        if exchange_changed:
+            self.logger.info("Exchange settings changed; recreating %s exchange", self.config.exchange)
+            self._build_exchange()
+
+        if strategy_changed:
+            self.logger.info("Strategy or symbol changed; building %s for %s", self.config.strategy, self.config.symbol)
+            self._build_strategy()
+            return
+
+        # Removed keys and starting_cash are read only by the strategy constructor.
+        removed = set(previous_params) - set(self.config.strategy_params)
+        hot_params = getattr(self.strategy, "hot_reload_params", frozenset())
+        cold = sorted((set(param_changes) - set(hot_params)) | removed)
+        if starting_cash_changed:
+            cold.append("starting_cash")
+        if cold:
+            self.logger.info("Rebuilding strategy for non-reloadable parameters: %s", ", ".join(cold))
+            self._build_strategy(carry_state=True)
+            return
+        if not param_changes:
+            return
+        try:
+            self.strategy.on_params_changed(dict(param_changes))
+        except (TypeError, ValueError) as exc:
+            for key in param_changes:
+                if key in previous_params:
+                    self.config.strategy_params[key] = previous_params[key]
+                else:
+                    self.config.strategy_params.pop(key, None)
+            self.logger.warning(f"Rejected strategy parameter update ({exc}); keeping previous values")
+            return
+        # Keep the coerced values so a later rebuild reads the same parameters.
+        strategy_config = getattr(self.strategy, "config", {})
+        for key in param_changes:
+            if key in strategy_config:
+                self.config.strategy_params[key] = strategy_config[key]
+        self.logger.info("Hot-reloaded strategy parameters: %s", ", ".join(sorted(param_changes)))
+
+    def _warm_up_strategy(self) -> None:
+        """Feed a freshly built strategy bulk history so indicators are ready on the first cycle.
+
+        Only exchanges exposing ``history_interval`` (seconds per candle) serve real
+        history, and it is only used when that interval matches the cycle interval:
+        strategies sample one price per cycle, so candles at another spacing would
+        distort every indicator built on the mixed series. The history is fetched
+        outside the bot lock (pagination can take seconds) and applied under it.
+        """
+        with self._lock:
+            if not self._warmup_pending:
+                return
+            self._warmup_pending = False
+            strategy, exchange, symbol = self.strategy, self.exchange, self.config.symbol
+            needed = int(getattr(strategy, "warmup_candles", 0) or 0)
+            interval = getattr(exchange, "history_interval", None)
+            cycle = float(self.config.sleep_seconds or 0)
+        if needed <= 0:
+            return
+        if not interval:
+            self.logger.info("Skipping warm-up: %s exchange has no recorded history", self.config.exchange)
+            return
+        if not cycle or not 0.5 <= interval / cycle <= 2.0:
+            self.logger.info(
+                "Skipping warm-up: %ss candles do not match the %ss cycle interval", interval, cycle
+            )
+            return
+
+        try:
+            snapshot = exchange.fetch_market_snapshot(symbol, limit=needed)
+            candles = snapshot.candles
+            if candles is None:
+                candles = CandleSeries.from_closes(snapshot.prices)
+            if len(candles) == 0:
+                return
+            with self._lock:
+                if self.strategy is not strategy:
+                    return  # rebuilt meanwhile; the new instance is warmed up by its own builder
+                strategy.warm_up(candles)
+            print(f"Strategy warmed up with {len(candles)} candles")
+            self.logger.info("Strategy warmed up with %d candles for %s", len(candles), symbol)
+        except Exception as exc:  # noqa: BLE001 - warm-up is best effort
+            self.logger.warning(f"Strategy warm-up failed, indicators will fill from live ticks: {exc}")
+
+    def _close_exchange(self) -> None:
+        close = getattr(self.exchange, "close", None)
+        if callable(close):
+            try:
+                close()
+            except Exception as exc:  # noqa: BLE001 - never block a rebuild on cleanup
+                self.logger.warning(f"Failed to close exchange: {exc}")
+
     def _check_configuration_complete(self) -> bool:
         """
         Check if bot has received configuration from UI.
@@ -204,30 +460,51 @@ class UniversalBot:
         # Create state directory
         os.makedirs("/app/state", exist_ok=True)
 
-        # Wait indefinitely for configuration
-        while not self._check_configuration_complete():
-            # Check every 30 seconds
-            time.sleep(30)
+        # Wake as soon as the flag/persisted config appears (inotify, polling fallback)
+        # or a settings/command request arrives, instead of re-checking every 30s.
+        watcher = FileWatcher(
+            "/app/state",
+            ("config_received.flag", "config.json"),
+            lambda _name: self._wakeup.notify(WAKE_CONFIG),
+        )
+        watcher.start()
+        self.logger.info("Watching /app/state for configuration (%s)", watcher.mode)
 
-            if self._stop_requested:
-                break
+        try:
+            while not self._stop_requested and not self._check_configuration_complete():
+                self._wakeup.wait()
+        finally:
+            watcher.stop()
 
         if not self._stop_requested:
             print("🔥 Configuration received! Starting trading...")
             self._report_state("running", "Configuration received, starting trading")
 
+    def _new_http_server(self) -> Union[BotHTTPServer, AsyncBotServer]:
+        if self.config.http_server == "async":
+            from async_http import AsyncBotServer
+
+            return AsyncBotServer(
+                self,
+                port=self.config.http_port,
+                bot_secret=self.config.bot_secret,
+                logger=self.logger,
+            )
+        return BotHTTPServer(self, port=self.config.http_port)
+
     def run(self) -> None:
         """Run until max_cycles is reached (or indefinitely)."""
         print(">>>>>>>>> RUN IS STARTING")
         print("Starting HTTP servers...")
 
         if not self._http_server:
-            self._http_server = BotHTTPServer(self, port=self.config.http_port)
+            self._http_server = self._new_http_server()
             self._http_server.start()
             print(f"HTTP server started on port {self.config.http_port}")
             self.logger.info("HTTP endpoints available on port %s", self.config.http_port)
 
-        if not self._control_server:
+        # The asyncio server also answers the control routes on http_port.
+        if not self._control_server and not getattr(self._http_server, "serves_control", False):
             self._control_server = BotControlServer(
                 self,
                 port=self.config.control_port,
@@ -237,6 +514,10 @@ class UniversalBot:
             print(f"Control server started on port {self.config.control_port}")
             self.logger.info("Control endpoints available on port %s", self.config.control_port)
 
+        try:
+            get_fleet().register(self)
+        except ValueError as exc:
+            self.logger.error(f"Not reachable through /bulk: {exc}")
         print("Bot servers are ready")
 
         # Check for configuration before starting trading
@@ -244,6 +525,7 @@ class UniversalBot:
             self._wait_for_configuration()
 
         if self._stop_requested:
+            get_fleet().unregister(self)
             return
 
         print("Bot is now ready for trading")
@@ -252,6 +534,9 @@ class UniversalBot:
         print(">>>>>>>>> RUN COMPLETED")
         print()
 
+        # Memory/DB position checks run off the trading loop
+        self._reconciler.start()
+
         print(">>>>>>>>> ENTERING INFINITE LOOP")
         cycle_count = 0
 
@@ -260,17 +545,6 @@ class UniversalBot:
                 cycle_count += 1
                 print(f"Loop cycle #{cycle_count} starting...")
 
-                # Debug: Show database portfolio_quantity for easier debugging
-                if self._db_client:
-                    try:
-                        db_portfolio_qty = self._db_client.get_portfolio_quantity()
-                        self.logger.info(f"📊 DB portfolio_quantity: {db_portfolio_qty:.8f} | Memory portfolio: {self.portfolio.quantity:.8f}")
-                    except Exception as e:
-                        self.logger.error(f"❌ Failed to get DB portfolio_quantity: {e}")
-                        self.logger.info(f"📊 DB connection failed | Memory portfolio: {self.portfolio.quantity:.8f}")
-                else:
-                    self.logger.info(f"📊 No DB client | Memory portfolio: {self.portfolio.quantity:.8f}")
-
                 with self._lock:
                     snapshot = self.exchange.fetch_market_snapshot(
                         self.config.symbol,
@@ -330,7 +604,8 @@ class UniversalBot:
 
                         execution = self._apply_signal(signal, snapshot.current_price, snapshot.symbol)
                         if execution:
-                            self.strategy.on_trade(signal, execution.price, execution.size, execution.timestamp)
+                            if not signal.legs:  # legs report through on_leg_filled
+                                self.strategy.on_trade(signal, execution.price, execution.size, execution.timestamp)
                             self._last_execution = execution
 
                     self._last_signal = signal
@@ -371,11 +646,12 @@ class UniversalBot:
                             unrealized_pnl=self._unrealized_pnl,
                             total_pnl=total_pnl,
                             win_rate=win_rate,
-                            total_trades=len(self._trades),
+                            total_trades=len(self._journal),
                             avg_entry_price=self._avg_entry_price
                         )
 
                 self._heartbeat()
+                self._maybe_checkpoint()
 
                 if self._stop_requested:
                     self.logger.info("Stop requested; exiting loop")
@@ -388,14 +664,24 @@ class UniversalBot:
                 print()
 
                 if self.config.sleep_seconds > 0:
-                    print(f"Sleeping for {self.config.sleep_seconds} seconds...")
-                    time.sleep(self.config.sleep_seconds)
-                    print("Sleep completed, starting next cycle...")
+                    print(f"Waiting up to {self.config.sleep_seconds} seconds for next cycle...")
+                    self._wait_for_next_cycle()
                     print()
+
+                    if self._stop_requested:
+                        self.logger.info("Stop requested; exiting loop")
+                        break
+
+                    if self._restart_requested:
+                        self._perform_restart()
         except KeyboardInterrupt:
             self.logger.info("Interrupted by user")
         finally:
             self._running = False
+            get_fleet().unregister(self)
+            self._reconciler.stop()
+            self._save_checkpoint()
+            self._journal.flush()
             self._report_state("stopped", "Bot loop stopped")
             if self._http_server:
                 self._http_server.stop()
@@ -405,6 +691,8 @@ class UniversalBot:
                 self._control_server = None
             if self._db_client:
                 self._db_client.close()
+            self._close_exchange()
+            self.logger.removeHandler(self._log_buffer)
 
     def _perform_restart(self) -> None:
         with self._lock:
@@ -422,10 +710,25 @@ class UniversalBot:
             self._realized_pnl = 0.0
             self._unrealized_pnl = 0.0
             self._avg_entry_price = 0.0
-            self._trades.clear()
+            self._journal.clear()
+            self._metrics.reset()
             self._build_components()
+        self._save_checkpoint()
         self._report_state("running", "Bot restarted")
 
+    def _set_memory_quantity(self, quantity: float) -> None:
+        with self._lock:
+            self.portfolio.quantity = quantity
+            self._checkpoint_dirty = True
+
+    def _on_position_divergence(self, result: ReconcileResult) -> None:
+        if self._db_client:
+            self._db_client.log_event(
+                "warning",
+                f"Position divergence: memory={result.memory_quantity:.8f} db={result.database_quantity:.8f}",
+                metadata={"divergence": result.divergence, "corrected": result.corrected},
+            )
+
     def _current_state(self) -> str:
         if self._stop_requested:
             return "stopping"
@@ -445,7 +748,10 @@ class UniversalBot:
         self._last_price = snapshot.current_price
         self._last_snapshot_at = snapshot.timestamp
         market_value = self.portfolio.quantity * snapshot.current_price
+        if self.strategy is not None:
+            market_value += self.strategy.external_positions_value()
         self._last_portfolio_value = self.portfolio.cash + market_value
+        self._metrics.update_equity(self._last_portfolio_value, at=time.time())
         if self.portfolio.quantity > 0:
             self._unrealized_pnl = (snapshot.current_price - self._avg_entry_price) * self.portfolio.quantity
         else:
@@ -518,9 +824,37 @@ class UniversalBot:
             response["state"] = self._current_state()
 
         self._log_command(command, response["status"], metadata)
+        self._wakeup.notify(WAKE_COMMAND)
         return response
 
+    def _wait_for_next_cycle(self) -> None:
+        """Sleep until the next strategy cycle is due.
+
+        Only a price wakeup (push exchanges notify once per closed bar) brings
+        the cycle forward. Commands and settings are applied by their handlers,
+        so those wakeups run no strategy cycle; they end the wait only to stop
+        or restart the bot.
+        """
+        started = time.monotonic()
+        while True:
+            remaining = started + self.config.sleep_seconds - time.monotonic()
+            if remaining <= 0:
+                return
+            reasons = self._wakeup.wait(remaining)
+            if not reasons:
+                continue
+            print(f"Woken early by: {', '.join(sorted(reasons))}")
+            if WAKE_PRICE in reasons or self._stop_requested or self._restart_requested:
+                return
+
+    def notify_market_update(self, symbol: str) -> None:
+        """Wake the trading loop early when a new bar closes for our symbol."""
+        if symbol == self.config.symbol:
+            self._wakeup.notify(WAKE_PRICE)
+
     def _apply_signal(self, signal: Signal, price: float, symbol: str):
+        if signal.legs:
+            return self._handle_legs(signal)
         if signal.action == "hold" or signal.size <= 0:
             return None
 
@@ -613,24 +947,87 @@ class UniversalBot:
         )
         return execution
 
-    def _record_trade(self, execution: TradeExecution, signal: Signal, realized_pnl: Optional[float]) -> None:
-        trade = {
-            "side": execution.side,
-            "size": execution.size,
-            "price": execution.price,
-            "timestamp": execution.timestamp.isoformat(),
-            "reason": signal.reason,
-        }
+    def _handle_legs(self, signal: Signal):
+        """Execute ``signal.legs`` in order, recording each fill before the next leg is sent.
+
+        A failed leg stops the remaining ones; the fills so far are still recorded,
+        written to the database in one insert and reported to the strategy.
+        """
+        fills: List[Tuple[Leg, TradeExecution]] = []
+        rows: List[Dict[str, Any]] = []
+        try:
+            for leg in signal.legs:
+                size = leg.size
+                if leg.side == "buy" and leg.price > 0:
+                    size = min(size, self.portfolio.cash / leg.price)
+                if size <= 0:
+                    continue
+                try:
+                    execution = self.exchange.execute_trade(leg.symbol, leg.side, size, leg.price)
+                except Exception as exc:  # noqa: BLE001 - keep what already filled
+                    self.logger.error(f"{leg.side.upper()} leg for {leg.symbol} failed, skipping the remaining legs: {exc}")
+                    break
+                notional = execution.size * execution.price
+                self.portfolio.cash += notional if execution.side == "sell" else -notional
+                realized = self.strategy.on_leg_filled(leg, execution)
+                leg_signal = Signal(execution.side, size=execution.size, reason=leg.reason or signal.reason)
+                self._record_trade(execution, leg_signal, realized_pnl=realized, symbol=leg.symbol, log_to_db=False)
+                fills.append((leg, execution))
+                rows.append({
+                    "side": execution.side,
+                    "symbol": leg.symbol,
+                    "amount": execution.size,
+                    "price": execution.price,
+                    "profit": realized,
+                    "exchange": self.config.exchange,
+                    "reasoning": leg_signal.reason,
+                    "strategy": getattr(self.config, 'strategy', 'unknown'),
+                })
+                log_trade_execution(
+                    self.trade_logger,
+                    action=execution.side.upper(),
+                    symbol=leg.symbol,
+                    size=execution.size,
+                    price=execution.price,
+                    reason=leg_signal.reason,
+                    portfolio_value=self.portfolio.cash + self.strategy.external_positions_value(),
+                    pnl=realized if realized is not None else 0.0,
+                )
+        finally:
+            if rows and self._db_client:
+                self._db_client.log_trades(rows)
+            if fills:
+                self.strategy.on_legs_finished(fills)
+        return fills[-1][1] if fills else None
+
+    def _record_trade(
+        self,
+        execution: TradeExecution,
+        signal: Signal,
+        realized_pnl: Optional[float],
+        *,
+        symbol: Optional[str] = None,
+        log_to_db: bool = True,
+    ) -> None:
+        self._journal.append(
+            timestamp=execution.timestamp,
+            side=execution.side,
+            size=execution.size,
+            price=execution.price,
+            realized_pnl=realized_pnl,
+            reason=signal.reason,
+            symbol=symbol or self.config.symbol,
+        )
         if realized_pnl is not None:
-            trade["realized_pnl"] = realized_pnl
-        self._trades.append(trade)
-        if self._db_client:
+            self._metrics.record_trade(realized_pnl)
+        self._checkpoint_dirty = True
+        if self._db_client and log_to_db:
             self._db_client.log_trade(
                 side=execution.side,
                 amount=execution.size,
                 price=execution.price,
                 profit=realized_pnl,
-                symbol=self.config.symbol,
+                symbol=symbol or self.config.symbol,
                 exchange=self.config.exchange,
                 reasoning=signal.reason,
                 strategy=getattr(self.config, 'strategy', 'unknown'),
@@ -642,6 +1039,14 @@ class UniversalBot:
 
 
     def apply_settings(self, updates: Dict[str, object]) -> None:
+        try:
+            self._apply_settings_locked(updates)
+            self._warm_up_strategy()
+        finally:
+            if updates:
+                self._wakeup.notify(WAKE_SETTINGS)
+
+    def _apply_settings_locked(self, updates: Dict[str, object]) -> None:
         with self._lock:
             if not updates:
                 return
@@ -659,8 +1064,11 @@ class UniversalBot:
                 print(f"⚠️ Could not create configuration flag: {e}")
 
             previous_exchange = self.config.exchange
+            previous_exchange_params = dict(self.config.exchange_params)
             previous_strategy = self.config.strategy
+            previous_strategy_params = dict(self.config.strategy_params)
             previous_symbol = self.config.symbol
+            previous_starting_cash = self.config.starting_cash
             previous_port = self.config.http_port
             previous_control_port = self.config.control_port
             previous_secret = self.config.bot_secret
@@ -673,96 +1081,21 @@ class UniversalBot:
 
             if "config" in updates and isinstance(updates["config"], dict):
                 dashboard_config = updates["config"]
-                universal_updates: Dict[str, Any] = {}
-
-                def has_value(value: Any) -> bool:
-                    return value not in (None, "", [])
-
-                strategy_override = dashboard_config.get("botStrategy") or dashboard_config.get("strategy")
-                if has_value(strategy_override):
-                    universal_updates["strategy"] = str(strategy_override).lower()
-
-                strategy_candidate = strategy_override or self.config.strategy
-                strategy_key = str(strategy_candidate).lower() if strategy_candidate else ""
-                env_vars: Dict[str, str] = {}
-
-                if has_value(strategy_override) and strategy_key not in STRATEGY_MAPPINGS:
-                    raise ValueError(f"Unsupported strategy: {strategy_key}")
-
-                if strategy_key in STRATEGY_MAPPINGS:
-                    validate_dashboard_settings(strategy_key, dashboard_config)
-                    env_vars = map_dashboard_to_env_vars(strategy_key, dashboard_config)
+                settings = apply_dashboard_settings(dashboard_config, self.config)
+                universal_updates = settings.updates
+                env_vars = settings.env_vars
 
                 self._last_applied_env_vars = env_vars
                 env_keys_display = "none" if not env_vars else ", ".join(sorted(env_vars))
-                strategy_label = strategy_key or self.config.strategy
+                strategy_label = settings.strategy or self.config.strategy
                 self.logger.info(
                     "Validated dashboard settings for strategy=%s (env vars: %s)",
                     strategy_label,
                     env_keys_display,
                 )
 
-                if has_value(dashboard_config.get("cryptoSymbol")):
-                    universal_updates["symbol"] = str(dashboard_config["cryptoSymbol"]).replace('/', '-')
-                if has_value(dashboard_config.get("botSymbol")):
-                    universal_updates["symbol"] = str(dashboard_config["botSymbol"]).replace('/', '-')
-
-                for cash_key in ("tradeAmount", "botStartingCash"):
-                    if has_value(dashboard_config.get(cash_key)):
-                        coerced_cash = self._coerce_dashboard_value(dashboard_config[cash_key])
-                        if isinstance(coerced_cash, (int, float)):
-                            universal_updates["starting_cash"] = float(coerced_cash)
-
-                if has_value(dashboard_config.get("botSleep")):
-                    coerced_sleep = self._coerce_dashboard_value(dashboard_config["botSleep"])
-                    if isinstance(coerced_sleep, (int, float)):
-                        universal_updates["sleep_seconds"] = float(coerced_sleep)
-
-                if has_value(dashboard_config.get("botExchange")):
-                    universal_updates["exchange"] = str(dashboard_config["botExchange"])
-
-                exchange_params = dict(self.config.exchange_params)
-                if has_value(dashboard_config.get("coinbaseApiKey")):
-                    exchange_params["api_key"] = str(dashboard_config["coinbaseApiKey"])
-                if has_value(dashboard_config.get("coinbaseSecret")):
-                    exchange_params["api_secret"] = str(dashboard_config["coinbaseSecret"])
-                if exchange_params != self.config.exchange_params:
-                    universal_updates["exchange_params"] = exchange_params
-
-                strategy_params = dict(self.config.strategy_params)
-                strategy_mappings = {
-                    "rsiBuyThreshold": "rsi_buy_threshold",
-                    "rsiSellThreshold": "rsi_sell_threshold",
-                    "maxTradesPerHour": "max_trades_per_hour",
-                    "maxTradesPerDay": "max_trades_per_day",
-                    "maxHoldings": "max_holdings",
-                    "swingWindow": "swing_window",
-                    "swingDiffThreshold": "swing_diff_threshold",
-                    "sellPercentage": "sell_percentage",
-                    "trailingProfitThreshold": "trailing_profit_threshold",
-                }
-                int_pref_keys = {"swingWindow", "maxTradesPerHour", "maxTradesPerDay"}
-
-                for dashboard_key, universal_key in strategy_mappings.items():
-                    if not has_value(dashboard_config.get(dashboard_key)):
-                        continue
-                    prefer_int = dashboard_key in int_pref_keys
-                    coerced_value = self._coerce_dashboard_value(dashboard_config[dashboard_key], prefer_int=prefer_int)
-                    if coerced_value is None:
-                        continue
-                    if prefer_int and isinstance(coerced_value, float):
-                        coerced_value = int(coerced_value)
-                    strategy_params[universal_key] = coerced_value
-
-                strategy_params = self._apply_strategy_specific_params(strategy_key, dashboard_config, strategy_params)
-
-                if "checkInterval" in dashboard_config and has_value(dashboard_config["checkInterval"]):
-                    interval_value = self._coerce_dashboard_value(dashboard_config["checkInterval"], prefer_int=True)
-                    if isinstance(interval_value, (int, float)):
-                        universal_updates["sleep_seconds"] = int(interval_value) * 60
-
-                if strategy_params != self.config.strategy_params:
-                    universal_updates["strategy_params"] = strategy_params
+                if "strategy_params" in universal_updates:
+                    strategy_params = universal_updates["strategy_params"]
                     params_display = "none" if not strategy_params else ", ".join(sorted(strategy_params))
                     self.logger.info(
                         "Strategy parameters mapped for %s: %s",
@@ -770,8 +1103,8 @@ class UniversalBot:
                         params_display,
                     )
 
-                if "isEnabled" in dashboard_config:
-                    enabled = bool(dashboard_config["isEnabled"])
+                if settings.enabled is not None:
+                    enabled = settings.enabled
                     if not enabled and not self._paused:
                         self._paused = True
                         self._report_state("paused", "Paused via settings")
@@ -786,11 +1119,15 @@ class UniversalBot:
                 applied_keys = set(updates.keys())
                 self._last_applied_env_vars = {}
 
-            if previous_port != self.config.http_port and self._http_server:
-                self._http_server.stop()
-                self._http_server = BotHTTPServer(self, port=self.config.http_port)
+            serves_control = getattr(self._http_server, "serves_control", False)
+            if self._http_server and previous_port != self.config.http_port:
+                # Start the new port first; stopping the old server still answers this request.
+                old_server, self._http_server = self._http_server, self._new_http_server()
                 self._http_server.start()
+                old_server.stop()
                 self.logger.info("HTTP endpoints moved to port %s", self.config.http_port)
+            elif serves_control and previous_secret != self.config.bot_secret:
+                self._http_server.bot_secret = self.config.bot_secret  # no restart, no dropped response
 
             if (previous_control_port != self.config.control_port or previous_secret != self.config.bot_secret) and self._control_server:
                 self._control_server.stop()
@@ -802,17 +1139,37 @@ class UniversalBot:
                 self._control_server.start()
                 self.logger.info("Control endpoints moved to port %s", self.config.control_port)
 
-            if previous_exchange != self.config.exchange or previous_strategy != self.config.strategy or previous_symbol != self.config.symbol or "exchange_params" in applied_keys or "strategy_params" in applied_keys:
+            exchange_changed = (
+                previous_exchange != self.config.exchange
+                or previous_exchange_params != self.config.exchange_params
+            )
+            strategy_changed = previous_strategy != self.config.strategy or previous_symbol != self.config.symbol
+            missing = object()
+            param_changes = {
+                key: value
+                for key, value in self.config.strategy_params.items()
+                if previous_strategy_params.get(key, missing) != value
+            }
+            removed_params = set(previous_strategy_params) - set(self.config.strategy_params)
+            starting_cash_changed = previous_starting_cash != self.config.starting_cash
+            if exchange_changed or strategy_changed or param_changes or removed_params or starting_cash_changed:
                 self.logger.info(
-                    "Rebuilding components (exchange: %s->%s, strategy: %s->%s, symbol: %s->%s)",
+                    "Reloading components (exchange: %s->%s, strategy: %s->%s, symbol: %s->%s, params: %s)",
                     previous_exchange,
                     self.config.exchange,
                     previous_strategy,
                     self.config.strategy,
                     previous_symbol,
                     self.config.symbol,
+                    ", ".join(sorted(set(param_changes) | removed_params)) or "none",
+                )
+                self._reload_components(
+                    exchange_changed=exchange_changed,
+                    strategy_changed=strategy_changed,
+                    param_changes=param_changes,
+                    previous_params=previous_strategy_params,
+                    starting_cash_changed=starting_cash_changed,
                 )
-                self._build_components()
 
             if "starting_cash" in applied_keys:
                 self.portfolio.cash = float(self.config.starting_cash)
@@ -840,80 +1197,6 @@ class UniversalBot:
                 )
 
 
-    def _apply_strategy_specific_params(
-        self,
-        strategy: str,
-        dashboard_config: Dict[str, Any],
-        current_params: Dict[str, Any],
-    ) -> Dict[str, Any]:
-        params = dict(current_params)
-
-        def set_param(param_key: str, dashboard_key: str, *, prefer_int: bool = False) -> None:
-            if dashboard_key not in dashboard_config:
-                return
-            value = dashboard_config[dashboard_key]
-            if value in (None, ""):
-                return
-            coerced = self._coerce_dashboard_value(value, prefer_int=prefer_int)
-            if coerced is None:
-                return
-            params[param_key] = coerced
-
-        normalized = (strategy or "").lower()
-
-        if normalized in {"grid", "advanced_grid"}:
-            set_param("amount", "amount")
-            set_param("grid_size", "gridSize")
-            set_param("grid_count", "gridCount", prefer_int=True)
-            set_param("max_orders", "maxOrders", prefer_int=True)
-        elif normalized in {"dca", "advanced_dca"}:
-            set_param("base_amount", "baseAmount")
-            set_param("interval_minutes", "intervalMinutes", prefer_int=True)
-        elif normalized in {"momentum", "advanced_momentum"}:
-            set_param("base_amount", "baseAmount")
-            set_param("momentum_threshold", "momentumThreshold")
-            set_param("momentum_period", "momentumPeriod", prefer_int=True)
-            set_param("volume_threshold", "volumeThreshold")
-        elif normalized in {"scalping", "advanced_scalping"}:
-            set_param("trade_amount", "tradeAmount")
-            set_param("scalp_target", "scalpTarget")
-
-            # Filter parameters (gates & scoring)
-            set_param("buy_threshold", "buyThreshold")
-            set_param("short_ma_period", "shortMaPeriod", prefer_int=True)
-            set_param("long_ma_period", "longMaPeriod", prefer_int=True)
-            set_param("rsi_threshold", "rsiThreshold")
-            set_param("rsi_min", "rsiMin")
-            set_param("rsi_max", "rsiMax")
-            set_param("enable_volume_confirmation", "enableVolumeConfirmation")
-            set_param("volume_threshold", "volumeThreshold")
-
-        return params
-
-    def _coerce_dashboard_value(self, value: Any, *, prefer_int: bool = False) -> Any:
-        if isinstance(value, (int, float)):
-            return int(value) if prefer_int else value
-        if isinstance(value, str):
-            candidate = value.strip()
-            if not candidate:
-                return None
-            if prefer_int:
-                try:
-                    return int(candidate)
-                except ValueError:
-                    try:
-                        return int(float(candidate))
-                    except ValueError:
-                        return candidate
-            try:
-                return int(candidate)
-            except ValueError:
-                try:
-                    return float(candidate)
-                except ValueError:
-                    return candidate
-        return value
-
     def get_settings(self) -> Dict[str, object]:
         with self._lock:
             data = self.config.to_dict()
@@ -1007,6 +1290,8 @@ class UniversalBot:
         }
 
     def get_status(self) -> Dict[str, object]:
+        rate_limits = get_rate_limiter().snapshot()
+        price_cache = get_price_cache().stats()
         with self._lock:
             latest_price = self._last_price
             portfolio_value = self._last_portfolio_value
@@ -1029,6 +1314,9 @@ class UniversalBot:
                 "user_id": self.config.user_id,
                 "last_signal": self._format_signal(self._last_signal),
                 "last_execution": self._format_execution(self._last_execution),
+                "rate_limits": rate_limits,
+                "price_cache": price_cache,
+                "reconciliation": self._reconciler.snapshot(),
             }
 
     def get_performance(self) -> Dict[str, Any]:
@@ -1037,6 +1325,8 @@ class UniversalBot:
             quantity = self.portfolio.quantity
             cash = self.portfolio.cash
             market_value = quantity * current_price
+            if self.strategy is not None:
+                market_value += self.strategy.external_positions_value()
             portfolio_value = cash + market_value
             total_pnl = self._realized_pnl + self._unrealized_pnl
 
@@ -1094,7 +1384,7 @@ class UniversalBot:
                         "total_position_size": round(quantity, 6),
                         "average_entry_price": round(self._avg_entry_price, 2) if quantity > 0 else 0.0,
                         "entryPriceFormatted": format_currency(self._avg_entry_price) if quantity > 0 else "N/A",
-                        "total_orders": len(self._trades),
+                        "total_orders": len(self._journal),
                         "max_orders": 100  # Default max for universal bot
                     },
                     "financial": {
@@ -1117,10 +1407,20 @@ class UniversalBot:
                 # Keep some original fields for backwards compatibility
                 "botInstanceId": self.config.bot_instance_id,
                 "riskLevel": "MEDIUM",  # Default risk level
-                "maxDrawdown": 0.0,     # TODO: Calculate actual max drawdown
-                "sharpeRatio": 0.0      # TODO: Calculate actual Sharpe ratio
+                "maxDrawdown": round(self._metrics.max_drawdown_pct, 2),
+                "sharpeRatio": round(self._metrics.sharpe_ratio, 3),
+                "sortinoRatio": round(self._metrics.sortino_ratio, 3),
+                "metrics": self._metrics.snapshot(),
             }
 
+    def get_trade_history(self, **query: Any) -> Dict[str, Any]:
+        """One page of trade history (see ``HistoryService.trades``)."""
+        return self._history.trades(**query)
+
+    def get_log_history(self, **query: Any) -> Dict[str, Any]:
+        """One page of log history (see ``HistoryService.logs``)."""
+        return self._history.logs(**query)
+
     def get_logs(self) -> Dict[str, Any]:
         """Return recent log messages for dashboard logs page"""
         with self._lock:
@@ -1139,16 +1439,16 @@ class UniversalBot:
                     try:
                         purchase_count = self._db_client.get_buy_trades_count()
                     except:
-                        purchase_count = len([t for t in self._trades if t.get('side') == 'buy'])
+                        purchase_count = self._journal.aggregates()["buys"]
                 else:
-                    purchase_count = len([t for t in self._trades if t.get('side') == 'buy'])
+                    purchase_count = self._journal.aggregates()["buys"]
                 log_lines.append(f"{datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')} | INFO | DCA purchases made: {purchase_count}")
             else:
                 log_lines.append(f"{datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')} | INFO | Current cycle: {self._cycle}")
             log_lines.append(f"{datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')} | INFO | Bot state: {self._current_state()}")
 
             # Add recent trade logs
-            for trade in list(self._trades)[-10:]:  # Last 10 trades
+            for trade in self._journal.recent(10):  # Last 10 trades
                 timestamp = trade.get('timestamp', datetime.utcnow().isoformat())
                 side = trade.get('side', 'unknown')
                 size = trade.get('size', 0)
@@ -1252,20 +1552,8 @@ class UniversalBot:
             return '$'  # Default to USD
 
     def _calculate_win_rate(self) -> float:
-        """Calculate win rate from completed trades with realized P&L."""
-        profitable_trades = 0
-        total_completed_trades = 0
-
-        for trade in self._trades:
-            if 'realized_pnl' in trade:
-                total_completed_trades += 1
-                if trade['realized_pnl'] > 0:
-                    profitable_trades += 1
-
-        if total_completed_trades == 0:
-            return 0.0
-
-        return (profitable_trades / total_completed_trades) * 100
+        """Win rate of closed trades with realized P&L (tracked incrementally)."""
+        return self._metrics.win_rate
 
 
 def main() -> None:
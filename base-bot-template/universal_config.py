@@ -36,6 +36,7 @@ class BotConfig:
     max_cycles: Optional[int] = None
     http_port: int = 8080
     control_port: int = 3010
+    http_server: str = "threaded"  # "threaded" (two ports) or "async" (one asyncio server on http_port)
     strategy_params: Dict[str, Any] = field(default_factory=dict)
     exchange_params: Dict[str, Any] = field(default_factory=dict)
     bot_instance_id: Optional[str] = None
@@ -43,6 +44,12 @@ class BotConfig:
     bot_secret: Optional[str] = None
     base_url: Optional[str] = None
     database_url: Optional[str] = None
+    checkpoint_path: Optional[str] = None  # defaults to /app/state/checkpoint-<bot id>.bin
+    checkpoint_interval: float = 60.0  # seconds between periodic checkpoints (0 = only on trades/shutdown)
+    trade_journal_dir: Optional[str] = None  # defaults to /app/state/journal-<bot id>
+    reconcile_interval: float = 300.0  # seconds between memory/DB position checks (0 = disabled)
+    reconcile_tolerance: float = 1e-8
+    reconcile_auto_correct: str = "off"  # "off", "database" (trust memory) or "memory" (trust DB)
 
     @classmethod
     def load(cls, path: Optional[str] = None) -> "BotConfig":
@@ -71,12 +78,19 @@ class BotConfig:
             "BOT_MAX_CYCLES": ("max_cycles", _to_int),
             "BOT_HTTP_PORT": ("http_port", _to_int),
             "BOT_CONTROL_PORT": ("control_port", _to_int),
+            "BOT_HTTP_SERVER": ("http_server", str),
             "BOT_INSTANCE_ID": ("bot_instance_id", str),
             "USER_ID": ("user_id", str),
             "BOT_SECRET": ("bot_secret", str),
             "BASE_URL": ("base_url", str),
             "POSTGRES_URL": ("database_url", str),
             "DATABASE_URL": ("database_url", str),
+            "BOT_CHECKPOINT_PATH": ("checkpoint_path", str),
+            "BOT_CHECKPOINT_INTERVAL": ("checkpoint_interval", _to_float),
+            "BOT_TRADE_JOURNAL_DIR": ("trade_journal_dir", str),
+            "BOT_RECONCILE_INTERVAL": ("reconcile_interval", _to_float),
+            "BOT_RECONCILE_TOLERANCE": ("reconcile_tolerance", _to_float),
+            "BOT_RECONCILE_AUTO_CORRECT": ("reconcile_auto_correct", str),
         }
 
         overrides: Dict[str, Any] = {}
@@ -137,7 +151,11 @@ class BotConfig:
     def update(self, updates: Dict[str, Any]) -> None:
         for key, value in updates.items():
             if key == "strategy_params" and isinstance(value, dict):
-                self.strategy_params.update(value)
+                for name, param in value.items():
+                    if param is None:
+                        self.strategy_params.pop(name, None)  # back to the strategy default
+                    else:
+                        self.strategy_params[name] = param
             elif key == "exchange_params" and isinstance(value, dict):
                 self.exchange_params.update(value)
             elif hasattr(self, key):
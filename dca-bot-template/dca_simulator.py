@@ -0,0 +1,554 @@
+#!/usr/bin/env python3
+"""Fast DCA plan simulator for comparing many plan variants over long histories.
+
+Plain DCA is evaluated in closed form: the buy bars for an interval are found
+once, and every ``base_amount`` sharing that interval reuses them through
+cumulative sums of ``1 / price``. AdvancedDCA runs a small state loop that
+mirrors ``AdvancedDcaStrategy.generate_signal``/``on_trade`` bar by bar; the
+rolling volatility and reference high it needs depend only on
+``volatility_window`` and are precomputed once per window.
+
+numpy makes the closed form and precomputation vectorised, and numba (when
+installed) compiles the AdvancedDCA loop and runs plans in parallel. Without
+either the same code runs in pure Python, just slower.
+
+Usage::
+
+    python dca_simulator.py prices.csv --interval-minutes 60 240 1440 --base-amount 25 50 100
+    python dca_simulator.py prices.csv --advanced --base-drop-pct 1.5 2.5 4 --take-profit-pct 4 6 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import itertools
+import math
+import sys
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, fields
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:  # pragma: no cover - optional dependency
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+try:  # pragma: no cover - optional dependency
+    import numba
+except ImportError:  # pragma: no cover - optional dependency
+    numba = None
+
+
+@dataclass(frozen=True)
+class DcaPlan:
+    """Parameters of ``DcaStrategy``."""
+
+    interval_minutes: int = 60
+    base_amount: float = 50.0
+
+
+@dataclass(frozen=True)
+class AdvancedDcaPlan:
+    """Parameters of ``AdvancedDcaStrategy`` (same defaults and clamps)."""
+
+    base_amount: float = 50.0
+    max_positions: int = 10
+    min_minutes_between_buys: int = 60
+    base_drop_pct: float = 2.5
+    volatility_window: int = 30
+    volatility_factor: float = 2.0
+    scale_factor: float = 1.5
+    take_profit_pct: float = 6.0
+    trailing_stop_pct: float = 3.0
+    drawdown_pause_pct: float = 15.0
+    max_daily_buys: int = 4
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "min_minutes_between_buys", max(1, int(self.min_minutes_between_buys)))
+        object.__setattr__(self, "base_drop_pct", max(0.1, float(self.base_drop_pct)))
+        object.__setattr__(self, "volatility_window", max(5, int(self.volatility_window)))
+
+
+@dataclass
+class SimulationResult:
+    plan: Any
+    final_equity: float
+    return_pct: float
+    max_drawdown_pct: float
+    invested: float
+    quantity: float
+    cash: float
+    buys: int
+    sells: int
+    equity: Sequence[float]  # one point every ``sample_every`` bars
+
+    @property
+    def average_cost(self) -> Optional[float]:
+        return self.invested / self.quantity if self.quantity > 0 and self.sells == 0 else None
+
+    def summary(self) -> Dict[str, Any]:
+        data = {key: value for key, value in asdict(self).items() if key != "equity"}
+        data["plan"] = asdict(self.plan)
+        return data
+
+
+def plan_grid(plan_type, **choices: Sequence[Any]) -> List[Any]:
+    """Cartesian product of parameter choices, e.g. ``plan_grid(DcaPlan, base_amount=[25, 50])``."""
+    names = list(choices)
+    return [plan_type(**dict(zip(names, combo))) for combo in itertools.product(*(choices[n] for n in names))]
+
+
+def load_prices_csv(path: str) -> Tuple[List[float], List[float]]:
+    """Read ``(times, closes)`` from a CSV with a time column and a close/price column.
+
+    Times may be epoch seconds or ISO 8601 strings; rows are sorted by time.
+    """
+    with open(path, newline="") as handle:
+        reader = csv.DictReader(handle)
+        columns = {name.lower(): name for name in reader.fieldnames or ()}
+        time_key = next((columns[k] for k in ("timestamp", "time", "date", "datetime") if k in columns), None)
+        price_key = next((columns[k] for k in ("close", "price") if k in columns), None)
+        if time_key is None or price_key is None:
+            raise ValueError(f"{path} needs a timestamp/time/date column and a close/price column")
+        rows = []
+        for row in reader:
+            raw_time = row[time_key]
+            try:
+                stamp = float(raw_time)
+            except ValueError:
+                parsed = datetime.fromisoformat(raw_time.replace("Z", "+00:00"))
+                if parsed.tzinfo is None:
+                    parsed = parsed.replace(tzinfo=timezone.utc)
+                stamp = parsed.timestamp()
+            rows.append((stamp, float(row[price_key])))
+    rows.sort()
+    return [t for t, _ in rows], [p for _, p in rows]
+
+
+# --- plain DCA ---------------------------------------------------------------
+
+
+def _buy_bars(times: Sequence[float], interval_seconds: float) -> List[int]:
+    """Bars where a scheduled buy fires: the first bar, then the first bar >= last buy + interval."""
+    bars: List[int] = []
+    n = len(times)
+    index = 0
+    while index < n:
+        bars.append(index)
+        target = times[index] + interval_seconds
+        if np is not None:
+            index = int(np.searchsorted(times, target, side="left"))
+        else:
+            index = bisect_left(times, target, index + 1)
+    return bars
+
+
+def _max_drawdown(equity: Sequence[float]) -> float:
+    if np is not None:
+        curve = np.asarray(equity, dtype=float)
+        if not len(curve):
+            return 0.0
+        peaks = np.maximum.accumulate(curve)
+        return float(((peaks - curve) / np.where(peaks > 0, peaks, 1.0)).max() * 100)
+    peak = worst = 0.0
+    for value in equity:
+        peak = max(peak, value)
+        if peak > 0:
+            worst = max(worst, (peak - value) / peak * 100)
+    return worst
+
+
+def simulate_dca(
+    times: Sequence[float],
+    prices: Sequence[float],
+    plans: Sequence[DcaPlan],
+    *,
+    starting_cash: float = 10000.0,
+    sample_every: int = 1,
+) -> List[SimulationResult]:
+    """Evaluate plain DCA plans in closed form over one price series."""
+    if np is not None:
+        times_arr = np.asarray(times, dtype=float)
+        prices_arr = np.asarray(prices, dtype=float)
+    else:
+        times_arr, prices_arr = list(times), list(prices)
+    bar_index = np.arange(len(prices_arr)) if np is not None else None
+    by_interval: Dict[int, Tuple[Any, Any]] = {}
+    results = []
+    for plan in plans:
+        interval = max(1, int(plan.interval_minutes))
+        if interval not in by_interval:
+            bars = _buy_bars(times_arr, interval * 60.0)
+            if np is not None:
+                bars_arr = np.asarray(bars, dtype=np.int64)
+                # Number of buys that have happened by each bar.
+                by_interval[interval] = (bars_arr, np.searchsorted(bars_arr, bar_index, side="right"))
+            else:
+                by_interval[interval] = (bars, None)
+        bars, buys_by_bar = by_interval[interval]
+        if np is not None:
+            results.append(_dca_closed_form(plan, bars, buys_by_bar, prices_arr, starting_cash, sample_every))
+        else:
+            results.append(_dca_python(plan, bars, prices_arr, starting_cash, sample_every))
+    return results
+
+
+def _dca_closed_form(plan, bars, buys_by_bar, prices, starting_cash, sample_every) -> SimulationResult:
+    base = float(plan.base_amount)
+    # Every buy spends ``min(base, cash left)`` until the cash runs out.
+    spend = np.clip(starting_cash - base * np.arange(len(bars)), 0.0, base) if base > 0 else np.zeros(len(bars))
+    executed = spend > 0
+    spend = spend[executed]
+    bought = spend / prices[bars[executed]]
+    cum_spend = np.concatenate(([0.0], np.cumsum(spend)))
+    cum_qty = np.concatenate(([0.0], np.cumsum(bought)))
+    done = np.minimum(buys_by_bar, len(spend))
+    equity = starting_cash - cum_spend[done] + cum_qty[done] * prices
+    return _result(plan, equity, starting_cash, float(cum_spend[-1]), float(cum_qty[-1]), len(spend), 0, sample_every)
+
+
+def _dca_python(plan, bars, prices, starting_cash, sample_every) -> SimulationResult:
+    base = float(plan.base_amount)
+    cash, quantity, buys = starting_cash, 0.0, 0
+    buy_bars = set(bars)
+    equity = []
+    for index, price in enumerate(prices):
+        if index in buy_bars and price > 0:
+            notional = min(base, cash)
+            if notional > 0:
+                cash -= notional
+                quantity += notional / price
+                buys += 1
+        equity.append(cash + quantity * price)
+    return _result(plan, equity, starting_cash, starting_cash - cash, quantity, buys, 0, sample_every)
+
+
+def _result(plan, equity, starting_cash, invested, quantity, buys, sells, sample_every) -> SimulationResult:
+    final = float(equity[-1]) if len(equity) else starting_cash
+    return SimulationResult(
+        plan=plan,
+        final_equity=final,
+        return_pct=(final - starting_cash) / starting_cash * 100 if starting_cash else 0.0,
+        max_drawdown_pct=_max_drawdown(equity),
+        invested=invested,
+        quantity=quantity,
+        cash=starting_cash - invested,
+        buys=buys,
+        sells=sells,
+        equity=equity[::max(1, sample_every)],
+    )
+
+
+# --- AdvancedDCA -------------------------------------------------------------
+
+# Layout of the per-plan parameter row passed to the state loop.
+_P_BASE, _P_MAX_POS, _P_MIN_MINUTES, _P_DROP, _P_VOL_FACTOR, _P_SCALE, _P_TP, _P_TRAIL, _P_DD, _P_DAILY = range(10)
+# Layout of the per-plan statistics row filled in by the state loop.
+_S_CASH, _S_QTY, _S_INVESTED, _S_BUYS, _S_SELLS, _S_MAX_DD = range(6)
+
+
+def _rolling_inputs(prices, window: int):
+    """Per-bar population stdev of the last ``window - 1`` returns (NaN before the
+    window fills) and the reference high used when there are no open entries.
+
+    Like the live strategy, returns from a non-positive close are skipped and the
+    stdev is 0 with fewer than two usable returns."""
+    n = len(prices)
+    if np is not None:
+        p = np.asarray(prices, dtype=float)
+        vol = np.full(n, np.nan)
+        ref_high = np.maximum.accumulate(p) if n else p.copy()
+        if n >= window:
+            previous = p[:-1]
+            usable = previous > 0
+            returns = np.where(usable, np.diff(p) / np.where(usable, previous, 1.0), 0.0)
+            s1 = np.concatenate(([0.0], np.cumsum(returns)))
+            s2 = np.concatenate(([0.0], np.cumsum(returns * returns)))
+            s0 = np.concatenate(([0], np.cumsum(usable)))
+            span = window - 1
+            ends = np.arange(window - 1, n)
+            count = s0[ends] - s0[ends - span]
+            divisor = np.maximum(count, 1)
+            mean = (s1[ends] - s1[ends - span]) / divisor
+            var = (s2[ends] - s2[ends - span]) / divisor - mean * mean
+            vol[window - 1:] = np.where(count > 1, np.sqrt(np.maximum(var, 0.0)), 0.0)
+            ref_high[window - 1:] = np.lib.stride_tricks.sliding_window_view(p, window).max(axis=1)
+        return vol, ref_high
+    vol = [math.nan] * n
+    ref_high = [0.0] * n
+    running = 0.0
+    for i in range(n):
+        if i >= window - 1:
+            win = prices[i - window + 1:i + 1]
+            rets = [(c - q) / q for q, c in zip(win, win[1:]) if q > 0]
+            if len(rets) > 1:
+                mean = sum(rets) / len(rets)
+                vol[i] = math.sqrt(sum((r - mean) ** 2 for r in rets) / len(rets))
+            else:
+                vol[i] = 0.0
+            ref_high[i] = max(win)
+        else:
+            running = max(running, prices[i])
+            ref_high[i] = running
+    return vol, ref_high
+
+
+def _advanced_run(prices, minutes, days, vol, ref_high, params, starting_cash, sample_every, equity_out, stats_out):
+    """Bar-by-bar replica of AdvancedDcaStrategy for one plan (numba-compilable)."""
+    base_amount = params[_P_BASE]
+    max_positions = int(params[_P_MAX_POS])
+    min_minutes = params[_P_MIN_MINUTES]
+    base_drop = params[_P_DROP]
+    vol_factor = params[_P_VOL_FACTOR]
+    scale_factor = params[_P_SCALE]
+    take_profit = params[_P_TP]
+    trailing_stop = params[_P_TRAIL]
+    drawdown_pause = params[_P_DD]
+    max_daily = int(params[_P_DAILY])
+
+    cash = starting_cash
+    quantity = 0.0
+    invested = 0.0
+    buys = 0
+    sells = 0
+    entries = 0
+    last_entry = 0.0
+    high_entry = 0.0
+    total_size = 0.0
+    total_cost = 0.0
+    trailing_high = math.nan
+    last_buy = math.nan
+    day = -1.0
+    day_buys = 0
+    peak = 0.0
+    max_dd = 0.0
+
+    for i in range(len(prices)):
+        price = prices[i]
+        action = 0  # 0 hold, 1 buy, -1 sell
+        size = 0.0
+
+        paused = False
+        if entries > 0 and drawdown_pause > 0:
+            paused = (high_entry - price) / high_entry * 100 >= drawdown_pause
+        if not paused:
+            if quantity > 0 and entries > 0 and take_profit > 0 and total_size > 0:
+                avg_entry = total_cost / total_size
+                gain = (price - avg_entry) / avg_entry * 100
+                if gain >= take_profit:
+                    action, size = -1, min(quantity, total_size)
+                else:
+                    if math.isnan(trailing_high) or price > trailing_high:
+                        trailing_high = price
+                    if trailing_stop > 0 and (trailing_high - price) / trailing_high * 100 >= trailing_stop:
+                        action, size = -1, min(quantity, total_size)
+            if action == 0:
+                can_buy = cash > 0 and entries < max_positions
+                if can_buy and not math.isnan(last_buy) and minutes[i] - last_buy < min_minutes:
+                    can_buy = False
+                if days[i] != day:
+                    day = days[i]
+                    day_buys = 0
+                if can_buy and day_buys >= max_daily:
+                    can_buy = False
+                if can_buy:
+                    threshold = base_drop
+                    if not math.isnan(vol[i]):
+                        threshold = base_drop * (1 + vol_factor * vol[i] * 100)
+                    if entries == 0:
+                        reference = ref_high[i]
+                        drop = base_drop if reference <= 0 else max(base_drop, (reference - price) / reference * 100)
+                    else:
+                        drop = (last_entry - price) / last_entry * 100
+                    if drop >= threshold and price > 0:
+                        notional = min(base_amount, cash)
+                        if notional > 0:
+                            scale = 1.0
+                            if max_positions > 1:
+                                scale = 1.0 + entries * (scale_factor - 1.0) / (max_positions - 1)
+                            size = min(cash, notional * scale) / price
+                            if size > 0:
+                                day_buys += 1
+                                action = 1
+
+        if action == 1:
+            cost = size * price
+            cash -= cost
+            quantity += size
+            invested += cost
+            buys += 1
+            entries += 1
+            last_entry = price
+            high_entry = price if entries == 1 else max(high_entry, price)
+            total_size += size
+            total_cost += cost
+            if math.isnan(trailing_high) or price > trailing_high:
+                trailing_high = price
+            last_buy = minutes[i]
+        elif action == -1 and size > 0:
+            cash += size * price
+            quantity -= size
+            sells += 1
+            entries = 0
+            total_size = 0.0
+            total_cost = 0.0
+            trailing_high = price
+
+        equity = cash + quantity * price
+        if equity > peak:
+            peak = equity
+        if peak > 0 and (peak - equity) / peak * 100 > max_dd:
+            max_dd = (peak - equity) / peak * 100
+        if i % sample_every == 0:
+            equity_out[i // sample_every] = equity
+
+    stats_out[_S_CASH] = cash
+    stats_out[_S_QTY] = quantity
+    stats_out[_S_INVESTED] = invested
+    stats_out[_S_BUYS] = buys
+    stats_out[_S_SELLS] = sells
+    stats_out[_S_MAX_DD] = max_dd
+
+
+def _advanced_batch(prices, minutes, days, vol, ref_high, params, starting_cash, sample_every, equity, stats):
+    for p in range(len(params)):
+        _advanced_run(prices, minutes, days, vol, ref_high, params[p], starting_cash, sample_every, equity[p], stats[p])
+
+
+if numba is not None and np is not None:  # pragma: no cover - optional dependency
+    _advanced_run = numba.njit(cache=True)(_advanced_run)
+
+    @numba.njit(cache=True, parallel=True)
+    def _advanced_batch(prices, minutes, days, vol, ref_high, params, starting_cash, sample_every, equity, stats):
+        for p in numba.prange(params.shape[0]):
+            _advanced_run(prices, minutes, days, vol, ref_high, params[p], starting_cash, sample_every, equity[p], stats[p])
+
+
+def _plan_params(plan: AdvancedDcaPlan) -> List[float]:
+    return [
+        plan.base_amount, plan.max_positions, plan.min_minutes_between_buys, plan.base_drop_pct,
+        plan.volatility_factor, plan.scale_factor, plan.take_profit_pct, plan.trailing_stop_pct,
+        plan.drawdown_pause_pct, plan.max_daily_buys,
+    ]
+
+
+def _run_group(args) -> Tuple[Any, Any]:
+    """Run all plans sharing one volatility window; returns (equity rows, stats rows)."""
+    prices, minutes, days, window, params, starting_cash, sample_every = args
+    vol, ref_high = _rolling_inputs(prices, window)
+    samples = (len(prices) + sample_every - 1) // sample_every
+    if np is not None:
+        params = np.asarray(params, dtype=float)
+        equity = np.zeros((len(params), samples))
+        stats = np.zeros((len(params), 6))
+    else:
+        equity = [[0.0] * samples for _ in params]
+        stats = [[0.0] * 6 for _ in params]
+    _advanced_batch(prices, minutes, days, vol, ref_high, params, starting_cash, sample_every, equity, stats)
+    return equity, stats
+
+
+def simulate_advanced_dca(
+    times: Sequence[float],
+    prices: Sequence[float],
+    plans: Sequence[AdvancedDcaPlan],
+    *,
+    starting_cash: float = 10000.0,
+    sample_every: int = 1,
+    workers: Optional[int] = None,
+) -> List[SimulationResult]:
+    """Run AdvancedDCA plans; with numba they run in parallel threads, otherwise
+    plan groups can be spread over ``workers`` processes."""
+    sample_every = max(1, sample_every)
+    if np is not None:
+        prices_in = np.asarray(prices, dtype=float)
+        minutes = np.asarray(times, dtype=float) / 60.0
+        days = np.floor(np.asarray(times, dtype=float) / 86400.0)
+    else:
+        prices_in = list(prices)
+        minutes = [t / 60.0 for t in times]
+        days = [math.floor(t / 86400.0) for t in times]
+
+    groups: Dict[int, List[int]] = {}
+    for index, plan in enumerate(plans):
+        groups.setdefault(plan.volatility_window, []).append(index)
+    jobs = [
+        (prices_in, minutes, days, window, [_plan_params(plans[i]) for i in members], starting_cash, sample_every)
+        for window, members in groups.items()
+    ]
+    if workers and workers > 1 and numba is None and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            outputs = list(pool.map(_run_group, jobs))
+    else:
+        outputs = [_run_group(job) for job in jobs]
+
+    results: List[Optional[SimulationResult]] = [None] * len(plans)
+    for members, (equity, stats) in zip(groups.values(), outputs):
+        for row, index in enumerate(members):
+            cash, quantity, invested, buys, sells, max_dd = (float(v) for v in stats[row])
+            final = cash + quantity * float(prices_in[-1]) if len(prices_in) else starting_cash
+            results[index] = SimulationResult(
+                plan=plans[index],
+                final_equity=final,
+                return_pct=(final - starting_cash) / starting_cash * 100 if starting_cash else 0.0,
+                max_drawdown_pct=max_dd,
+                invested=invested,
+                quantity=quantity,
+                cash=cash,
+                buys=int(buys),
+                sells=int(sells),
+                equity=equity[row],
+            )
+    return results  # type: ignore[return-value]
+
+
+# --- CLI ---------------------------------------------------------------------
+
+
+def _parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Compare DCA plans over a historical price series")
+    parser.add_argument("csv", help="CSV with a timestamp/time/date column and a close/price column")
+    parser.add_argument("--advanced", action="store_true", help="Simulate AdvancedDCA instead of plain DCA")
+    parser.add_argument("--starting-cash", type=float, default=10000.0)
+    parser.add_argument("--top", type=int, default=10, help="How many plans to print")
+    parser.add_argument("--workers", type=int, default=None, help="Processes for AdvancedDCA without numba")
+    # Plan fields shared by both plan types get one flag.
+    for name in dict.fromkeys(spec.name for spec in fields(DcaPlan) + fields(AdvancedDcaPlan)):
+        parser.add_argument("--" + name.replace("_", "-"), dest=name, nargs="+", type=float, default=None)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = _parse_args(argv)
+    times, prices = load_prices_csv(args.csv)
+    if not prices:
+        print("No prices found", file=sys.stderr)
+        return 1
+    plan_type = AdvancedDcaPlan if args.advanced else DcaPlan
+    choices = {}
+    for spec in fields(plan_type):
+        values = getattr(args, spec.name)
+        if values is not None:
+            choices[spec.name] = [int(v) if spec.type in ("int", int) else v for v in values]
+    plans = plan_grid(plan_type, **choices) or [plan_type()]
+
+    started = datetime.now()
+    if args.advanced:
+        results = simulate_advanced_dca(times, prices, plans, starting_cash=args.starting_cash, workers=args.workers)
+    else:
+        results = simulate_dca(times, prices, plans, starting_cash=args.starting_cash)
+    elapsed = (datetime.now() - started).total_seconds()
+
+    print(f"Simulated {len(plans)} plan(s) over {len(prices)} bars in {elapsed:.2f}s "
+          f"(numpy={'yes' if np is not None else 'no'}, numba={'yes' if numba is not None else 'no'})")
+    for result in sorted(results, key=lambda r: r.final_equity, reverse=True)[:args.top]:
+        print(f"  return={result.return_pct:+8.2f}%  max_dd={result.max_drawdown_pct:6.2f}%  "
+              f"buys={result.buys:5d}  sells={result.sells:4d}  {asdict(result.plan)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,8 +9,8 @@ from __future__ import annotations
 
 from datetime import datetime, timedelta, timezone
 from zoneinfo import ZoneInfo
-from statistics import pstdev
-from typing import Any, Deque, Dict, Optional
+import math
+from typing import Any, Deque, Dict, List, Optional, Tuple
 from collections import deque
 import logging
 
@@ -26,8 +26,8 @@ if not os.path.exists(base_path):
 
 sys.path.insert(0, base_path)
 
-from strategy_interface import BaseStrategy, Signal, register_strategy
-from exchange_interface import MarketSnapshot
+from strategy_interface import BaseStrategy, Leg, Signal, register_strategy
+from exchange_interface import MarketSnapshot, TradeExecution, fetch_market_snapshots
 
 
 # ----------------------------- DCA-only helpers -----------------------------
@@ -49,6 +49,11 @@ def _as_bool(val, default: bool = False) -> bool:
     return s in ("1", "true", "yes", "on")
 
 
+# Last purchase / total spent per bot, kept for the life of the process so a
+# strategy rebuilt after a settings change does not query the database again.
+_DCA_STATE_CACHE: Dict[str, Dict[str, Any]] = {}
+
+
 # --------------------------------- DCA --------------------------------------
 
 class DcaStrategy(BaseStrategy):
@@ -61,6 +66,8 @@ class DcaStrategy(BaseStrategy):
         [DCA/CYCLE], [DCA/DECISION], [DCA/ACTION], [DCA/TRACE]
     """
 
+    hot_reload_params = frozenset({"base_amount", "interval_minutes"})
+
     def __init__(self, config: Dict[str, Any], exchange):
         super().__init__(config=config, exchange=exchange)
         self.interval_minutes = max(1, int(config.get("interval_minutes", 60)))
@@ -79,11 +86,43 @@ class DcaStrategy(BaseStrategy):
         self._db_client = config.get("db_client")  # DatabaseClient instance
         self._total_spent_cache: Optional[float] = None
 
-        # --- State restoration from database ---
-        self._restore_last_purchase_from_db()
+        # Filled by set_state (checkpoint) before prepare(); the database is only
+        # consulted in prepare() when neither the checkpoint nor the cache had state.
+        self._state_restored = False
+
+    def prepare(self) -> None:
+        if self._state_restored:
+            self._log_local("STATE", "Restored from checkpoint - skipping database lookup")
+        elif self._state_key() is not None and self._state_key() in _DCA_STATE_CACHE:
+            self._apply_state(_DCA_STATE_CACHE[self._state_key()])
+            self._log_local("STATE", "Restored from in-process state cache - skipping database lookup")
+        else:
+            # Cold start: nothing local to go on.
+            self._restore_last_purchase_from_db()
+        self._remember_state()
 
     # --------------------------- state restoration utils ---------------------------
 
+    def _state_key(self) -> Optional[str]:
+        """Per-bot key into the in-process state cache; None (no caching) without a bot id."""
+        bot_id = self.config.get("bot_instance_id") or getattr(self._db_client, "bot_instance_id", None)
+        return str(bot_id) if bot_id else None
+
+    def _remember_state(self) -> None:
+        key = self._state_key()
+        if key is not None:
+            _DCA_STATE_CACHE[key] = self.get_state()
+
+    def _apply_state(self, state: Dict[str, Any]) -> None:
+        value = state.get("last_purchase")
+        if value:
+            dt = datetime.fromisoformat(value)
+            if dt.tzinfo is None:
+                dt = dt.replace(tzinfo=timezone.utc)
+            self._last_purchase = dt
+        if state.get("total_spent") is not None:
+            self._total_spent_cache = float(state["total_spent"])
+
     def _restore_last_purchase_from_db(self) -> None:
         """Restore last purchase timestamp from database to prevent multiple buys on restart."""
         if not self._db_client or not hasattr(self._db_client, 'connection') or not self._db_client.connection:
@@ -161,6 +200,7 @@ class DcaStrategy(BaseStrategy):
         """Get total spent amount, using cache to avoid frequent DB calls."""
         if self._total_spent_cache is None and self._db_client:
             self._total_spent_cache = self._db_client.get_total_spent()
+            self._remember_state()
         return self._total_spent_cache or 0.0
 
     def _update_total_spent(self, amount: float) -> None:
@@ -238,6 +278,7 @@ class DcaStrategy(BaseStrategy):
             # Update total spent in database
             trade_amount = execution_size * execution_price
             self._update_total_spent(trade_amount)
+            self._remember_state()
 
             self._log_local(
                 "ACTION",
@@ -246,26 +287,198 @@ class DcaStrategy(BaseStrategy):
 
     def get_state(self) -> Dict[str, Any]:
         return {
-            "last_purchase": _utc_iso(self._last_purchase) if self._last_purchase else None
+            "last_purchase": _utc_iso(self._last_purchase) if self._last_purchase else None,
+            "total_spent": self._total_spent_cache,
         }
 
     def set_state(self, state: Dict[str, Any]) -> None:
-        value = state.get("last_purchase")
-        if value:
-            dt = datetime.fromisoformat(value)
-            if dt.tzinfo is None:
-                dt = dt.replace(tzinfo=timezone.utc)
-            self._last_purchase = dt
+        self._apply_state(state)
+        self._state_restored = True
+
+    def on_params_changed(self, changes: Dict[str, Any]) -> None:
+        super().on_params_changed(changes)
+        self.interval_minutes = max(1, self.interval_minutes)
 
 
 # ------------------------------ Advanced DCA --------------------------------
 
+_SIZE_EPSILON = 1e-12
+
+
+class _MaxDeque:
+    """Deque of floats with amortised O(1) ``max()`` and pops at both ends.
+
+    Two stacks carry running maxima (the front stack's top is the leftmost item,
+    the back stack's top the rightmost). When one end runs dry the items are split
+    evenly between the stacks, which keeps every operation amortised O(1).
+    """
+
+    def __init__(self, values=()) -> None:
+        self._front: List[Tuple[float, float]] = []
+        self._back: List[Tuple[float, float]] = []
+        for value in values:
+            self.append(value)
+
+    def __len__(self) -> int:
+        return len(self._front) + len(self._back)
+
+    @staticmethod
+    def _push(stack: List[Tuple[float, float]], value: float) -> None:
+        stack.append((value, max(value, stack[-1][1]) if stack else value))
+
+    def _rebalance(self, front_count: int) -> None:
+        items = [value for value, _ in reversed(self._front)] + [value for value, _ in self._back]
+        self._front, self._back = [], []
+        for value in reversed(items[:front_count]):
+            self._push(self._front, value)
+        for value in items[front_count:]:
+            self._push(self._back, value)
+
+    def append(self, value: float) -> None:
+        self._push(self._back, value)
+
+    def pop(self) -> float:
+        if not self._back:
+            self._rebalance(len(self._front) // 2)
+        return self._back.pop()[0]
+
+    def popleft(self) -> float:
+        if not self._front:
+            self._rebalance((len(self._back) + 1) // 2)
+        return self._front.pop()[0]
+
+    def last(self) -> float:
+        return self._back[-1][0] if self._back else self._front[0][0]
+
+    def max(self) -> float:
+        if not self._front:
+            return self._back[-1][1]
+        if not self._back:
+            return self._front[-1][1]
+        return max(self._front[-1][1], self._back[-1][1])
+
+    def clear(self) -> None:
+        self._front.clear()
+        self._back.clear()
+
+
+class _RollingReturns:
+    """Last ``window`` closes with running max and population stdev of their returns.
+
+    ``sync`` works out which closes are new since the previous snapshot (by
+    candle time when available, otherwise by matching the window's endpoints)
+    and applies only those, so a tick costs O(1) instead of O(window).
+    """
+
+    def __init__(self, window: int) -> None:
+        self.window = window
+        self._closes: Deque[float] = deque()
+        self._close_max = _MaxDeque()
+        self._returns: Deque[Optional[float]] = deque()
+        self._last_time: Optional[float] = None
+        self._count = 0
+        self._sum = 0.0
+        self._sumsq = 0.0
+        self._pushes = 0
+
+    def _add_return(self, value: Optional[float], sign: int) -> None:
+        if value is not None:
+            self._count += sign
+            self._sum += sign * value
+            self._sumsq += sign * value * value
+
+    def _push(self, close: float) -> None:
+        if self._closes:
+            prev = self._closes[-1]
+            ret = (close - prev) / prev if prev > 0 else None
+            self._returns.append(ret)
+            self._add_return(ret, 1)
+        self._closes.append(close)
+        self._close_max.append(close)
+        if len(self._closes) > self.window:
+            self._closes.popleft()
+            self._close_max.popleft()
+            self._add_return(self._returns.popleft(), -1)
+        self._pushes += 1
+
+    def _replace_last(self, close: float) -> None:
+        self._closes.pop()
+        self._close_max.pop()
+        if self._returns:
+            self._add_return(self._returns.pop(), -1)
+        self._push(close)
+
+    def rebuild(self, prices) -> None:
+        self._closes.clear()
+        self._close_max.clear()
+        self._returns.clear()
+        self._count, self._sum, self._sumsq = 0, 0.0, 0.0
+        for close in prices[-self.window:]:
+            self._push(close)
+        self._pushes = 0
+
+    def sync(self, market: MarketSnapshot) -> bool:
+        """Bring the window up to date with ``market``; False while history is too short."""
+        candles = market.candles
+        prices = candles.closes if candles is not None else market.prices  # zero-copy when candle-backed
+        window = self.window
+        if len(prices) < window:
+            self._last_time = None
+            return False
+        closes = self._closes
+        if candles is not None:
+            times = candles.times
+            last_time = times[-1]
+            if self._last_time is None or len(closes) < window or last_time < self._last_time:
+                self.rebuild(prices)
+            elif last_time == self._last_time:
+                if prices[-1] != closes[-1]:
+                    self._replace_last(prices[-1])
+            else:
+                new = 0
+                while new < window and times[-1 - new] > self._last_time:
+                    new += 1
+                if new >= window:
+                    self.rebuild(prices)
+                else:
+                    if prices[-1 - new] != closes[-1]:
+                        self._replace_last(prices[-1 - new])
+                    for close in prices[-new:]:
+                        self._push(close)
+            self._last_time = last_time
+        elif len(closes) == window and prices[-1] == closes[-1] and prices[-window] == closes[0]:
+            pass
+        elif len(closes) == window and prices[-2] == closes[-1] and prices[-window] == closes[1]:
+            self._push(prices[-1])
+        else:
+            self.rebuild(prices)
+        if self._pushes >= window:
+            # Recompute from scratch once per window to stop float drift in the running sums.
+            self.rebuild(prices)
+        return True
+
+    def pstdev(self) -> float:
+        if self._count < 2:
+            return 0.0
+        mean = self._sum / self._count
+        return math.sqrt(max(0.0, self._sumsq / self._count - mean * mean))
+
+    def max(self) -> float:
+        return self._close_max.max()
+
+
 class AdvancedDcaStrategy(BaseStrategy):
     """Adaptive DCA strategy with volatility-aware spacing and take-profit bands.
 
     ENTERPRISE TIER FEATURE - Advanced DCA with sophisticated risk management.
     """
 
+    hot_reload_params = frozenset({
+        "base_amount", "max_positions", "min_minutes_between_buys", "base_drop_pct",
+        "volatility_factor", "scale_factor", "take_profit_pct", "trailing_stop_pct",
+        "drawdown_pause_pct", "max_daily_buys",
+    })
+
     def __init__(self, config: Dict[str, Any], exchange):
         super().__init__(config=config, exchange=exchange)
         self.base_amount = float(config.get("base_amount", 50.0))
@@ -285,6 +498,13 @@ class AdvancedDcaStrategy(BaseStrategy):
         self.trailing_high: Optional[float] = None
         self.daily_buy_counter: Dict[str, int] = {}
 
+        # Running aggregates over ``entries`` and the recent closes, kept in step
+        # by on_trade/set_state so per-tick decisions never rescan either.
+        self._entry_prices = _MaxDeque()
+        self._total_size = 0.0
+        self._total_cost = 0.0
+        self._rolling = _RollingReturns(self.volatility_window)
+
     def generate_signal(self, market: MarketSnapshot, portfolio) -> Signal:
         now = market.timestamp if isinstance(market.timestamp, datetime) else datetime.utcnow()
 
@@ -320,21 +540,24 @@ class AdvancedDcaStrategy(BaseStrategy):
                 "size": execution_size,
                 "timestamp": timestamp.isoformat()
             }
-            self.entries.append(entry)
+            self._push_entry(entry)
             while len(self.entries) > self.max_positions:
-                self.entries.popleft()
+                self._pop_entry(left=True)
             self.last_buy_at = timestamp
             if self.trailing_high is None or execution_price > self.trailing_high:
                 self.trailing_high = execution_price
         elif signal.action == "sell" and execution_size > 0:
             remaining = execution_size
             while self.entries and remaining > 0:
-                position = self.entries.pop()
-                if position["size"] > remaining:
+                position = self.entries[-1]
+                # Treat float residue as a full close so no dust entry lingers.
+                if position["size"] - remaining > _SIZE_EPSILON:
                     position["size"] -= remaining
-                    self.entries.append(position)
+                    self._total_size -= remaining
+                    self._total_cost -= remaining * position["price"]
                     remaining = 0
                 else:
+                    self._pop_entry()
                     remaining -= position["size"]
             self.trailing_high = execution_price
 
@@ -347,29 +570,60 @@ class AdvancedDcaStrategy(BaseStrategy):
         }
 
     def set_state(self, state: Dict[str, Any]) -> None:
-        self.entries = deque(state.get("entries", []))
+        self.entries = deque()
+        self._entry_prices.clear()
+        self._total_size = self._total_cost = 0.0
+        for entry in state.get("entries", []):
+            self._push_entry(entry)
         last_buy = state.get("last_buy_at")
         if last_buy:
             self.last_buy_at = datetime.fromisoformat(last_buy)
         self.trailing_high = state.get("trailing_high")
         self.daily_buy_counter = state.get("daily_buy_counter", {})
 
+    def on_params_changed(self, changes: Dict[str, Any]) -> None:
+        super().on_params_changed(changes)
+        self.min_minutes_between_buys = max(1, self.min_minutes_between_buys)
+        self.base_drop_pct = max(0.1, self.base_drop_pct)
+
+    # --- running aggregates -----------------------------------------------
+
+    def _push_entry(self, entry: Dict[str, Any]) -> None:
+        self.entries.append(entry)
+        self._entry_prices.append(entry["price"])
+        self._total_size += entry["size"]
+        self._total_cost += entry["price"] * entry["size"]
+
+    def _pop_entry(self, *, left: bool = False) -> Dict[str, Any]:
+        if left:
+            entry = self.entries.popleft()
+            self._entry_prices.popleft()
+        else:
+            entry = self.entries.pop()
+            self._entry_prices.pop()
+        if self.entries:
+            self._total_size -= entry["size"]
+            self._total_cost -= entry["price"] * entry["size"]
+        else:
+            self._total_size = self._total_cost = 0.0
+        return entry
+
     # --- decision helpers -------------------------------------------------
 
     def _should_pause_for_drawdown(self, market: MarketSnapshot) -> bool:
         if not self.entries or self.drawdown_pause_pct <= 0:
             return False
-        highest_entry = max(entry["price"] for entry in self.entries)
+        highest_entry = self._entry_prices.max()
         drop_pct = (highest_entry - market.current_price) / highest_entry * 100
         return drop_pct >= self.drawdown_pause_pct
 
     def _maybe_take_profit(self, market: MarketSnapshot, portfolio) -> Signal | None:
         if not self.entries or self.take_profit_pct <= 0:
             return None
-        total_size = sum(entry["size"] for entry in self.entries)
+        total_size = self._total_size
         if total_size <= 0:
             return None
-        avg_entry = sum(entry["price"] * entry["size"] for entry in self.entries) / total_size
+        avg_entry = self._total_cost / total_size
         gain_pct = (market.current_price - avg_entry) / avg_entry * 100
         if gain_pct < self.take_profit_pct:
             self._update_trailing_high(market.current_price)
@@ -410,21 +664,18 @@ class AdvancedDcaStrategy(BaseStrategy):
             del self.daily_buy_counter[k]
 
     def _dynamic_drop_threshold(self, market: MarketSnapshot) -> float:
-        if len(market.prices) < self.volatility_window:
+        if not self._rolling.sync(market):
             return self.base_drop_pct
-        window = market.prices[-self.volatility_window :]
-        returns = []
-        for prev, curr in zip(window, window[1:]):
-            if prev > 0:
-                returns.append((curr - prev) / prev)
-        volatility = pstdev(returns) if len(returns) > 1 else 0.0
+        volatility = self._rolling.pstdev()
         return self.base_drop_pct * (1 + self.volatility_factor * volatility * 100)
 
     def _price_drop_pct(self, market: MarketSnapshot) -> float:
         current_price = market.current_price
         if not self.entries:
-            recent_prices = market.prices[-self.volatility_window :] if len(market.prices) >= self.volatility_window else market.prices
-            reference = max(recent_prices) if recent_prices else current_price
+            if self._rolling.sync(market):
+                reference = self._rolling.max()
+            else:
+                reference = max(market.prices) if len(market.prices) else current_price
             if reference <= 0:
                 return self.base_drop_pct
             return max(self.base_drop_pct, (reference - current_price) / reference * 100)
@@ -443,6 +694,197 @@ class AdvancedDcaStrategy(BaseStrategy):
         return notional / price
 
 
+# ------------------------------- Basket DCA ---------------------------------
+
+def _parse_basket(value: Any) -> Dict[str, float]:
+    """Normalised target weights from a dict, a list of symbols (equal weights)
+    or a string like ``"BTC-USD:0.6,ETH-USD:0.4"``."""
+    if isinstance(value, str):
+        items = [part.strip() for part in value.split(",") if part.strip()]
+        value = {}
+        for item in items:
+            symbol, _, weight = item.partition(":")
+            value[symbol.strip()] = float(weight) if weight else 1.0
+    elif isinstance(value, (list, tuple)):
+        value = {symbol: 1.0 for symbol in value}
+    weights = {str(symbol).upper(): float(weight) for symbol, weight in dict(value or {}).items() if float(weight) > 0}
+    total = sum(weights.values())
+    if not total:
+        raise ValueError("basket_dca needs a non-empty 'basket' of symbol weights")
+    return {symbol: weight / total for symbol, weight in weights.items()}
+
+
+class BasketDcaStrategy(BaseStrategy):
+    """Weighted DCA across many symbols from a single bot process.
+
+    Every ``interval_minutes`` the strategy prices the whole basket with one
+    batched fetch, splits ``base_amount`` across symbols (steering money to
+    underweight symbols once drift exceeds ``rebalance_threshold_pct``, and
+    optionally trimming overweight ones) and returns the legs to the bot, which
+    executes and journals them one by one and writes them with a single
+    multi-row database insert.
+
+    Basket holdings live in this strategy, not in the bot's single-symbol
+    portfolio; only the portfolio's cash is shared.
+    """
+
+    hot_reload_params = frozenset({
+        "base_amount", "interval_minutes", "rebalance_threshold_pct", "rebalance_sells", "min_order_amount",
+    })
+
+    def __init__(self, config: Dict[str, Any], exchange):
+        super().__init__(config=config, exchange=exchange)
+        self.weights = _parse_basket(config.get("basket"))
+        self.interval_minutes = max(1, int(config.get("interval_minutes", 60)))
+        self.base_amount = float(config.get("base_amount", 50.0))
+        self.rebalance_threshold_pct = float(config.get("rebalance_threshold_pct", 5.0))
+        self.rebalance_sells = _as_bool(config.get("rebalance_sells"), False)
+        self.min_order_amount = float(config.get("min_order_amount", 1.0))
+        self._starting_cash = float(config.get("starting_cash", 10000.0))
+        self._db_client = config.get("db_client")
+        self._logger = logging.getLogger("strategy.basket_dca")
+
+        self.holdings: Dict[str, float] = {symbol: 0.0 for symbol in self.weights}
+        self.invested: Dict[str, float] = {symbol: 0.0 for symbol in self.weights}
+        self.last_prices: Dict[str, float] = {}
+        self.total_spent = 0.0
+        self._unsaved_spend = 0.0  # total_spent change not yet written to the database
+        self._last_purchase: Optional[datetime] = None
+
+    # --------------------------------- logic ----------------------------------
+
+    def generate_signal(self, market: MarketSnapshot, portfolio) -> Signal:
+        now = datetime.now(timezone.utc)
+        if self._last_purchase and now - self._last_purchase < timedelta(minutes=self.interval_minutes):
+            return Signal("hold", reason="Waiting for next basket interval")
+
+        snapshots = fetch_market_snapshots(self.exchange, list(self.weights), limit=1)
+        prices = {symbol: snap.current_price for symbol, snap in snapshots.items() if snap.current_price > 0}
+        self.last_prices.update(prices)
+        if len(prices) < len(self.weights):
+            missing = sorted(set(self.weights) - set(prices))
+            return Signal("hold", reason=f"No price for {', '.join(missing)}")
+
+        budget = max(0.0, min(self.base_amount, portfolio.cash, self._starting_cash - self.total_spent))
+        legs = self._plan_legs(prices, budget)
+        if not legs:
+            return Signal("hold", reason="Basket DCA: nothing to buy")
+
+        # The interval is used up once legs are handed out, even if some fail, so a
+        # restart or an exchange error cannot turn into an immediate second round.
+        self._last_purchase = now
+        return Signal(
+            "basket",
+            reason=f"Basket DCA: {len(legs)} legs",
+            legs=tuple(
+                Leg(
+                    symbol,
+                    side,
+                    size,
+                    prices[symbol],
+                    reason="Basket rebalance" if side == "sell" else "Scheduled basket DCA buy",
+                )
+                for symbol, side, size in legs
+            ),
+        )
+
+    def on_leg_filled(self, leg: Leg, execution: TradeExecution) -> Optional[float]:
+        symbol = leg.symbol
+        notional = execution.size * execution.price
+        if execution.side == "buy":
+            self.holdings[symbol] += execution.size
+            self.invested[symbol] += notional
+            self.total_spent += notional
+            self._unsaved_spend += notional
+            return None
+        held = self.holdings[symbol]
+        sold = min(execution.size, held)
+        released = self.invested[symbol] * sold / held if held > 0 else 0.0
+        self.holdings[symbol] = held - sold
+        self.invested[symbol] -= released
+        # Selling frees the cost basis it came from, never more than was spent.
+        freed = min(released, self.total_spent)
+        self.total_spent -= freed
+        self._unsaved_spend -= freed
+        return notional - released
+
+    def on_legs_finished(self, fills: List[Tuple[Leg, TradeExecution]]) -> None:
+        for leg, execution in fills:
+            self._logger.info(
+                f"[BASKET] {execution.side.upper()} {execution.size:.8f} {leg.symbol} @ ${execution.price:,.2f}"
+            )
+        spent, self._unsaved_spend = self._unsaved_spend, 0.0
+        if self._db_client and spent:
+            # One total_spent update per interval, covering exactly the legs that filled.
+            self._db_client.update_total_spent(spent)
+
+    def _plan_legs(self, prices: Dict[str, float], budget: float) -> List[Tuple[str, str, float]]:
+        """Return ``(symbol, side, size)`` legs for one interval."""
+        values = {symbol: self.holdings[symbol] * prices[symbol] for symbol in self.weights}
+        basket_value = sum(values.values())
+        drift = {
+            symbol: (values[symbol] / basket_value - weight) * 100 if basket_value > 0 else 0.0
+            for symbol, weight in self.weights.items()
+        }
+        rebalancing = self.rebalance_threshold_pct > 0 and any(
+            abs(d) >= self.rebalance_threshold_pct for d in drift.values()
+        )
+
+        legs: List[Tuple[str, str, float]] = []
+        if rebalancing and self.rebalance_sells:
+            target_total = basket_value + budget
+            for symbol, weight in self.weights.items():
+                excess = values[symbol] - weight * target_total
+                if drift[symbol] >= self.rebalance_threshold_pct and excess >= self.min_order_amount:
+                    legs.append((symbol, "sell", excess / prices[symbol]))
+                    values[symbol] -= excess
+                    budget += excess
+
+        if budget <= 0:
+            return legs
+        if rebalancing:
+            target_total = sum(values.values()) + budget
+            deficits = {s: max(0.0, w * target_total - values[s]) for s, w in self.weights.items()}
+            total_deficit = sum(deficits.values())
+            allocation = {s: budget * d / total_deficit for s, d in deficits.items()} if total_deficit else {}
+        else:
+            allocation = {s: budget * w for s, w in self.weights.items()}
+        for symbol, amount in allocation.items():
+            if amount >= self.min_order_amount:
+                legs.append((symbol, "buy", amount / prices[symbol]))
+        return legs
+
+    def external_positions_value(self) -> float:
+        return sum(
+            quantity * self.last_prices.get(symbol, 0.0) for symbol, quantity in self.holdings.items()
+        )
+
+    def get_state(self) -> Dict[str, Any]:
+        return {
+            "holdings": dict(self.holdings),
+            "invested": dict(self.invested),
+            "last_prices": dict(self.last_prices),
+            "total_spent": self.total_spent,
+            "last_purchase": _utc_iso(self._last_purchase) if self._last_purchase else None,
+        }
+
+    def set_state(self, state: Dict[str, Any]) -> None:
+        for key, target in (("holdings", self.holdings), ("invested", self.invested)):
+            for symbol, value in (state.get(key) or {}).items():
+                target[symbol] = float(value)
+        self.last_prices.update(state.get("last_prices") or {})
+        self.total_spent = float(state.get("total_spent") or 0.0)
+        value = state.get("last_purchase")
+        if value:
+            dt = datetime.fromisoformat(value)
+            self._last_purchase = dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+    def on_params_changed(self, changes: Dict[str, Any]) -> None:
+        super().on_params_changed(changes)
+        self.interval_minutes = max(1, self.interval_minutes)
+
+
 # Register DCA strategies at import time
 register_strategy("dca", lambda cfg, ex: DcaStrategy(cfg, ex))
 register_strategy("advanced_dca", lambda cfg, ex: AdvancedDcaStrategy(cfg, ex))
+register_strategy("basket_dca", lambda cfg, ex: BasketDcaStrategy(cfg, ex))
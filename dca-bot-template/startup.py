@@ -36,7 +36,7 @@ def main() -> None:
     print(f"💰 Symbol: {bot.config.symbol}")
     print(f"🏦 Exchange: {bot.config.exchange}")
     print(f"💵 Starting Cash: ${bot.config.starting_cash}")
-    print("🎯 Available strategies: DCA, Advanced DCA (Enterprise)")
+    print("🎯 Available strategies: DCA, Advanced DCA (Enterprise), Basket DCA")
     print("-" * 60)
 
     bot.run()
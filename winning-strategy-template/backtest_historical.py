@@ -68,6 +68,7 @@ sys.modules['exchange_interface'] = type('module', (), {
 
 # Now import our strategy
 from winning_strategy import WinningStrategy
+from performance_metrics import PerformanceTracker
 
 def fetch_historical_data(symbol, start_date, end_date):
     """
@@ -157,8 +158,9 @@ def run_backtest(symbol, start_date, end_date, starting_cash=10000):
     # Track performance
     trades = []
     portfolio_values = []
-    max_drawdown = 0
-    peak_value = starting_cash
+    metrics = PerformanceTracker(periods_per_year=365 * 24)  # hourly candles
+    metrics.update_equity(starting_cash)
+    last_buy_price = None
     
     # Build price history first (for indicators)
     print("Building price history for technical indicators...")
@@ -189,6 +191,7 @@ def run_backtest(symbol, start_date, end_date, starting_cash=10000):
                     'reason': signal.reason
                 })
                 strategy.on_trade(signal, price, signal.size, timestamp)
+                last_buy_price = price
                 print(f"  {timestamp.strftime('%Y-%m-%d %H:%M')} BUY  {signal.size:.6f} @ ${price:,.2f}")
                 
         elif signal.action == "sell" and signal.size > 0:
@@ -206,35 +209,21 @@ def run_backtest(symbol, start_date, end_date, starting_cash=10000):
                     'reason': signal.reason
                 })
                 strategy.on_trade(signal, price, sell_size, timestamp)
+                # A sell wins when it is above the most recent buy
+                if last_buy_price is not None:
+                    metrics.record_trade((price - last_buy_price) * sell_size)
                 print(f"  {timestamp.strftime('%Y-%m-%d %H:%M')} SELL {sell_size:.6f} @ ${price:,.2f}")
         
         # Track portfolio value
         current_value = portfolio.value(price)
         portfolio_values.append((timestamp, current_value))
-        
-        # Update drawdown
-        if current_value > peak_value:
-            peak_value = current_value
-        drawdown = ((peak_value - current_value) / peak_value) * 100
-        max_drawdown = max(max_drawdown, drawdown)
+        metrics.update_equity(current_value, at=timestamp.timestamp())
     
     # Calculate final metrics
     final_value = portfolio.value(historical_data[-1][1])
     total_return = ((final_value - starting_cash) / starting_cash) * 100
-    
-    # Calculate win rate
-    winning_trades = 0
-    for i in range(len(trades)):
-        if trades[i]['action'] == 'SELL' and i > 0:
-            # Find corresponding buy
-            for j in range(i-1, -1, -1):
-                if trades[j]['action'] == 'BUY':
-                    if trades[i]['price'] > trades[j]['price']:
-                        winning_trades += 1
-                    break
-    
-    total_trade_pairs = len([t for t in trades if t['action'] == 'SELL'])
-    win_rate = (winning_trades / total_trade_pairs * 100) if total_trade_pairs > 0 else 0
+    max_drawdown = metrics.max_drawdown_pct
+    win_rate = metrics.win_rate
     
     # Print results
     print(f"\n{'='*70}")
@@ -244,6 +233,8 @@ def run_backtest(symbol, start_date, end_date, starting_cash=10000):
     print(f"Final Value:       ${final_value:,.2f}")
     print(f"Total Return:      {total_return:+.2f}%")
     print(f"Max Drawdown:      {max_drawdown:.2f}%")
+    print(f"Sharpe Ratio:      {metrics.sharpe_ratio:.2f}")
+    print(f"Sortino Ratio:     {metrics.sortino_ratio:.2f}")
     print(f"Total Trades:      {len(trades)}")
     print(f"Buy Orders:        {len([t for t in trades if t['action'] == 'BUY'])}")
     print(f"Sell Orders:       {len([t for t in trades if t['action'] == 'SELL'])}")
@@ -260,6 +251,8 @@ def run_backtest(symbol, start_date, end_date, starting_cash=10000):
         'max_drawdown': max_drawdown,
         'total_trades': len(trades),
         'win_rate': win_rate,
+        'sharpe_ratio': metrics.sharpe_ratio,
+        'sortino_ratio': metrics.sortino_ratio,
         'trades': trades
     }
 
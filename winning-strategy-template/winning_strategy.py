@@ -16,7 +16,7 @@ from __future__ import annotations
 import sys
 import os
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List, Optional, Deque
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Deque, Sequence
 from collections import deque
 from statistics import mean, pstdev
 import logging
@@ -31,6 +31,9 @@ sys.path.insert(0, base_path)
 from strategy_interface import BaseStrategy, Signal, Portfolio, register_strategy
 from exchange_interface import MarketSnapshot
 
+if TYPE_CHECKING:
+    from exchange_interface import CandleSeries
+
 
 class WinningStrategy(BaseStrategy):
     """Adaptive Momentum-Reversal Strategy for cryptocurrency trading.
@@ -43,6 +46,14 @@ class WinningStrategy(BaseStrategy):
     - Advanced risk management with stop-losses
     """
 
+    # Thresholds and risk limits only affect future decisions, so they can change
+    # live; MACD periods would invalidate the stored EMA histories.
+    hot_reload_params = frozenset({
+        "rsi_period", "rsi_oversold", "rsi_overbought", "bb_period", "bb_std_dev",
+        "max_position_size", "stop_loss_pct", "take_profit_pct", "trailing_stop_pct",
+        "max_drawdown_limit", "min_time_between_trades",
+    })
+
     def __init__(self, config: Dict[str, Any], exchange):
         super().__init__(config=config, exchange=exchange)
         
@@ -75,6 +86,8 @@ class WinningStrategy(BaseStrategy):
         self.price_history: Deque[float] = deque(maxlen=100)
         self.ema_fast_history: Deque[float] = deque(maxlen=50)
         self.ema_slow_history: Deque[float] = deque(maxlen=50)
+        # Enough closes to rebuild a full price window plus every stored EMA point.
+        self.warmup_candles = self.price_history.maxlen + self.ema_fast_history.maxlen
         
         # Performance tracking
         self.total_trades = 0
@@ -83,6 +96,32 @@ class WinningStrategy(BaseStrategy):
         
         self.logger = logging.getLogger("winning_strategy")
 
+    def warm_up(self, history: "CandleSeries | Sequence[float]") -> None:
+        """Seed price and EMA histories from bulk closes as if each had been a live tick."""
+        if self.price_history:
+            return  # never mix candle closes into live per-cycle samples
+        closes = [float(price) for price in getattr(history, "closes", history)][-self.warmup_candles:]
+
+        window = self.price_history.maxlen
+        # Same gate as generate_signal, so both EMA histories cover the same bars.
+        min_prices = max(self.rsi_period, self.bb_period, self.macd_slow)
+        ema_fast_history: Deque[float] = deque(maxlen=self.ema_fast_history.maxlen)
+        ema_slow_history: Deque[float] = deque(maxlen=self.ema_slow_history.maxlen)
+        # Only the last maxlen EMA points survive, so only those windows are evaluated.
+        for end in range(max(min_prices - 1, len(closes) - ema_fast_history.maxlen), len(closes)):
+            prices = closes[max(0, end + 1 - window):end + 1]
+            ema_fast = self._calculate_ema(prices, self.macd_fast)
+            ema_slow = self._calculate_ema(prices, self.macd_slow)
+            if ema_fast:
+                ema_fast_history.append(ema_fast)
+            if ema_slow:
+                ema_slow_history.append(ema_slow)
+
+        self.price_history = deque(closes[-window:], maxlen=window)
+        self.ema_fast_history = ema_fast_history
+        self.ema_slow_history = ema_slow_history
+        self.logger.info(f"Warmed up with {len(closes)} closes")
+
     def _calculate_rsi(self, prices: List[float], period: int = 14) -> Optional[float]:
         """Calculate Relative Strength Index."""
         if len(prices) < period + 1: